@@ -0,0 +1,242 @@
+"""
+群管插件 - 缓存模块
+
+提供带容量上限、LRU 淘汰和可选过期时间的内存缓存，以及合并并发相同请求的 SingleFlight。
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# 用于区分「未命中」与「缓存值为 None」
+_MISSING = object()
+
+
+class LRUCache(Generic[K, V]):
+    """有容量上限的 LRU 缓存
+    
+    超出容量时淘汰最久未使用的条目；设置了过期时间时，过期条目在读取时视为未命中，
+    并可通过 purge_expired() 主动清理。条目因容量被淘汰或因过期被移除时调用 on_evict，
+    供调用方清理依附于条目的数据（显式 pop/clear 不调用）。记录命中、未命中、淘汰和过期次数，供监控使用。
+    非线程安全，仅应在事件循环线程中使用。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        on_evict: Optional[Callable[[K, V], None]] = None
+    ):
+        """初始化缓存
+        
+        Args:
+            max_entries: 最大条目数，小于等于 0 时不缓存任何条目
+            ttl: 条目过期时间（秒），为 None 时永不过期
+            on_evict: 条目被淘汰或过期移除时的回调，参数为 (键, 值)
+        """
+        self._data: "OrderedDict[K, tuple[float, V]]" = OrderedDict()  # key -> (写入时间, 值)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def _is_expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at >= self.ttl
+
+    def get(self, key: K, default: Any = None, count: bool = True) -> Any:
+        """读取缓存条目，命中时将其标记为最近使用
+        
+        Args:
+            key: 缓存键
+            default: 未命中或已过期时的返回值
+            count: 是否计入命中/未命中统计
+        
+        Returns:
+            缓存值，未命中时返回 default
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            if not self._is_expired(entry[0], time.monotonic()):
+                self._data.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return entry[1]
+            del self._data[key]
+            self.expirations += 1
+            if self.on_evict is not None:
+                self.on_evict(key, entry[1])
+        if count:
+            self.misses += 1
+        return default
+
+    def peek(self, key: K, default: Any = None) -> Any:
+        """读取缓存条目，不改变 LRU 顺序、不计入统计，也不移除过期条目
+        
+        Args:
+            key: 缓存键
+            default: 未命中或已过期时的返回值
+        
+        Returns:
+            缓存值，未命中或已过期时返回 default
+        """
+        entry = self._data.get(key)
+        if entry is None or self._is_expired(entry[0], time.monotonic()):
+            return default
+        return entry[1]
+
+    def set(self, key: K, value: V) -> None:
+        """写入缓存条目，超出容量时淘汰最久未使用的条目
+        
+        Args:
+            key: 缓存键
+            value: 缓存值
+        """
+        if self.max_entries <= 0:
+            return
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        self._evict_overflow()
+
+    def pop(self, key: K, default: Any = None) -> Any:
+        """移除缓存条目
+        
+        Args:
+            key: 缓存键
+            default: 条目不存在时的返回值
+        
+        Returns:
+            被移除的缓存值
+        """
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """清空所有缓存条目（不重置统计）"""
+        self._data.clear()
+
+    def resize(self, max_entries: int, ttl: Any = _MISSING) -> None:
+        """调整缓存容量与过期时间，超出新容量的条目立即被淘汰
+        
+        Args:
+            max_entries: 新的最大条目数
+            ttl: 新的过期时间（秒），不传则保持不变
+        """
+        self.max_entries = max_entries
+        if ttl is not _MISSING:
+            self.ttl = ttl
+        self._evict_overflow()
+
+    def _evict_overflow(self) -> None:
+        """淘汰超出容量的最久未使用条目"""
+        while self._data and len(self._data) > max(self.max_entries, 0):
+            key, (_, value) = self._data.popitem(last=False)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(key, value)
+
+    def purge_expired(self) -> int:
+        """主动清理所有过期条目
+        
+        Returns:
+            清理的条目数
+        """
+        if self.ttl is None or not self._data:
+            return 0
+        now = time.monotonic()
+        expired_keys = [key for key, (stored_at, _) in self._data.items() if self._is_expired(stored_at, now)]
+        for key in expired_keys:
+            _, value = self._data.pop(key)
+            if self.on_evict is not None:
+                self.on_evict(key, value)
+        self.expirations += len(expired_keys)
+        return len(expired_keys)
+
+    def stats(self) -> dict[str, Any]:
+        """获取缓存统计信息
+        
+        Returns:
+            包含条目数、容量、命中/未命中/淘汰/过期次数和命中率的字典
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SingleFlight:
+    """合并并发的相同请求
+    
+    同一个键在请求尚未完成时再次被请求，不会重复发起，而是等待并共享同一个请求的结果（或异常）。
+    请求完成后立即移除，之后的请求会重新发起，因此不会返回过期数据。
+    共享的结果是同一个对象，调用方不应修改。
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0  # 实际发起的请求数
+        self.coalesced = 0  # 被合并（未实际发起）的请求数
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[V]]) -> V:
+        """执行请求，相同键的并发请求只执行一次
+        
+        Args:
+            key: 请求键，相同键视为相同请求
+            func: 发起请求的无参协程函数
+        
+        Returns:
+            请求结果
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._on_done(key, done))
+        # shield: 某个等待方被取消时不影响其他等待方共享的请求
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        """请求完成回调：移除进行中的请求，并取出其异常
+        
+        所有等待方都被取消时没有人读取请求的异常，在此取出以免事件循环报告
+        「Task exception was never retrieved」；仍在等待的调用方照常收到该异常。
+        """
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict[str, Any]:
+        """获取请求合并统计信息
+        
+        Returns:
+            包含实际请求数、合并请求数和进行中请求数的字典
+        """
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+        }
@@ -4,14 +4,153 @@
 提供分群配置的读取、写入、合并等功能。
 """
 
-import json
-import os
+import asyncio
 import time
+import weakref
+from collections.abc import Mapping
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Iterable, Optional, Union
 
 from nekro_agent.api import core
 
+from .cache import LRUCache
+from .config_storage import ConfigChange, ConfigStorage, JsonFileStorage
+
+
+# 配置模板在存储中的键前缀（与纯数字的群号不会冲突）
+PROFILE_KEY_PREFIX = "profile:"
+# 分群配置中引用配置模板的配置键
+PROFILE_REF_KEY = "PROFILE"
+
+
+def freeze_value(value: Any) -> Any:
+    """将配置值转换为不可变形式（列表转为元组），用于只读快照"""
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_value(item) for item in value)
+    return value
+
+
+def normalize_id(value: Any) -> str:
+    """将QQ号或群号规范化为字符串，使 123、"123"、" 123 " 视为同一个号码
+    
+    Args:
+        value: QQ号或群号（字符串或整数）
+        
+    Returns:
+        规范化后的号码字符串
+    """
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def to_id_set(values: Any) -> frozenset[str]:
+    """将号码列表编译为规范化号码的 frozenset，忽略空值
+    
+    Args:
+        values: 号码列表（可为 None）
+        
+    Returns:
+        规范化号码集合
+    """
+    if not values:
+        return frozenset()
+    if isinstance(values, (str, int)):
+        values = (values,)
+    return frozenset(filter(None, (normalize_id(value) for value in values)))
+
+
+class EffectiveConfig(Mapping):
+    """有效配置快照
+    
+    全局配置与分群配置合并后的只读映射，用法与字典相同（get、[]、in、items 等）。
+    快照一经创建不可修改，可在多个调用之间安全共享。
+    """
+
+    __slots__ = ("_data", "generation", "_id_sets", "__weakref__")
+
+    def __init__(self, data: dict[str, Any], generation: tuple[int, ...]):
+        """初始化配置快照
+        
+        Args:
+            data: 合并后的配置字典（值应已转换为不可变形式）
+            generation: 创建快照时的配置代数
+        """
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "generation", generation)
+        object.__setattr__(self, "_id_sets", {})
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("EffectiveConfig 是只读快照，不能修改")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"EffectiveConfig(generation={self.generation}, {self._data!r})"
+
+    def id_set(self, key: str) -> frozenset[str]:
+        """获取号码列表配置项（如 SUPER_ADMINS、PROTECTED_USERS）的规范化号码集合
+        
+        每个快照只编译一次，之后的成员判断为 O(1)，与列表长度无关。
+        
+        Args:
+            key: 配置键
+            
+        Returns:
+            规范化号码集合，配置项不存在时为空集合
+        """
+        ids = self._id_sets.get(key)
+        if ids is None:
+            ids = self._id_sets[key] = to_id_set(self._data.get(key))
+        return ids
+
+
+class ConfigConflictError(Exception):
+    """配置事务提交时配置版本已被其他修改推进，事务中的修改未被应用"""
+
+    def __init__(self, expected_version: int, current_version: int):
+        super().__init__(f"配置版本冲突: 期望版本 {expected_version}, 当前版本 {current_version}")
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+
+class ConfigTransaction:
+    """配置事务，记录待一次性提交的多项修改
+    
+    由 GroupConfigManager.transaction() 创建，不应直接实例化。
+    """
+
+    def __init__(self):
+        # (操作, group_key, config_dict, config_key)，操作为 update / replace / delete
+        self.operations: list[tuple[str, str, dict[str, Any], Optional[str]]] = []
+        self.committed = False
+        self.version: Optional[int] = None
+        self.changed_groups: list[str] = []  # 提交后配置实际发生变化的群号
+
+    def set(self, group_id: Union[int, str], config_key: str, config_value: Any) -> None:
+        """设置指定群的配置项"""
+        self.operations.append(("update", str(group_id), {config_key: config_value}, None))
+
+    def update(self, group_id: Union[int, str], config_dict: dict[str, Any]) -> None:
+        """批量设置指定群的配置项"""
+        self.operations.append(("update", str(group_id), dict(config_dict), None))
+
+    def replace(self, group_id: Union[int, str], config_dict: dict[str, Any]) -> None:
+        """用 config_dict 整体替换指定群的单独配置，为空时删除该群的单独配置"""
+        self.operations.append(("replace", str(group_id), dict(config_dict), None))
+
+    def delete(self, group_id: Union[int, str], config_key: Optional[str] = None) -> None:
+        """删除指定群的配置项，config_key 为 None 时删除该群的所有配置"""
+        self.operations.append(("delete", str(group_id), {}, config_key))
+
 
 class GroupConfigManager:
     """分群配置管理器
@@ -19,111 +158,407 @@ class GroupConfigManager:
     管理各群单独的群管配置，支持与全局配置合并。
     """
 
-    def __init__(self, config_file_path: str = "data/group_configs.json"):
+    def __init__(
+        self,
+        config_file_path: str = "data/group_configs.json",
+        storage: Optional[ConfigStorage] = None,
+        cache_max_entries: int = 4096,
+        cache_ttl: Optional[float] = 3600
+    ):
         """初始化配置管理器
         
         Args:
             config_file_path: 配置文件路径
+            storage: 存储后端，为 None 时使用 config_file_path 对应的 JSON 文件存储
+            cache_max_entries: 有效配置快照缓存的最大群数，超出时淘汰最久未使用的群
+            cache_ttl: 有效配置快照缓存的过期时间（秒），为 None 时永不过期
         """
         self.config_file_path = Path(config_file_path)
-        self._config_cache: dict[str, dict] = {}
-        self._effective_cache: dict[int, dict] = {}  # 有效配置缓存
-        self._cache_ttl = 60  # 缓存有效期（秒）
-        self._cache_timestamps: dict[int, float] = {}
-        self._ensure_config_file()
+        self._storage = storage or JsonFileStorage(config_file_path)
+        self._configs: dict[str, dict] = {}  # 内存中的分群配置（权威数据源）
+        self._reload_check_interval = 5  # 检查配置文件变更的最小间隔（秒）
+        self._last_reload_check = 0.0
+        self._reload_task: Optional[asyncio.Task] = None  # 正在后台线程中执行的重新加载
+        self._flush_delay = 1.0  # 写入防抖延迟（秒），期间的多次修改合并为一次写入
+        self._dirty = False  # 内存配置是否有尚未写入文件的修改
+        self._pending_changes: list[ConfigChange] = []  # 尚未持久化的修改
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None  # 防抖定时器启动的写入任务
+        self._flush_lock = asyncio.Lock()
+        self._lock = asyncio.Lock()  # 配置修改锁，串行化所有修改操作
+        self._version = 0  # 配置版本号，每次提交修改或重新加载到不同内容后递增
+        self._global_config: dict[str, Any] = {}
+        self._global_generation = 0  # 全局配置代数，全局配置内容变化时递增
+        self._global_snapshot: Optional[EffectiveConfig] = None
+        self._group_generations: dict[str, int] = {}  # 分群配置代数，分群配置修改时更新
+        self._generation_counter = 0
+        # 有效配置快照缓存: group_id -> (配置代数, 快照)
+        self._effective_cache: LRUCache[int, tuple[tuple[int, int, int], EffectiveConfig]] = LRUCache(
+            cache_max_entries, cache_ttl
+        )
+        self._cache_purge_interval = 60  # 主动清理过期缓存的最小间隔（秒）
+        self._last_cache_purge = time.monotonic()
+        # 按合并结果驻留的快照，合并结果相同的群共享同一个快照对象
+        self._interned_snapshots: "weakref.WeakValueDictionary[tuple, EffectiveConfig]" = weakref.WeakValueDictionary()
+        # 插件导入时还没有事件循环，首次加载直接同步读取
+        self._apply_loaded(self._storage.load_all(), self._version, force=True)
+
+    def _should_reload(self, force: bool) -> bool:
+        """判断是否需要从存储重新加载：存在未写入的修改或正在写入时不加载，以免旧数据覆盖内存中的新修改"""
+        if force:
+            return True
+        if self._dirty or self._flush_lock.locked():
+            return False
+        return self._storage.has_changed()
+
+    def _apply_loaded(self, config: Optional[dict[str, dict]], version: int, force: bool = False) -> bool:
+        """用从存储读取的配置替换内存配置
+        
+        Args:
+            config: 读取到的全部配置，读取失败时为 None
+            version: 开始读取时的配置版本号，读取期间有新的修改提交时丢弃读取结果
+            force: 是否为强制重新加载
+            
+        Returns:
+            是否实际替换了内存配置
+        """
+        if config is None:
+            core.logger.warning("[群管配置] 配置无法加载，继续使用内存中的配置")
+            return False
+        
+        if version != self._version or (not force and (self._dirty or self._flush_lock.locked())):
+            core.logger.debug("[群管配置] 重新加载期间配置被修改，丢弃读取到的旧配置")
+            return False
+        
+        self._replace_configs(config)
+        core.logger.info(f"[群管配置] 已重新加载配置，共 {len(self._configs)} 个群有单独配置")
+        return True
+
+    async def reload(self, force: bool = False) -> bool:
+        """从存储后端重新加载到内存（读取在工作线程中执行，不阻塞事件循环）
+        
+        仅当存储内容被外部修改（如 JSON 文件的 mtime/size/inode 变化）时才重新加载，force=True 时无条件重新加载。
+        
+        存在尚未写入文件的修改或正在写入时不会重新加载，以免文件中的旧数据覆盖内存中的新修改；
+        读取期间有新的修改提交时同样丢弃读取结果。
+        
+        Args:
+            force: 是否强制重新加载
+            
+        Returns:
+            是否实际重新加载了配置
+        """
+        if not self._should_reload(force):
+            return False
+        
+        version = self._version
+        config = await asyncio.to_thread(self._storage.load_all)
+        return self._apply_loaded(config, version, force)
 
-    def _ensure_config_file(self) -> None:
-        """确保配置文件存在"""
-        # 确保目录存在
-        self.config_file_path.parent.mkdir(parents=True, exist_ok=True)
+    def _check_reload(self) -> None:
+        """按间隔检查存储是否被外部修改，读路径在间隔内不产生任何 I/O
+        
+        需要重新加载时在后台启动 reload()，本次调用继续使用内存中的配置；
+        需要等待加载完成的调用方使用 refresh()。没有运行中的事件循环时直接同步加载。
+        """
+        current_time = time.monotonic()
+        if current_time - self._last_reload_check < self._reload_check_interval:
+            return
+        self._last_reload_check = current_time
+        if current_time - self._last_cache_purge >= self._cache_purge_interval:
+            self._last_cache_purge = current_time
+            purged = self._effective_cache.purge_expired()
+            if purged:
+                core.logger.debug(f"[群管配置] 已清理 {purged} 个过期的有效配置缓存")
         
-        # 如果文件不存在，创建空配置
-        if not self.config_file_path.exists():
-            self._save_config({})
-            core.logger.info(f"[群管配置] 创建配置文件: {self.config_file_path}")
+        if self._reload_task is not None:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if self._should_reload(False):
+                self._apply_loaded(self._storage.load_all(), self._version)
+            return
+        self._reload_task = asyncio.ensure_future(self.reload())
+        self._reload_task.add_done_callback(self._on_reload_done)
+
+    def _on_reload_done(self, task: "asyncio.Task[bool]") -> None:
+        """后台重新加载任务结束回调：取出并记录任务异常"""
+        if self._reload_task is task:
+            self._reload_task = None
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            core.logger.error(f"[群管配置] 重新加载配置失败: {exc!r}")
 
-    def _load_config(self) -> dict[str, dict]:
-        """加载配置文件
+    async def refresh(self) -> None:
+        """按间隔检查存储是否被外部修改，被修改时等待重新加载完成
+        
+        异步读路径和所有修改操作在读取/修改前调用，保证基于存储中的最新配置；
+        并发调用共享同一个重新加载任务。
+        """
+        self._check_reload()
+        task = self._reload_task
+        if task is not None:
+            # asyncio.wait 不会因调用方被取消而取消共享的任务，异常由完成回调记录
+            await asyncio.wait((task,))
+
+    def _take_pending(self) -> tuple[Optional[dict[str, dict]], list[ConfigChange]]:
+        """取出待持久化的修改，并按存储后端需要生成配置快照
         
         Returns:
-            配置字典
+            (配置快照, 修改列表)
+        """
+        changes = self._pending_changes
+        self._pending_changes = []
+        self._dirty = False
+        # 分群配置字典只会被整体替换、不会原地修改，浅拷贝即可得到一致的快照
+        snapshot = dict(self._configs) if self._storage.needs_snapshot else None
+        return snapshot, changes
+
+    def _restore_pending(self, changes: list[ConfigChange]) -> None:
+        """持久化失败时放回修改，等待下次写入重试"""
+        self._pending_changes = changes + self._pending_changes
+        self._dirty = True
+
+    def _schedule_save(self) -> None:
+        """标记配置已修改，并在防抖延迟后统一写入存储
+        
+        短时间内的多次修改只会触发一次写入。没有运行中的事件循环时直接同步写入。
         """
+        self._dirty = True
         try:
-            with open(self.config_file_path, "r", encoding="utf-8") as f:
-                config = json.load(f)
-                core.logger.debug(f"[群管配置] 加载配置成功，共 {len(config)} 个群有单独配置")
-                return config
-        except FileNotFoundError:
-            core.logger.warning(f"[群管配置] 配置文件不存在，返回空配置")
-            return {}
-        except json.JSONDecodeError as e:
-            core.logger.error(f"[群管配置] 配置文件格式错误: {e}")
-            return {}
-        except Exception as e:
-            core.logger.error(f"[群管配置] 加载配置失败: {e}")
-            return {}
-
-    def _save_config(self, config: dict[str, dict]) -> bool:
-        """保存配置文件
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            snapshot, changes = self._take_pending()
+            try:
+                self._storage.persist(snapshot, changes)
+                core.logger.info(f"[群管配置] 保存配置成功")
+            except Exception as e:
+                self._restore_pending(changes)
+                core.logger.error(f"[群管配置] 保存配置失败: {e}")
+            return
+        
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._flush_delay, self._start_flush)
+
+    def _start_flush(self) -> None:
+        """防抖定时器回调：在事件循环中启动一次写入，并保留任务引用避免被回收"""
+        self._flush_handle = None
+        self._flush_task = asyncio.ensure_future(self.flush())
+        self._flush_task.add_done_callback(self._on_flush_done)
+
+    def _on_flush_done(self, task: "asyncio.Task[bool]") -> None:
+        """后台写入任务结束回调：取出并记录任务异常，避免异常被静默丢弃"""
+        if self._flush_task is task:
+            self._flush_task = None
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            core.logger.error(f"[群管配置] 后台保存配置任务异常: {exc!r}")
+
+    async def flush(self) -> bool:
+        """立即将尚未写入的修改保存到存储（写入在工作线程中执行，不阻塞事件循环）
+        
+        Returns:
+            是否保存成功（没有待写入的修改时返回 True）
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        async with self._flush_lock:
+            if not self._dirty:
+                return True
+            
+            snapshot, changes = self._take_pending()
+            try:
+                await asyncio.to_thread(self._storage.persist, snapshot, changes)
+            except Exception as e:
+                self._restore_pending(changes)
+                core.logger.error(f"[群管配置] 保存配置失败: {e}，将在 {self._flush_delay} 秒后重试")
+                # 重新安排写入，避免修改只留在内存中、直到下一次修改才重试
+                self._schedule_save()
+                return False
+        
+        core.logger.info(f"[群管配置] 保存配置成功，共 {len(changes)} 项修改")
+        return True
+
+    async def close(self) -> None:
+        """写入尚未保存的修改并释放存储后端资源（插件卸载时调用）"""
+        await self.flush()
+        if self._flush_handle is not None:
+            # 卸载时写入失败不再重试，未保存的修改已记录在错误日志中
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        await asyncio.to_thread(self._storage.close)
+
+    async def switch_storage(self, storage: ConfigStorage) -> bool:
+        """切换存储后端：先写入当前后端的未保存修改，再从新后端加载全部配置
         
         Args:
-            config: 配置字典
+            storage: 新的存储后端
             
         Returns:
-            是否保存成功
+            是否切换成功（新后端加载失败时保持原后端不变）
         """
-        try:
-            with open(self.config_file_path, "w", encoding="utf-8") as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-            core.logger.info(f"[群管配置] 保存配置成功")
-            return True
-        except Exception as e:
-            core.logger.error(f"[群管配置] 保存配置失败: {e}")
-            return False
+        async with self._lock:
+            await self.flush()
+            config = await asyncio.to_thread(storage.load_all)
+            if config is None:
+                core.logger.error("[群管配置] 新存储后端加载失败，继续使用原存储后端")
+                storage.close()
+                return False
+            
+            old_storage = self._storage
+            self._storage = storage
+            self._replace_configs(config)
+            old_storage.close()
+        
+        core.logger.info(
+            f"[群管配置] 已切换存储后端为 {type(storage).__name__}，共 {len(config)} 个群有单独配置"
+        )
+        return True
 
-    async def get_group_config(
-        self,
-        group_id: int,
-        global_config: dict[str, Any]
-    ) -> dict[str, Any]:
-        """获取指定群的有效配置（合并全局配置和分群配置，带缓存）
+    def update_global_config(self, global_config: dict[str, Any]) -> int:
+        """更新全局配置，内容发生变化时递增全局配置代数
         
         Args:
-            group_id: 群号
             global_config: 全局配置
             
         Returns:
-            合并后的配置字典
+            当前全局配置代数
+        """
+        frozen_config = {key: freeze_value(value) for key, value in global_config.items()}
+        if frozen_config != self._global_config:
+            self._global_config = frozen_config
+            self._global_generation += 1
+            self._global_snapshot = None
+            core.logger.debug(f"[群管配置] 全局配置已变更，代数: {self._global_generation}")
+        return self._global_generation
+
+    def get_global_snapshot(self) -> "EffectiveConfig":
+        """获取全局配置快照（不含任何分群配置）
+        
+        Returns:
+            全局配置快照
+        """
+        if self._global_snapshot is None:
+            self._global_snapshot = EffectiveConfig(
+                self._global_config, (self._global_generation, 0, 0)
+            )
+        return self._global_snapshot
+
+    def get_effective_snapshot(self, group_id: int) -> "EffectiveConfig":
+        """获取指定群的有效配置快照
+        
+        合并顺序为 全局配置 -> 配置模板 -> 分群配置，后者优先。
+        快照按 (全局配置代数, 分群配置代数, 模板代数) 缓存，只有任一层实际变化时才重新合并；
+        合并结果相同的群共享同一个快照对象。
+        
+        Args:
+            group_id: 群号
+            
+        Returns:
+            有效配置快照
         """
-        # 检查缓存是否有效
-        current_time = time.time()
-        if group_id in self._effective_cache:
-            cache_time = self._cache_timestamps.get(group_id, 0)
-            if current_time - cache_time < self._cache_ttl:
-                core.logger.debug(f"[群管配置] 群{group_id}使用缓存配置")
-                return self._effective_cache[group_id]
+        self._check_reload()
         
         group_key = str(group_id)
+        group_config = self._configs.get(group_key)
+        profile_key = self._profile_key_of(group_config)
+        generation = (
+            self._global_generation,
+            self._group_generations.get(group_key, 0),
+            self._group_generations.get(profile_key, 0) if profile_key else 0,
+        )
+        
+        cached = self._effective_cache.get(group_id)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        
+        snapshot = self._resolve_snapshot(group_config, profile_key, generation)
+        self._effective_cache.set(group_id, (generation, snapshot))
+        return snapshot
+
+    def _profile_key_of(self, group_config: Optional[dict[str, Any]]) -> Optional[str]:
+        """获取分群配置引用的配置模板在存储中的键，未引用或模板不存在时返回 None"""
+        if not group_config or PROFILE_REF_KEY not in group_config:
+            return None
+        profile_key = f"{PROFILE_KEY_PREFIX}{group_config[PROFILE_REF_KEY]}"
+        return profile_key if profile_key in self._configs else None
+
+    def _resolve_snapshot(
+        self,
+        group_config: Optional[dict[str, Any]],
+        profile_key: Optional[str],
+        generation: tuple[int, int, int]
+    ) -> "EffectiveConfig":
+        """合并 全局配置 -> 配置模板 -> 分群配置，并驻留合并结果相同的快照"""
+        override = {
+            key: freeze_value(value)
+            for key, value in (group_config or {}).items()
+            if key != PROFILE_REF_KEY
+        }
+        profile_ref = group_config.get(PROFILE_REF_KEY) if group_config else None
+        if profile_ref is None and not override:
+            # 没有引用模板也没有单独配置的群直接共享全局快照
+            return self.get_global_snapshot()
         
-        # 加载最新配置
-        all_configs = self._load_config()
-        group_config = all_configs.get(group_key, {})
+        try:
+            # 模板引用也是快照内容的一部分：引用了不存在模板的群与未引用模板的群不能共享快照
+            intern_key = (
+                self._global_generation,
+                profile_key,
+                generation[2],
+                profile_ref,
+                tuple(sorted(override.items())),
+            )
+            hash(intern_key)
+        except TypeError:
+            # 配置值不可哈希（如嵌套字典）时不驻留
+            intern_key = None
         
-        # 合并配置：分群配置优先
-        merged_config = {**global_config, **group_config}
+        if intern_key is not None:
+            snapshot = self._interned_snapshots.get(intern_key)
+            if snapshot is not None:
+                return snapshot
         
-        # 更新缓存
-        self._effective_cache[group_id] = merged_config
-        self._cache_timestamps[group_id] = current_time
+        merged_config = dict(self._global_config)
+        if profile_key is not None:
+            merged_config.update((key, freeze_value(value)) for key, value in self._configs[profile_key].items())
+        merged_config.update(override)
+        if profile_ref is not None:
+            merged_config[PROFILE_REF_KEY] = profile_ref
         
+        snapshot = EffectiveConfig(merged_config, generation)
+        if intern_key is not None:
+            self._interned_snapshots[intern_key] = snapshot
         core.logger.debug(
-            f"[群管配置] 群{group_id}配置: "
-            f"全局配置项={len(global_config)}, "
-            f"分群配置项={len(group_config)}, "
-            f"合并后={len(merged_config)}"
+            f"[群管配置] 合并配置: 全局配置项={len(self._global_config)}, "
+            f"模板={profile_key or '无'}, 分群配置项={len(override)}, 合并后={len(merged_config)}"
         )
+        return snapshot
+
+    async def get_group_config(
+        self,
+        group_id: int,
+        global_config: dict[str, Any]
+    ) -> "EffectiveConfig":
+        """获取指定群的有效配置（合并全局配置和分群配置，带缓存）
         
-        return merged_config
+        Args:
+            group_id: 群号
+            global_config: 全局配置
+            
+        Returns:
+            合并后的配置快照（只读映射，用法与字典相同）
+        """
+        self.update_global_config(global_config)
+        await self.refresh()
+        return self.get_effective_snapshot(group_id)
     
     def clear_cache(self, group_id: Optional[int] = None) -> None:
         """清除配置缓存
@@ -133,145 +568,508 @@ class GroupConfigManager:
         """
         if group_id is None:
             self._effective_cache.clear()
-            self._cache_timestamps.clear()
+            self._global_snapshot = None
             core.logger.debug("[群管配置] 已清除所有配置缓存")
         else:
             self._effective_cache.pop(group_id, None)
-            self._cache_timestamps.pop(group_id, None)
             core.logger.debug(f"[群管配置] 已清除群{group_id}的配置缓存")
 
-    async def set_group_config(
+    def configure_cache(self, max_entries: int, ttl: Optional[float] = None) -> None:
+        """调整有效配置快照缓存的容量与过期时间，超出新容量的缓存立即被淘汰
+        
+        Args:
+            max_entries: 最大缓存群数
+            ttl: 过期时间（秒），为 None 时永不过期
+        """
+        self._effective_cache.resize(max_entries, ttl)
+
+    def cache_stats(self) -> dict[str, Any]:
+        """获取有效配置快照缓存的统计信息
+        
+        Returns:
+            包含条目数、容量、命中/未命中/淘汰/过期次数和命中率的字典，
+            以及当前驻留的共享快照数量（interned）
+        """
+        stats = self._effective_cache.stats()
+        stats["interned"] = len(self._interned_snapshots)
+        return stats
+
+    def _replace_configs(self, config: dict[str, dict]) -> None:
+        """用重新加载的配置替换内存配置，内容有变化的群和模板递增代数
+        
+        代数只增不减，保证重新加载后内容不同的快照不会与旧快照代数相同
+        （权限判断缓存等以代数作为缓存键的一部分）。
+        
+        Args:
+            config: 新的全部配置
+        """
+        old_configs = self._configs
+        self._configs = config
+        changed = False
+        for group_key in old_configs.keys() | config.keys():
+            if old_configs.get(group_key) != config.get(group_key):
+                self._bump_group_generation(group_key)
+                changed = True
+        if changed:
+            # 外部修改同样推进版本号，使基于旧内容的事务提交时报告冲突
+            self._version += 1
+        self.clear_cache()
+
+    def _bump_group_generation(self, group_key: str) -> None:
+        """递增指定群的分群配置代数，使其已缓存的有效配置快照失效"""
+        self._generation_counter += 1
+        self._group_generations[group_key] = self._generation_counter
+
+    def _apply_update(self, group_key: str, config_dict: dict[str, Any], actor: Optional[str] = None) -> None:
+        """在内存中更新指定群的配置项（调用方需持有修改锁）
+        
+        Args:
+            group_key: 群号字符串
+            config_dict: 要写入的配置项
+            actor: 发起修改的用户
+        """
+        # 复制后整体替换该群的配置字典，保证写入线程拿到的快照不被修改
+        group_config = dict(self._configs.get(group_key, {}))
+        group_config.update(config_dict)
+        self._configs[group_key] = group_config
+        self._bump_group_generation(group_key)
+        self._pending_changes.extend(
+            (group_key, config_key, config_value, False, actor) for config_key, config_value in config_dict.items()
+        )
+
+    def _apply_delete(self, group_key: str, config_key: Optional[str], actor: Optional[str] = None) -> bool:
+        """在内存中删除指定群的配置项（调用方需持有修改锁）
+        
+        Args:
+            group_key: 群号字符串
+            config_key: 配置键，如果为None则删除该群的所有配置
+            actor: 发起修改的用户
+            
+        Returns:
+            是否实际删除了配置
+        """
+        if group_key not in self._configs:
+            core.logger.warning(f"[群管配置] 群{group_key}没有单独配置，无需删除")
+            return False
+        
+        if config_key is None:
+            # 删除该群的所有配置
+            del self._configs[group_key]
+            self._bump_group_generation(group_key)
+            self._pending_changes.append((group_key, None, None, True, actor))
+            core.logger.info(f"[群管配置] 删除群{group_key}的所有配置")
+            return True
+        
+        # 删除指定配置项
+        if config_key not in self._configs[group_key]:
+            core.logger.warning(f"[群管配置] 群{group_key}没有配置项: {config_key}")
+            return False
+        
+        group_config = dict(self._configs[group_key])
+        del group_config[config_key]
+        core.logger.info(f"[群管配置] 删除群{group_key}的配置项: {config_key}")
+        
+        # 如果该群没有配置项了，删除该群
+        if group_config:
+            self._configs[group_key] = group_config
+        else:
+            del self._configs[group_key]
+        self._bump_group_generation(group_key)
+        self._pending_changes.append((group_key, config_key, None, True, actor))
+        return True
+
+    def _apply_replace(
         self,
-        group_id: int,
-        config_key: str,
-        config_value: Any
+        group_key: str,
+        config_dict: dict[str, Any],
+        replace: bool,
+        actor: Optional[str] = None
     ) -> bool:
-        """设置指定群的配置项
+        """在内存中合并或整体替换指定键的配置（调用方需持有修改锁）
         
         Args:
-            group_id: 群号
-            config_key: 配置键
-            config_value: 配置值
+            group_key: 群号字符串或配置模板键
+            config_dict: 要应用的配置字典
+            replace: True 时整体替换（为空则删除），False 时合并
+            actor: 发起修改的用户
             
         Returns:
-            是否设置成功
+            配置是否实际发生变化
         """
-        group_key = str(group_id)
+        current_config = self._configs.get(group_key, {})
+        new_config = dict(config_dict) if replace else {**current_config, **config_dict}
+        if new_config == current_config:
+            return False
         
-        # 加载现有配置
-        all_configs = self._load_config()
+        if replace and current_config:
+            self._pending_changes.append((group_key, None, None, True, actor))
+            changes = new_config
+        else:
+            changes = config_dict
         
-        # 确保该群的配置字典存在
-        if group_key not in all_configs:
-            all_configs[group_key] = {}
+        # 整体替换该群的配置字典，保证写入线程拿到的快照不被修改
+        if new_config:
+            self._configs[group_key] = new_config
+        else:
+            self._configs.pop(group_key, None)
+        self._pending_changes.extend(
+            (group_key, config_key, config_value, False, actor) for config_key, config_value in changes.items()
+        )
+        self._bump_group_generation(group_key)
+        return True
+
+    def _commit(self) -> None:
+        """提交一次修改：递增配置版本号并安排延迟写入（调用方需持有修改锁）"""
+        self._version += 1
+        self._schedule_save()
+
+    @property
+    def version(self) -> int:
+        """当前配置版本号，每次提交修改或重新加载到不同内容后单调递增
         
-        # 设置配置值
-        all_configs[group_key][config_key] = config_value
+        读取配置后记下版本号，再以 transaction(expected_version=...) 提交，即可检测期间的并发修改。
+        """
+        return self._version
+
+    async def set_group_config(
+        self,
+        group_id: int,
+        config_key: str,
+        config_value: Any,
+        actor: Optional[str] = None
+    ) -> None:
+        """设置指定群的配置项
         
-        # 保存配置
-        success = self._save_config(all_configs)
+        修改立即在内存中生效，写入存储在防抖延迟后进行，需要确认写入结果时调用 flush()。
         
-        if success:
-            core.logger.info(f"[群管配置] 群{group_id}设置配置: {config_key}={config_value}")
+        Args:
+            group_id: 群号
+            config_key: 配置键
+            config_value: 配置值
+            actor: 发起修改的用户（记录到变更日志）
+        """
+        async with self._lock:
+            await self.refresh()
+            self._apply_update(str(group_id), {config_key: config_value}, actor)
+            self._commit()
         
-        return success
+        core.logger.info(f"[群管配置] 群{group_id}设置配置: {config_key}={config_value}")
 
     async def set_multiple_group_config(
         self,
         group_id: int,
-        config_dict: dict[str, Any]
-    ) -> bool:
+        config_dict: dict[str, Any],
+        actor: Optional[str] = None
+    ) -> None:
         """批量设置指定群的配置项
         
+        修改立即在内存中生效，写入存储在防抖延迟后进行，需要确认写入结果时调用 flush()。
+        
         Args:
             group_id: 群号
             config_dict: 配置字典
+            actor: 发起修改的用户（记录到变更日志）
+        """
+        async with self._lock:
+            await self.refresh()
+            self._apply_update(str(group_id), config_dict, actor)
+            self._commit()
+        
+        core.logger.info(f"[群管配置] 群{group_id}批量设置配置: {len(config_dict)}项")
+
+    async def delete_group_config(
+        self,
+        group_id: int,
+        config_key: Optional[str] = None,
+        actor: Optional[str] = None
+    ) -> bool:
+        """删除指定群的配置项
+        
+        Args:
+            group_id: 群号
+            config_key: 配置键，如果为None则删除该群的所有配置
+            actor: 发起修改的用户（记录到变更日志）
             
         Returns:
-            是否设置成功
+            是否实际删除了配置（该群没有单独配置或没有该配置项时为 False）
         """
-        group_key = str(group_id)
+        async with self._lock:
+            await self.refresh()
+            deleted = self._apply_delete(str(group_id), config_key, actor)
+            if deleted:
+                self._commit()
+        return deleted
+
+    @asynccontextmanager
+    async def transaction(
+        self,
+        expected_version: Optional[int] = None,
+        actor: Optional[str] = None
+    ) -> AsyncIterator["ConfigTransaction"]:
+        """配置事务：在一次提交中对多个群应用多项修改，只触发一次写入
         
-        # 加载现有配置
-        all_configs = self._load_config()
+        事务体内的修改只会被记录，正常退出时在修改锁内一次性应用；事务体抛出异常时全部丢弃。
+        提供 expected_version 时执行 compare-and-set：若配置版本已被其他修改推进，
+        则不应用任何修改并抛出 ConfigConflictError。
         
-        # 确保该群的配置字典存在
-        if group_key not in all_configs:
-            all_configs[group_key] = {}
+        用法::
         
-        # 批量设置配置值
-        all_configs[group_key].update(config_dict)
+            version = manager.version
+            ...  # 读取配置并计算修改
+            try:
+                async with manager.transaction(expected_version=version) as txn:
+                    txn.set(123, "ENABLE_KICK", True)
+                    txn.replace(456, {"ENABLE_MUTE": False})
+                    txn.delete(789)
+            except ConfigConflictError:
+                ...  # 配置已被其他修改改变，重新读取后重试
         
-        # 保存配置
-        success = self._save_config(all_configs)
+        Args:
+            expected_version: 期望的配置版本号，为 None 时不做版本检查
+            actor: 发起修改的用户（记录到变更日志）
+            
+        Yields:
+            ConfigTransaction: 用于记录修改的事务对象，提交后 changed_groups 为配置实际变化的群
+            
+        Raises:
+            ConfigConflictError: 提交时配置版本与 expected_version 不一致
+        """
+        txn = ConfigTransaction()
+        yield txn
         
-        if success:
-            core.logger.info(f"[群管配置] 群{group_id}批量设置配置: {len(config_dict)}项")
+        async with self._lock:
+            await self.refresh()
+            if expected_version is not None and expected_version != self._version:
+                core.logger.warning(
+                    f"[群管配置] 事务版本冲突: 期望版本 {expected_version}, 当前版本 {self._version}，修改未应用"
+                )
+                raise ConfigConflictError(expected_version, self._version)
+            
+            changed_groups: dict[str, None] = {}
+            for operation, group_key, config_dict, config_key in txn.operations:
+                if operation == "delete":
+                    changed = self._apply_delete(group_key, config_key, actor)
+                else:
+                    changed = self._apply_replace(group_key, config_dict, operation == "replace", actor)
+                if changed:
+                    changed_groups[group_key] = None
+            if changed_groups:
+                self._commit()
+            txn.changed_groups = list(changed_groups)
+            txn.committed = True
+            txn.version = self._version
         
-        return success
+        if txn.operations:
+            core.logger.info(
+                f"[群管配置] 事务提交成功: {len(txn.operations)}项修改，{len(txn.changed_groups)}个群发生变化，"
+                f"当前版本 {txn.version}"
+            )
 
-    async def delete_group_config(
+    async def apply_to_groups(
         self,
-        group_id: int,
-        config_key: Optional[str] = None
-    ) -> bool:
-        """删除指定群的配置项
+        group_ids: Iterable[Union[int, str]],
+        config_dict: dict[str, Any],
+        replace: bool = False,
+        actor: Optional[str] = None
+    ) -> int:
+        """将同一份配置批量应用到多个群（一次加锁、一次提交、一次写入）
         
         Args:
-            group_id: 群号
-            config_key: 配置键，如果为None则删除该群的所有配置
+            group_ids: 目标群号列表
+            config_dict: 要应用的配置字典
+            replace: True 时用 config_dict 整体替换各群的单独配置（为空则删除单独配置），
+                False 时合并到各群现有配置中
+            actor: 发起修改的用户（记录到变更日志）
             
         Returns:
-            是否删除成功
+            配置实际发生变化的群数量
         """
-        group_key = str(group_id)
+        start_time = time.perf_counter()
+        async with self.transaction(actor=actor) as txn:
+            for group_id in group_ids:
+                if replace:
+                    txn.replace(group_id, config_dict)
+                else:
+                    txn.update(group_id, config_dict)
+        changed_count = len(txn.changed_groups)
         
-        # 加载现有配置
-        all_configs = self._load_config()
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        core.logger.info(
+            f"[群管配置] 批量应用配置: {len(config_dict)}项 -> {changed_count}个群发生变化，耗时 {elapsed_ms:.1f}ms"
+        )
+        return changed_count
+
+    async def set_profile(self, name: str, config_dict: dict[str, Any], actor: Optional[str] = None) -> bool:
+        """创建或整体替换配置模板
         
-        if group_key not in all_configs:
-            core.logger.warning(f"[群管配置] 群{group_id}没有单独配置，无需删除")
-            return True
+        Args:
+            name: 模板名称
+            config_dict: 模板配置字典
+            actor: 发起修改的用户（记录到变更日志）
+            
+        Returns:
+            模板配置是否实际发生变化
+        """
+        async with self._lock:
+            await self.refresh()
+            changed = self._apply_replace(f"{PROFILE_KEY_PREFIX}{name}", config_dict, True, actor)
+            if changed:
+                self._commit()
         
-        if config_key is None:
-            # 删除该群的所有配置
-            del all_configs[group_key]
-            core.logger.info(f"[群管配置] 删除群{group_id}的所有配置")
-        else:
-            # 删除指定配置项
-            if config_key in all_configs[group_key]:
-                del all_configs[group_key][config_key]
-                core.logger.info(f"[群管配置] 删除群{group_id}的配置项: {config_key}")
-                
-                # 如果该群没有配置项了，删除该群
-                if not all_configs[group_key]:
-                    del all_configs[group_key]
-            else:
-                core.logger.warning(f"[群管配置] 群{group_id}没有配置项: {config_key}")
-                return True
+        core.logger.info(f"[群管配置] 设置配置模板 {name}: {len(config_dict)}项")
+        return changed
+
+    async def delete_profile(self, name: str, actor: Optional[str] = None) -> bool:
+        """删除配置模板（引用该模板的群将回退为 全局配置 -> 分群配置）
         
-        # 保存配置
-        return self._save_config(all_configs)
+        Args:
+            name: 模板名称
+            actor: 发起修改的用户（记录到变更日志）
+            
+        Returns:
+            模板是否存在并被删除
+        """
+        async with self._lock:
+            await self.refresh()
+            deleted = self._apply_delete(f"{PROFILE_KEY_PREFIX}{name}", None, actor)
+            if deleted:
+                self._commit()
+        return deleted
+
+    def list_profiles(self) -> dict[str, dict]:
+        """列出所有配置模板
+        
+        Returns:
+            模板字典 {模板名称: 模板配置}（副本）
+        """
+        self._check_reload()
+        return {
+            key[len(PROFILE_KEY_PREFIX):]: dict(config)
+            for key, config in self._configs.items()
+            if key.startswith(PROFILE_KEY_PREFIX)
+        }
+
+    def count_profile_usage(self) -> dict[str, int]:
+        """统计每个配置模板被多少个群引用
+        
+        Returns:
+            {模板名称: 引用群数}
+        """
+        self._check_reload()
+        usage: dict[str, int] = {}
+        for group_key, config in self._configs.items():
+            if group_key.startswith(PROFILE_KEY_PREFIX) or PROFILE_REF_KEY not in config:
+                continue
+            usage[config[PROFILE_REF_KEY]] = usage.get(config[PROFILE_REF_KEY], 0) + 1
+        return usage
+
+    async def assign_profile(
+        self,
+        group_ids: Iterable[Union[int, str]],
+        name: Optional[str],
+        keep_overrides: bool = False,
+        actor: Optional[str] = None
+    ) -> int:
+        """为多个群指定配置模板（一次提交、一次写入）
+        
+        Args:
+            group_ids: 目标群号列表
+            name: 模板名称，为 None 时取消模板引用
+            keep_overrides: 是否保留各群原有的单独配置；为 False 时各群只保存模板引用
+            actor: 发起修改的用户（记录到变更日志）
+            
+        Returns:
+            配置实际发生变化的群数量
+        """
+        if keep_overrides:
+            if name is None:
+                changed_count = 0
+                async with self._lock:
+                    await self.refresh()
+                    for group_id in group_ids:
+                        group_key = str(group_id)
+                        if PROFILE_REF_KEY not in self._configs.get(group_key, {}):
+                            continue
+                        self._apply_delete(group_key, PROFILE_REF_KEY, actor)
+                        changed_count += 1
+                    if changed_count:
+                        self._commit()
+                return changed_count
+            return await self.apply_to_groups(group_ids, {PROFILE_REF_KEY: name}, replace=False, actor=actor)
+        
+        config_dict = {} if name is None else {PROFILE_REF_KEY: name}
+        return await self.apply_to_groups(group_ids, config_dict, replace=True, actor=actor)
 
     async def list_group_configs(self) -> dict[str, dict]:
         """列出所有有单独配置的群
         
         Returns:
-            群配置字典 {group_id: config_dict}
+            群配置字典 {group_id: config_dict}（副本，修改不影响内存配置）
         """
-        all_configs = self._load_config()
-        return all_configs
+        await self.refresh()
+        return {
+            group_key: dict(config)
+            for group_key, config in self._configs.items()
+            if not group_key.startswith(PROFILE_KEY_PREFIX)
+        }
 
-    async def reset_group_config(self, group_id: int) -> bool:
+    def list_configured_groups(self) -> list[str]:
+        """列出所有有单独配置的群号
+        
+        Returns:
+            群号字符串列表
+        """
+        self._check_reload()
+        return [group_key for group_key in self._configs if not group_key.startswith(PROFILE_KEY_PREFIX)]
+
+    def has_group_config(self, group_id: int) -> bool:
+        """检查指定群是否有单独配置
+        
+        Args:
+            group_id: 群号
+            
+        Returns:
+            是否有单独配置
+        """
+        self._check_reload()
+        return str(group_id) in self._configs
+
+    def get_group_override(self, group_id: int) -> dict[str, Any]:
+        """获取指定群的单独配置（不合并全局配置）
+        
+        Args:
+            group_id: 群号
+            
+        Returns:
+            分群配置字典副本，没有单独配置时返回空字典
+        """
+        self._check_reload()
+        return dict(self._configs.get(str(group_id), {}))
+
+    async def reset_group_config(self, group_id: int, actor: Optional[str] = None) -> bool:
         """重置指定群的配置为全局配置（删除该群的单独配置）
         
         Args:
             group_id: 群号
+            actor: 发起修改的用户（记录到变更日志）
+            
+        Returns:
+            该群原先是否有单独配置
+        """
+        return await self.delete_group_config(group_id, actor=actor)
+
+    async def get_change_history(self, group_id: Optional[int] = None, limit: int = 20) -> list[dict[str, Any]]:
+        """获取配置变更记录（仅日志存储后端会记录历史）
+        
+        Args:
+            group_id: 群号，为 None 时返回所有群的记录
+            limit: 最多返回的记录数
             
         Returns:
-            是否重置成功
+            变更记录列表，按时间从新到旧排列，每条包含 ts/op/group/key/value/actor
         """
-        return await self.delete_group_config(group_id)
+        group_key = None if group_id is None else str(group_id)
+        return await asyncio.to_thread(self._storage.read_history, group_key, limit)
 
     async def get_config_summary(self, group_id: int) -> str:
         """获取指定群的配置摘要
@@ -282,12 +1080,12 @@ class GroupConfigManager:
         Returns:
             配置摘要字符串
         """
-        all_configs = self._load_config()
+        await self.refresh()
         group_key = str(group_id)
         
-        if group_key not in all_configs:
+        if group_key not in self._configs:
             return f"群{group_id}使用全局默认配置（无单独配置）"
         
-        config = all_configs[group_key]
+        config = self._configs[group_key]
         items = [f"{k}={v}" for k, v in config.items()]
         return f"群{group_id}单独配置（共{len(config)}项）:\n" + "\n".join(f"  - {item}" for item in items)
@@ -0,0 +1,581 @@
+"""
+群管插件 - 分群配置存储后端模块
+
+提供分群配置的持久化存储后端：JSON 文件与 SQLite 数据库。
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from nekro_agent.api import core
+
+
+# 单条配置修改: (group_key, config_key, config_value, is_delete, actor)
+# config_key 为 None 且 is_delete 为 True 时表示删除该群的所有配置；actor 为发起修改的用户（可为 None）
+ConfigChange = tuple[str, Optional[str], Any, bool, Optional[str]]
+
+
+def apply_change(config: dict[str, dict], change: ConfigChange) -> None:
+    """将一条修改应用到配置字典（原地修改）
+    
+    Args:
+        config: 配置字典
+        change: 配置修改
+    """
+    group_key, config_key, value, is_delete = change[:4]
+    if not is_delete:
+        config.setdefault(group_key, {})[config_key] = value
+    elif config_key is None:
+        config.pop(group_key, None)
+    elif group_key in config:
+        config[group_key].pop(config_key, None)
+        if not config[group_key]:
+            del config[group_key]
+
+
+def _default_file_mode() -> int:
+    """新建文件的默认权限（0o666 去掉当前 umask），与 open() 创建文件时一致"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# 新建配置文件的权限；tempfile.mkstemp 创建的文件固定为 0600，写入时需改回
+_DEFAULT_FILE_MODE = _default_file_mode()
+
+
+def _read_lines_reversed(path: Path, block_size: int = 64 * 1024) -> Iterator[bytes]:
+    """从文件末尾开始按块读取，逐行倒序产出（不含换行符），读取量只与实际消费的行数有关
+    
+    Args:
+        path: 文件路径
+        block_size: 每次读取的字节数
+    
+    Returns:
+        行内容迭代器，文件不存在时抛出 FileNotFoundError
+    """
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            # 第一段可能是上一块中某行的后半部分，留到读取上一块时拼接
+            remainder = lines.pop(0)
+            yield from reversed(lines)
+        yield remainder
+
+
+class ConfigStorage(ABC):
+    """分群配置存储后端基类
+    
+    GroupConfigManager 在内存中保存全部分群配置，存储后端只负责加载、变更检测和持久化。
+    persist 会在工作线程中调用，实现需保证线程安全。
+    """
+    
+    # persist 是否需要完整的配置快照（只能整体写入的后端为 True）
+    needs_snapshot = False
+
+    @abstractmethod
+    def load_all(self) -> Optional[dict[str, dict]]:
+        """加载全部分群配置
+        
+        Returns:
+            配置字典，读取失败时返回 None
+        """
+
+    def load_group(self, group_key: str) -> Optional[dict[str, Any]]:
+        """加载单个群的配置
+        
+        Args:
+            group_key: 群号字符串
+        
+        Returns:
+            该群的配置字典，没有单独配置时返回 None
+        """
+        config = self.load_all()
+        if config is None:
+            return None
+        return config.get(group_key)
+
+    def has_changed(self) -> bool:
+        """检查存储内容是否被外部修改（自上次加载或写入之后）"""
+        return False
+
+    def read_history(self, group_key: Optional[str] = None, limit: int = 20) -> list[dict[str, Any]]:
+        """读取配置变更记录（仅支持记录历史的存储后端）
+        
+        Args:
+            group_key: 群号字符串，为 None 时返回所有群的记录
+            limit: 最多返回的记录数
+        
+        Returns:
+            变更记录列表，按时间从新到旧排列
+        """
+        return []
+
+    @abstractmethod
+    def persist(self, snapshot: Optional[dict[str, dict]], changes: list[ConfigChange]) -> None:
+        """持久化配置修改，失败时抛出异常
+        
+        Args:
+            snapshot: 完整配置快照（仅 needs_snapshot 为 True 时提供）
+            changes: 自上次持久化以来的修改列表
+        """
+
+    def close(self) -> None:
+        """释放存储后端占用的资源"""
+
+
+class JsonFileStorage(ConfigStorage):
+    """JSON 文件存储后端
+    
+    所有分群配置保存在一个 JSON 文件中，每次持久化原子地整体重写该文件。
+    """
+    
+    needs_snapshot = True
+
+    def __init__(self, file_path: str = "data/group_configs.json"):
+        """初始化 JSON 文件存储
+        
+        Args:
+            file_path: 配置文件路径
+        """
+        self.file_path = Path(file_path)
+        self._file_signature: Optional[tuple[int, int, int]] = None  # 已加载文件的 (mtime_ns, size, inode)
+        self._ensure_file()
+
+    def _ensure_file(self) -> None:
+        """确保配置文件存在"""
+        # 确保目录存在
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # 如果文件不存在，创建空配置
+        if not self.file_path.exists():
+            self.persist({}, [])
+            core.logger.info(f"[群管配置] 创建配置文件: {self.file_path}")
+
+    def _get_file_signature(self) -> Optional[tuple[int, int, int]]:
+        """获取配置文件签名，用于检测文件是否被外部修改
+        
+        Returns:
+            (mtime_ns, size, inode)，文件不存在时返回 None
+        """
+        try:
+            stat = self.file_path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _backup_broken_file(self) -> None:
+        """备份损坏的配置文件，防止后续写入覆盖后无法排查"""
+        backup_path = self.file_path.with_name(f"{self.file_path.name}.broken-{int(time.time())}")
+        try:
+            shutil.copy2(self.file_path, backup_path)
+            core.logger.warning(f"[群管配置] 已备份损坏的配置文件: {backup_path}")
+        except Exception as e:
+            core.logger.error(f"[群管配置] 备份损坏的配置文件失败: {e}")
+
+    def load_all(self) -> Optional[dict[str, dict]]:
+        signature = self._get_file_signature()
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+                core.logger.debug(f"[群管配置] 加载配置成功，共 {len(config)} 个群有单独配置")
+                return config
+        except FileNotFoundError:
+            core.logger.warning(f"[群管配置] 配置文件不存在，返回空配置")
+            return {}
+        except json.JSONDecodeError as e:
+            core.logger.error(f"[群管配置] 配置文件格式错误: {e}")
+            self._backup_broken_file()
+            return None
+        except Exception as e:
+            core.logger.error(f"[群管配置] 加载配置失败: {e}")
+            return None
+        finally:
+            # 无论成功与否都记录签名，避免对同一个损坏文件反复解析
+            self._file_signature = signature
+
+    def has_changed(self) -> bool:
+        return self._get_file_signature() != self._file_signature
+
+    def persist(self, snapshot: Optional[dict[str, dict]], changes: list[ConfigChange]) -> None:
+        """原子写入配置文件（临时文件 + fsync + rename），保留原文件的权限"""
+        try:
+            file_mode = stat.S_IMODE(self.file_path.stat().st_mode)
+        except OSError:
+            file_mode = _DEFAULT_FILE_MODE
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{self.file_path.name}.",
+            suffix=".tmp",
+            dir=self.file_path.parent,
+        )
+        try:
+            os.fchmod(fd, file_mode)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot or {}, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        # 记录自身写入后的文件签名，避免把自己的写入当作外部修改重新加载
+        self._file_signature = self._get_file_signature()
+
+
+class SqliteConfigStorage(ConfigStorage):
+    """SQLite 存储后端
+    
+    每个配置项保存为 (group_id, key) -> value 的一行，按主键索引点查，
+    修改只写入变化的行，适合管理大量群组的场景。使用 WAL 模式，读写互不阻塞。
+    """
+
+    def __init__(self, db_path: str = "data/group_configs.db"):
+        """初始化 SQLite 存储
+        
+        Args:
+            db_path: 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 连接会在事件循环线程和写入工作线程之间共享，由 _conn_lock 串行化访问
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn_lock = threading.Lock()
+        self._data_version: Optional[int] = None
+        with self._conn_lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS group_config ("
+                "group_id TEXT NOT NULL, "
+                "key TEXT NOT NULL, "
+                "value TEXT NOT NULL, "
+                "PRIMARY KEY (group_id, key)"
+                ") WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    def _read_data_version(self) -> int:
+        """读取数据库的 data_version，其他连接提交修改后该值会变化（调用方需持有连接锁）"""
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load_all(self) -> Optional[dict[str, dict]]:
+        config: dict[str, dict] = {}
+        try:
+            with self._conn_lock:
+                rows = self._conn.execute("SELECT group_id, key, value FROM group_config").fetchall()
+                self._data_version = self._read_data_version()
+        except sqlite3.Error as e:
+            core.logger.error(f"[群管配置] 加载 SQLite 配置失败: {e}")
+            return None
+        
+        for group_key, config_key, value in rows:
+            config.setdefault(group_key, {})[config_key] = json.loads(value)
+        core.logger.debug(f"[群管配置] 加载配置成功，共 {len(config)} 个群有单独配置")
+        return config
+
+    def load_group(self, group_key: str) -> Optional[dict[str, Any]]:
+        try:
+            with self._conn_lock:
+                rows = self._conn.execute(
+                    "SELECT key, value FROM group_config WHERE group_id = ?", (group_key,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            core.logger.error(f"[群管配置] 读取群{group_key}的 SQLite 配置失败: {e}")
+            return None
+        if not rows:
+            return None
+        return {config_key: json.loads(value) for config_key, value in rows}
+
+    def has_changed(self) -> bool:
+        with self._conn_lock:
+            return self._read_data_version() != self._data_version
+
+    def persist(self, snapshot: Optional[dict[str, dict]], changes: list[ConfigChange]) -> None:
+        """在一个事务中写入所有修改：设置为单行 upsert，删除为按主键删除"""
+        if not changes:
+            return
+        with self._conn_lock:
+            with self._conn:
+                for group_key, config_key, value, is_delete, _actor in changes:
+                    if not is_delete:
+                        self._conn.execute(
+                            "INSERT INTO group_config (group_id, key, value) VALUES (?, ?, ?) "
+                            "ON CONFLICT (group_id, key) DO UPDATE SET value = excluded.value",
+                            (group_key, config_key, json.dumps(value, ensure_ascii=False)),
+                        )
+                    elif config_key is None:
+                        self._conn.execute("DELETE FROM group_config WHERE group_id = ?", (group_key,))
+                    else:
+                        self._conn.execute(
+                            "DELETE FROM group_config WHERE group_id = ? AND key = ?",
+                            (group_key, config_key),
+                        )
+
+    def migrate_from_json(self, json_path: str) -> int:
+        """从旧的 group_configs.json 一次性导入配置
+        
+        导入完成后在 meta 表中记录标记，之后不会重复导入。数据库中已有配置时只记录标记不导入。
+        
+        Args:
+            json_path: JSON 配置文件路径
+        
+        Returns:
+            导入的群数量
+        """
+        with self._conn_lock:
+            migrated = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'migrated_from_json'"
+            ).fetchone()
+            if migrated is not None:
+                return 0
+            has_rows = self._conn.execute("SELECT 1 FROM group_config LIMIT 1").fetchone() is not None
+        
+        config: dict[str, dict] = {}
+        if not has_rows and Path(json_path).exists():
+            config = JsonFileStorage(json_path).load_all()
+            if config is None:
+                core.logger.error(f"[群管配置] 无法解析 {json_path}，跳过迁移")
+                return 0
+        
+        rows = [
+            (group_key, config_key, json.dumps(value, ensure_ascii=False))
+            for group_key, group_config in config.items()
+            for config_key, value in group_config.items()
+        ]
+        with self._conn_lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO group_config (group_id, key, value) VALUES (?, ?, ?)", rows
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                    (str(json_path),),
+                )
+        
+        if config:
+            core.logger.info(f"[群管配置] 已从 {json_path} 迁移 {len(config)} 个群的配置到 {self.db_path}")
+        return len(config)
+
+    def close(self) -> None:
+        with self._conn_lock:
+            self._conn.close()
+
+
+class JournalConfigStorage(ConfigStorage):
+    """日志存储后端
+    
+    以 JSON 配置文件为快照，每次修改只向变更日志追加一行（含修改时间和修改人），写入开销与修改量成正比。
+    启动时在快照上重放日志；日志超过条数或大小阈值时压缩：写入新快照、将日志归档到历史文件并清空。
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str = "data/group_configs.json",
+        compact_max_entries: int = 1000,
+        compact_max_bytes: int = 1024 * 1024
+    ):
+        """初始化日志存储
+        
+        Args:
+            snapshot_path: 快照文件路径（与 JSON 文件存储使用同一格式）
+            compact_max_entries: 日志条数超过该值时压缩
+            compact_max_bytes: 日志大小超过该值（字节）时压缩
+        """
+        self._snapshot = JsonFileStorage(snapshot_path)
+        self.journal_path = self._snapshot.file_path.with_name(f"{self._snapshot.file_path.name}.journal")
+        self.history_path = self._snapshot.file_path.with_name(f"{self._snapshot.file_path.name}.history")
+        self.compact_max_entries = compact_max_entries
+        self.compact_max_bytes = compact_max_bytes
+        self._journal_entries = 0
+        self._journal_signature: Optional[tuple[int, int]] = None  # 日志文件的 (mtime_ns, size)
+        self._io_lock = threading.Lock()
+
+    def _get_journal_signature(self) -> Optional[tuple[int, int]]:
+        """获取日志文件签名"""
+        try:
+            stat = self.journal_path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _replay_journal(self, config: dict[str, dict]) -> int:
+        """在配置上重放变更日志（调用方需持有 I/O 锁）
+        
+        Args:
+            config: 快照配置字典（原地修改）
+        
+        Returns:
+            重放的日志条数
+        """
+        count = 0
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 追加过程中崩溃只会留下不完整的最后一行，跳过即可
+                        core.logger.warning(f"[群管配置] 跳过无法解析的变更日志第{line_no}行")
+                        continue
+                    apply_change(
+                        config,
+                        (entry["group"], entry.get("key"), entry.get("value"), entry["op"] == "delete", entry.get("actor")),
+                    )
+                    count += 1
+        except FileNotFoundError:
+            pass
+        return count
+
+    def _truncate_partial_tail(self) -> None:
+        """截掉崩溃时留下的不完整最后一行，避免之后追加的内容与其拼接（调用方需持有 I/O 锁）"""
+        try:
+            with open(self.journal_path, "rb+") as f:
+                data = f.read()
+                if not data or data.endswith(b"\n"):
+                    return
+                f.truncate(data.rfind(b"\n") + 1)
+                f.flush()
+                os.fsync(f.fileno())
+        except FileNotFoundError:
+            return
+        core.logger.warning("[群管配置] 已截掉变更日志末尾不完整的记录")
+
+    def load_all(self) -> Optional[dict[str, dict]]:
+        with self._io_lock:
+            config = self._snapshot.load_all()
+            if config is None:
+                return None
+            self._truncate_partial_tail()
+            self._journal_entries = self._replay_journal(config)
+            self._journal_signature = self._get_journal_signature()
+        
+        if self._journal_entries:
+            core.logger.info(f"[群管配置] 已重放 {self._journal_entries} 条配置变更日志")
+        return config
+
+    def has_changed(self) -> bool:
+        return self._snapshot.has_changed() or self._get_journal_signature() != self._journal_signature
+
+    def persist(self, snapshot: Optional[dict[str, dict]], changes: list[ConfigChange]) -> None:
+        """将修改追加到变更日志，必要时压缩"""
+        if not changes:
+            return
+        
+        now = int(time.time())
+        lines = []
+        for group_key, config_key, value, is_delete, actor in changes:
+            entry = {
+                "ts": now,
+                "op": "delete" if is_delete else "set",
+                "group": group_key,
+                "key": config_key,
+                "actor": actor,
+            }
+            if not is_delete:
+                entry["value"] = value
+            lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+        
+        with self._io_lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_entries += len(lines)
+            self._journal_signature = self._get_journal_signature()
+            
+            journal_size = self._journal_signature[1] if self._journal_signature else 0
+            if self._journal_entries >= self.compact_max_entries or journal_size >= self.compact_max_bytes:
+                self._compact()
+
+    def _compact(self) -> None:
+        """压缩变更日志：写入新快照，将日志归档到历史文件后清空（调用方需持有 I/O 锁）
+        
+        每一步都可安全中断：快照写入前崩溃则日志完整保留；快照写入后、清空前崩溃时重放的修改都是幂等的。
+        """
+        config = self._snapshot.load_all()
+        if config is None:
+            core.logger.error("[群管配置] 快照无法解析，跳过变更日志压缩")
+            return
+        entries = self._replay_journal(config)
+        self._snapshot.persist(config, [])
+        
+        with open(self.journal_path, "rb") as src, open(self.history_path, "ab") as dst:
+            shutil.copyfileobj(src, dst)
+            dst.flush()
+            os.fsync(dst.fileno())
+        with open(self.journal_path, "w", encoding="utf-8") as f:
+            f.flush()
+            os.fsync(f.fileno())
+        
+        self._journal_entries = 0
+        self._journal_signature = self._get_journal_signature()
+        core.logger.info(f"[群管配置] 变更日志已压缩: {entries} 条修改写入快照，共 {len(config)} 个群有单独配置")
+
+    def read_history(self, group_key: Optional[str] = None, limit: int = 20) -> list[dict[str, Any]]:
+        entries: list[dict[str, Any]] = []
+        with self._io_lock:
+            # 先读当前日志（最新），不足时再读历史归档
+            # 历史归档会持续增长，从文件末尾倒序读取，取够条数即停止
+            for path in (self.journal_path, self.history_path):
+                try:
+                    for line in _read_lines_reversed(path):
+                        if not line.strip():
+                            continue
+                        try:
+                            entry = json.loads(line)
+                        except (json.JSONDecodeError, UnicodeDecodeError):
+                            continue
+                        if group_key is None or entry.get("group") == group_key:
+                            entries.append(entry)
+                            if len(entries) >= limit:
+                                return entries
+                except FileNotFoundError:
+                    continue
+        return entries
+
+    def close(self) -> None:
+        # 关闭前压缩，保证快照文件单独也是完整的配置
+        with self._io_lock:
+            if self._journal_entries:
+                try:
+                    self._compact()
+                except Exception as e:
+                    core.logger.error(f"[群管配置] 压缩变更日志失败: {e}")
+
+
+def open_sqlite_storage(db_path: str, json_path: Optional[str] = None) -> SqliteConfigStorage:
+    """打开 SQLite 存储，并在首次使用时从 JSON 配置文件迁移数据
+    
+    Args:
+        db_path: 数据库文件路径
+        json_path: 旧的 JSON 配置文件路径，为 None 时不迁移
+    
+    Returns:
+        SQLite 存储后端
+    """
+    storage = SqliteConfigStorage(db_path)
+    if json_path is not None:
+        storage.migrate_from_json(json_path)
+    return storage
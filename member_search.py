@@ -0,0 +1,148 @@
+"""
+群管插件 - 群成员搜索模块
+
+为群成员名单建立 n-gram 倒排索引，按群名片、昵称、QQ号进行子串搜索，并按匹配程度排序。
+"""
+
+import unicodedata
+from typing import Any, Iterable
+
+
+# 匹配程度，数值越小越好
+MATCH_EXACT = 0
+MATCH_PREFIX = 1
+MATCH_SUBSTRING = 2
+
+# 参与搜索的字段，顺序即同等匹配程度下的优先级
+SEARCH_FIELDS = ("card", "nickname", "user_id")
+
+# 索引的 gram 长度：单字与二元组，长度不小于 2 的关键词用二元组求交集
+_GRAM_SIZES = (1, 2)
+
+_EMPTY: frozenset[str] = frozenset()
+
+
+def normalize_search_text(text: Any) -> str:
+    """规范化搜索文本：统一全角/半角与兼容字符（NFKC），忽略大小写，去除首尾空白
+    
+    Args:
+        text: 原始文本
+    
+    Returns:
+        规范化后的文本
+    """
+    return unicodedata.normalize("NFKC", str(text or "")).casefold().strip()
+
+
+def _grams(text: str) -> set[str]:
+    """文本中所有长度为 1 和 2 的片段"""
+    return {text[i:i + size] for size in _GRAM_SIZES for i in range(len(text) - size + 1)}
+
+
+def _query_grams(query: str) -> set[str]:
+    """检索关键词所需的片段：长度不小于 2 时取全部二元组，否则取单字"""
+    if len(query) < 2:
+        return {query}
+    return {query[i:i + 2] for i in range(len(query) - 1)}
+
+
+class MemberSearchIndex:
+    """群成员 n-gram 倒排索引
+    
+    以规范化后的群名片、昵称、QQ号中的单字和二元组为键，记录包含该片段的成员。
+    搜索时对关键词各片段的成员集合求交集得到候选，再逐个校验并按匹配程度排序，
+    不需要遍历整个名单。支持逐个增删成员。
+    """
+
+    def __init__(self, members: Iterable[dict[str, Any]] = ()):
+        """初始化索引
+        
+        Args:
+            members: 成员信息（需包含 user_id，可含 card、nickname）
+        """
+        self._postings: dict[str, set[str]] = {}  # 片段 -> 成员QQ号集合
+        self._keys: dict[str, tuple[str, ...]] = {}  # 成员QQ号 -> 各字段规范化后的文本
+        self._members: dict[str, dict[str, Any]] = {}  # 成员QQ号 -> 成员信息
+        for member in members:
+            self.add(member)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def add(self, member: dict[str, Any]) -> None:
+        """添加或更新成员
+        
+        Args:
+            member: 成员信息
+        """
+        user_id = str(member["user_id"])
+        if user_id in self._keys:
+            self.remove(user_id)
+        keys = tuple(normalize_search_text(member.get(field)) for field in SEARCH_FIELDS)
+        self._keys[user_id] = keys
+        self._members[user_id] = member
+        for gram in set().union(*(_grams(key) for key in keys)):
+            self._postings.setdefault(gram, set()).add(user_id)
+
+    def remove(self, user_id: str) -> None:
+        """移除成员
+        
+        Args:
+            user_id: 成员QQ号
+        """
+        user_id = str(user_id)
+        keys = self._keys.pop(user_id, None)
+        if keys is None:
+            return
+        self._members.pop(user_id, None)
+        for gram in set().union(*(_grams(key) for key in keys)):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(user_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def _candidates(self, query: str) -> Iterable[str]:
+        """包含关键词全部片段的成员（可能有误报，需再校验）"""
+        postings = sorted((self._postings.get(gram, _EMPTY) for gram in _query_grams(query)), key=len)
+        if not postings[0]:
+            return ()
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
+
+    def search(self, keyword: str) -> list[tuple[int, dict[str, Any]]]:
+        """搜索成员
+        
+        Args:
+            keyword: 搜索关键词（群名片、昵称或QQ号的一部分）
+        
+        Returns:
+            list[tuple[int, dict]]: (匹配程度, 成员信息) 列表，按匹配程度（完全匹配 > 前缀匹配 > 包含）、
+            匹配字段（群名片 > 昵称 > QQ号）、匹配文本长度排序
+        """
+        query = normalize_search_text(keyword)
+        if not query:
+            return []
+        
+        ranked = []
+        for user_id in self._candidates(query):
+            best = None
+            for field_index, key in enumerate(self._keys[user_id]):
+                if key == query:
+                    rank = (MATCH_EXACT, field_index, len(key))
+                elif key.startswith(query):
+                    rank = (MATCH_PREFIX, field_index, len(key))
+                elif query in key:
+                    rank = (MATCH_SUBSTRING, field_index, len(key))
+                else:
+                    continue
+                if best is None or rank < best:
+                    best = rank
+            if best is not None:
+                ranked.append((best, user_id))
+        ranked.sort()
+        return [(rank[0], self._members[user_id]) for rank, user_id in ranked]
@@ -0,0 +1,737 @@
+"""
+群管插件 - OneBot 信息缓存模块
+
+缓存 bot 自身的 QQ 号、群成员在各群内的角色以及群成员列表，减少权限检查和成员查找时的 OneBot API 调用。
+"""
+
+import asyncio
+import bisect
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterator, Optional
+
+from nekro_agent.api import core
+
+from .cache import LRUCache, SingleFlight
+from .member_search import MemberSearchIndex, normalize_search_text
+
+
+# 只读 OneBot 请求的合并器，并发的相同请求只发起一次
+onebot_flight = SingleFlight()
+
+
+async def fetch_login_info(bot: Any) -> dict[str, Any]:
+    """获取 bot 登录信息（合并并发的相同请求）
+    
+    Args:
+        bot: OneBot 实例
+    
+    Returns:
+        登录信息
+    """
+    return await onebot_flight.do((id(bot), "get_login_info"), bot.get_login_info)
+
+
+async def fetch_group_member_info(bot: Any, group_id: int, user_id: str) -> dict[str, Any]:
+    """获取群成员信息（不使用 OneBot 实现端缓存，合并并发的相同请求）
+    
+    Args:
+        bot: OneBot 实例
+        group_id: 群号
+        user_id: 成员QQ号
+    
+    Returns:
+        群成员信息
+    """
+    return await onebot_flight.do(
+        (id(bot), "get_group_member_info", group_id, str(user_id)),
+        lambda: bot.get_group_member_info(group_id=group_id, user_id=int(user_id), no_cache=True),
+    )
+
+
+async def fetch_group_member_list(bot: Any, group_id: int) -> list[dict[str, Any]]:
+    """获取群成员列表（合并并发的相同请求，返回的列表为共享对象，不应修改）
+    
+    Args:
+        bot: OneBot 实例
+        group_id: 群号
+    
+    Returns:
+        群成员列表
+    """
+    return await onebot_flight.do(
+        (id(bot), "get_group_member_list", group_id),
+        lambda: bot.get_group_member_list(group_id=group_id),
+    )
+
+
+class MemberRoleCache:
+    """群成员角色缓存
+    
+    按 (群号, QQ号) 缓存成员角色（owner/admin/member），由 OneBot 通知事件（管理员变动、
+    成员增减）保持最新；条目有过期时间作为兜底，过期后重新从 OneBot 获取。
+    """
+
+    def __init__(self, max_entries: int = 65536, ttl: float = 600):
+        """初始化缓存
+        
+        Args:
+            max_entries: 最多缓存多少个成员的角色
+            ttl: 角色的缓存时间（秒），超时后重新获取
+        """
+        # (group_id, user_id) -> (写入时的群纪元, 角色)
+        self._roles: LRUCache[tuple[int, str], tuple[int, str]] = LRUCache(max_entries, ttl)
+        self._group_epochs: dict[int, int] = {}  # 群纪元，整群失效时更新，旧纪元的条目视为未命中
+        self._epoch_counter = 0
+        self._group_versions: dict[int, int] = {}  # 群角色版本，该群成员角色发生变动时递增
+        self._clear_count = 0  # 清空次数，清空后所有群的角色版本都视为变化
+
+    def _group_epoch(self, group_id: int) -> int:
+        return self._group_epochs.get(group_id, 0)
+
+    def role_version(self, group_id: int) -> tuple[int, int]:
+        """获取指定群的角色版本
+        
+        该群成员角色因通知事件变动、被手动刷新或整个缓存被清空时版本都会变化，
+        可作为依赖成员角色的其他缓存（如权限判断结果）的失效依据。
+        
+        Args:
+            group_id: 群号
+        
+        Returns:
+            角色版本
+        """
+        return self._clear_count, self._group_versions.get(group_id, 0)
+
+    def _bump_version(self, group_id: int) -> None:
+        self._group_versions[group_id] = self._group_versions.get(group_id, 0) + 1
+
+    async def get_role(self, bot: Any, group_id: int, user_id: str, refresh: bool = False) -> str:
+        """获取成员在群内的角色
+        
+        Args:
+            bot: OneBot 实例
+            group_id: 群号
+            user_id: 成员QQ号
+            refresh: 是否忽略缓存强制从 OneBot 重新获取
+        
+        Returns:
+            角色: owner / admin / member
+        """
+        user_id = str(user_id)
+        if not refresh:
+            role = self.peek_role(group_id, user_id, count=True)
+            if role is not None:
+                return role
+        
+        member_info = await fetch_group_member_info(bot, group_id, user_id)
+        role = member_info.get("role", "member")
+        self.set_role(group_id, user_id, role)
+        return role
+
+    def peek_role(self, group_id: int, user_id: str, count: bool = False) -> Optional[str]:
+        """读取已缓存的成员角色（不发起请求）
+        
+        Args:
+            group_id: 群号
+            user_id: 成员QQ号
+            count: 是否计入命中/未命中统计
+        
+        Returns:
+            角色，未缓存、已过期或已失效时返回 None
+        """
+        key = (group_id, str(user_id))
+        entry = self._roles.get(key, count=count)
+        if entry is None:
+            return None
+        if entry[0] != self._group_epoch(group_id):
+            self._roles.pop(key)
+            return None
+        return entry[1]
+
+    def set_role(self, group_id: int, user_id: str, role: str) -> None:
+        """写入成员角色
+        
+        Args:
+            group_id: 群号
+            user_id: 成员QQ号
+            role: 角色
+        """
+        self._roles.set((group_id, str(user_id)), (self._group_epoch(group_id), role))
+
+    def update_from_member_list(self, group_id: int, members: list[dict[str, Any]]) -> None:
+        """用完整的群成员列表写入该群所有成员的角色
+        
+        Args:
+            group_id: 群号
+            members: get_group_member_list 返回的成员列表
+        """
+        for member in members:
+            user_id = member.get("user_id")
+            if user_id:
+                self.set_role(group_id, str(user_id), member.get("role", "member"))
+
+    def invalidate(self, group_id: int, user_id: Optional[str] = None) -> None:
+        """使成员角色缓存失效
+        
+        Args:
+            group_id: 群号
+            user_id: 成员QQ号，为 None 时使整个群的缓存失效
+        """
+        self._bump_version(group_id)
+        if user_id is not None:
+            self._roles.pop((group_id, str(user_id)))
+            return
+        self._epoch_counter += 1
+        self._group_epochs[group_id] = self._epoch_counter
+
+    def handle_notice(
+        self,
+        notice_type: str,
+        sub_type: Optional[str],
+        group_id: int,
+        user_id: str,
+        self_id: Optional[str] = None
+    ) -> bool:
+        """根据 OneBot 群通知事件更新缓存
+        
+        Args:
+            notice_type: 通知类型（group_admin / group_decrease / group_increase）
+            sub_type: 通知子类型
+            group_id: 群号
+            user_id: 事件涉及的成员QQ号
+            self_id: bot 的QQ号，用于识别 bot 自身入群/退群
+        
+        Returns:
+            是否更新了缓存
+        """
+        user_id = str(user_id)
+        if notice_type in ("group_admin", "group_decrease", "group_increase"):
+            self._bump_version(group_id)
+        if notice_type == "group_admin":
+            # 群主转让在 OneBot v11 中没有标准事件，通常伴随管理员变动上报，因此使整群缓存失效，
+            # 再写入本次变动的成员角色
+            self.invalidate(group_id)
+            self.set_role(group_id, user_id, "admin" if sub_type == "set" else "member")
+            return True
+        if notice_type in ("group_decrease", "group_increase"):
+            if user_id == self_id or sub_type == "kick_me":
+                # bot 自身入群/退群，整群失效
+                self.invalidate(group_id)
+            elif notice_type == "group_increase":
+                self.set_role(group_id, user_id, "member")
+            else:
+                self.invalidate(group_id, user_id)
+            return True
+        return False
+
+    def clear(self) -> None:
+        """清除所有缓存"""
+        self._roles.clear()
+        self._group_epochs.clear()
+        self._group_versions.clear()
+        self._clear_count += 1
+
+    def purge_expired(self) -> int:
+        """清理过期的角色缓存
+        
+        Returns:
+            清理的条目数
+        """
+        return self._roles.purge_expired()
+
+    def stats(self) -> dict[str, Any]:
+        """获取角色缓存的统计信息
+        
+        Returns:
+            LRUCache.stats() 格式的统计信息
+        """
+        return self._roles.stats()
+
+
+class BotInfoCache:
+    """bot 身份缓存
+    
+    bot 的 QQ 号按适配器连接缓存：优先读取连接对象上的 self_id，不发起请求；
+    检测到连接对象变化（重连或重新登录）时刷新身份并清空成员角色缓存与成员名单缓存
+    （断线期间的群通知无法收到，增量更新会遗漏）。
+    bot 在各群内的角色与普通成员一样存放在成员角色缓存中。
+    """
+
+    def __init__(self, member_roles: MemberRoleCache, rosters: Optional["GroupRosterCache"] = None):
+        """初始化缓存
+        
+        Args:
+            member_roles: 成员角色缓存
+            rosters: 成员名单缓存，重连时一并清空
+        """
+        self._self_id: Optional[str] = None
+        self._connection: Any = None  # 当前缓存所属的 bot 连接对象
+        self.member_roles = member_roles
+        self.rosters = rosters
+
+    @property
+    def self_id(self) -> Optional[str]:
+        """已缓存的 bot QQ 号，尚未获取时为 None"""
+        return self._self_id
+
+    async def get_self_id(self, bot: Any) -> str:
+        """获取 bot 的 QQ 号
+        
+        Args:
+            bot: OneBot 实例
+        
+        Returns:
+            bot 的 QQ 号
+        """
+        self._check_connection(bot)
+        if self._self_id is None:
+            self_id = getattr(bot, "self_id", None)
+            if self_id:
+                self._self_id = str(self_id)
+            else:
+                bot_info = await fetch_login_info(bot)
+                self._self_id = str(bot_info.get("user_id", ""))
+            core.logger.debug(f"[群管缓存] bot 身份已缓存: {self._self_id}")
+        return self._self_id
+
+    def _check_connection(self, bot: Any) -> None:
+        """检测 bot 连接对象是否变化，变化时使身份与成员角色缓存失效
+        
+        Args:
+            bot: OneBot 实例
+        """
+        if bot is self._connection:
+            return
+        if self._connection is not None:
+            core.logger.info("[群管缓存] 检测到 bot 重新连接，已刷新 bot 身份与成员角色缓存")
+            self.member_roles.clear()
+            if self.rosters is not None:
+                self.rosters.clear()
+        self._connection = bot
+        self._self_id = None
+
+    async def get_group_role(self, bot: Any, group_id: int) -> str:
+        """获取 bot 在群内的角色
+        
+        Args:
+            bot: OneBot 实例
+            group_id: 群号
+        
+        Returns:
+            角色: owner / admin / member
+        """
+        bot_qq = await self.get_self_id(bot)
+        return await self.member_roles.get_role(bot, group_id, bot_qq)
+
+    def clear(self) -> None:
+        """清除 bot 身份、成员角色缓存与成员名单缓存"""
+        self._self_id = None
+        self._connection = None
+        self.member_roles.clear()
+        if self.rosters is not None:
+            self.rosters.clear()
+        core.logger.debug("[群管缓存] 已清除 bot 身份与成员角色缓存")
+
+
+def compact_member(member: dict[str, Any]) -> dict[str, Any]:
+    """只保留成员列表中用到的字段，减少常驻内存
+    
+    Args:
+        member: OneBot 返回的群成员信息
+    
+    Returns:
+        精简后的成员信息: user_id（字符串）、nickname、card、role、join_time、last_sent_time（时间戳，未知为 0）
+    """
+    return {
+        "user_id": str(member.get("user_id", "")),
+        "nickname": member.get("nickname", "") or "",
+        "card": member.get("card", "") or "",
+        "role": member.get("role", "member") or "member",
+        "join_time": int(member.get("join_time", 0) or 0),
+        "last_sent_time": int(member.get("last_sent_time", 0) or 0),
+    }
+
+
+_ROLE_ORDER = {"owner": 0, "admin": 1, "member": 2}
+
+# 成员名单支持的排序方式 -> 排序键（升序）。排序键均为 (整数, QQ号长度, QQ号)，QQ号保证顺序唯一
+MEMBER_SORT_KEYS: dict[str, Callable[[dict[str, Any]], tuple[int, int, str]]] = {
+    # 群主、管理员在前
+    "role": lambda m: (_ROLE_ORDER.get(m["role"], 2), len(m["user_id"]), m["user_id"]),
+    # 最近入群的在前
+    "join_time": lambda m: (-m["join_time"], len(m["user_id"]), m["user_id"]),
+    # 最近发言的在前
+    "last_speak": lambda m: (-m["last_sent_time"], len(m["user_id"]), m["user_id"]),
+}
+
+# 每个群缓存的最近搜索结果数，同一关键词翻页时复用已排序的结果
+ROSTER_SEARCH_CACHE_SIZE = 8
+
+
+class GroupRoster:
+    """单个群的成员名单
+    
+    成员的增删改应通过 put() / remove() 进行，以同步更新搜索索引。
+    """
+    
+    __slots__ = ("members", "loaded_at", "_index", "_sorted", "_searches")
+
+    def __init__(self, members: dict[str, dict[str, Any]], loaded_at: float):
+        self.members = members  # QQ号 -> 精简后的成员信息
+        self.loaded_at = loaded_at  # 完整加载的时间（time.monotonic）
+        self._index: Optional[MemberSearchIndex] = None  # 首次搜索时建立
+        self._sorted: dict[str, tuple[list, list]] = {}  # 排序方式 -> (排序键列表, 成员列表)，名单变化时清空
+        # 规范化关键词 -> 按匹配程度排序的搜索结果，名单变化时清空
+        self._searches: OrderedDict[str, list[tuple[int, dict[str, Any]]]] = OrderedDict()
+
+    def put(self, member: dict[str, Any]) -> None:
+        """添加或替换成员
+        
+        Args:
+            member: 精简后的成员信息
+        """
+        self.members[member["user_id"]] = member
+        self._sorted.clear()
+        self._searches.clear()
+        if self._index is not None:
+            self._index.add(member)
+
+    def remove(self, user_id: str) -> None:
+        """移除成员
+        
+        Args:
+            user_id: 成员QQ号
+        """
+        self.members.pop(user_id, None)
+        self._sorted.clear()
+        self._searches.clear()
+        if self._index is not None:
+            self._index.remove(user_id)
+
+    def search_index(self) -> MemberSearchIndex:
+        """获取成员搜索索引，首次调用时根据名单建立
+        
+        Returns:
+            成员搜索索引
+        """
+        if self._index is None:
+            self._index = MemberSearchIndex(self.members.values())
+        return self._index
+
+    def search(self, keyword: str) -> list[tuple[int, dict[str, Any]]]:
+        """按群名片、昵称或QQ号搜索成员
+        
+        最近的 ROSTER_SEARCH_CACHE_SIZE 个关键词的结果在名单变化前复用，
+        同一关键词翻页时直接按序号切片，不重新校验和排序全部匹配成员。
+        
+        Args:
+            keyword: 搜索关键词，忽略大小写与全角/半角差异
+        
+        Returns:
+            (匹配程度, 成员信息) 列表（共享对象，不应修改），排序见 MemberSearchIndex.search()
+        """
+        query = normalize_search_text(keyword)
+        matches = self._searches.get(query)
+        if matches is not None:
+            self._searches.move_to_end(query)
+            return matches
+        
+        matches = self._searches[query] = self.search_index().search(keyword)
+        if len(self._searches) > ROSTER_SEARCH_CACHE_SIZE:
+            self._searches.popitem(last=False)
+        return matches
+
+    def iter_sorted(self, sort: str, after: Optional[tuple] = None) -> Iterator[dict[str, Any]]:
+        """按指定方式排序后逐个产出成员
+        
+        排序结果在名单变化前复用，翻页时只需二分定位起点，不重新排序整个名单。
+        
+        Args:
+            sort: 排序方式，MEMBER_SORT_KEYS 中的键
+            after: 排序键，只产出排在其后的成员（用于翻页）
+        
+        Returns:
+            成员信息迭代器
+        """
+        view = self._sorted.get(sort)
+        if view is None:
+            sort_key = MEMBER_SORT_KEYS[sort]
+            members = sorted(self.members.values(), key=sort_key)
+            view = self._sorted[sort] = ([sort_key(member) for member in members], members)
+        keys, members = view
+        start = bisect.bisect_right(keys, after) if after is not None else 0
+        for i in range(start, len(members)):
+            yield members[i]
+
+
+class GroupRosterCache:
+    """群成员名单缓存
+    
+    每个群首次使用时完整获取一次成员列表，之后由入群、退群、群名片变更、管理员变动通知增量更新。
+    名单超过 refresh_after 秒后继续返回缓存内容，同时在后台重新获取；超过 max_age 秒则同步重新获取。
+    加载名单时同时写入成员角色缓存，使角色查询也无需请求 OneBot。
+    另外维护 QQ号 -> 所在群 的跨群索引，覆盖所有已缓存名单的群；名单被 LRU 淘汰或过期移除时，
+    其成员随之从索引中移除，索引大小受名单容量限制。
+    """
+
+    def __init__(
+        self,
+        member_roles: MemberRoleCache,
+        max_groups: int = 256,
+        refresh_after: float = 300,
+        max_age: float = 1800
+    ):
+        """初始化缓存
+        
+        Args:
+            member_roles: 成员角色缓存
+            max_groups: 最多缓存多少个群的成员名单
+            refresh_after: 名单超过此时间（秒）后在后台刷新
+            max_age: 名单超过此时间（秒）后不再使用，同步重新获取
+        """
+        self.member_roles = member_roles
+        self.refresh_after = refresh_after
+        self.max_age = max_age
+        # 名单写入时间即加载时间，以 max_age 作为过期时间
+        self._rosters: LRUCache[int, GroupRoster] = LRUCache(max_groups, ttl=max_age, on_evict=self._unindex_roster)
+        self._background_tasks: dict[Any, asyncio.Task] = {}
+        # 跨群索引: QQ号 -> 所在群号集合
+        self._user_groups: dict[str, set[int]] = {}
+        self.loads = 0  # 完整获取成员列表的次数
+        self.incremental_updates = 0  # 由通知事件增量更新的次数
+
+    async def get_members(self, bot: Any, group_id: int) -> list[dict[str, Any]]:
+        """获取群成员列表
+        
+        Args:
+            bot: OneBot 实例
+            group_id: 群号
+        
+        Returns:
+            精简后的成员信息列表（共享对象，不应修改）
+        """
+        roster = await self.get_roster(bot, group_id)
+        return list(roster.members.values())
+
+    async def search_members(self, bot: Any, group_id: int, keyword: str) -> list[tuple[int, dict[str, Any]]]:
+        """按群名片、昵称或QQ号搜索群成员
+        
+        Args:
+            bot: OneBot 实例
+            group_id: 群号
+            keyword: 搜索关键词，忽略大小写与全角/半角差异
+        
+        Returns:
+            (匹配程度, 成员信息) 列表，按匹配程度排序，见 MemberSearchIndex.search()
+        """
+        roster = await self.get_roster(bot, group_id)
+        return roster.search(keyword)
+
+    async def get_roster(self, bot: Any, group_id: int) -> GroupRoster:
+        """获取群的成员名单，按名单时间决定直接使用、后台刷新或同步重新获取
+        
+        Args:
+            bot: OneBot 实例
+            group_id: 群号
+        
+        Returns:
+            成员名单（共享对象，只读）
+        """
+        # 超过 max_age 的名单在读取时已过期移除
+        roster = self._rosters.get(group_id)
+        if roster is None:
+            roster = await self._load(bot, group_id)
+        elif time.monotonic() - roster.loaded_at >= self.refresh_after:
+            self._spawn(("load", group_id), self._load(bot, group_id))
+        return roster
+
+    def peek_member(self, group_id: int, user_id: str) -> Optional[dict[str, Any]]:
+        """读取已缓存名单中的成员信息（不发起请求、不计入统计）
+        
+        Args:
+            group_id: 群号
+            user_id: 成员QQ号
+        
+        Returns:
+            成员信息，名单未缓存、已超过 max_age 或成员不在名单中时返回 None
+        """
+        roster = self._rosters.peek(group_id)
+        if roster is None:
+            return None
+        return roster.members.get(str(user_id))
+
+    def find_user_groups(self, user_id: str) -> dict[int, dict[str, Any]]:
+        """查找成员所在的群（只查已缓存且未过期名单的群，不发起请求，也不改变名单的 LRU 顺序）
+        
+        Args:
+            user_id: 成员QQ号
+        
+        Returns:
+            群号 -> 该成员在群内的成员信息
+        """
+        # 先移除过期名单（同时清理其索引），名单数受容量限制，开销很小
+        self._rosters.purge_expired()
+        user_id = str(user_id)
+        group_ids = self._user_groups.get(user_id)
+        if not group_ids:
+            return {}
+        result = {}
+        for group_id in list(group_ids):
+            roster = self._rosters.peek(group_id)
+            member = roster.members.get(user_id) if roster is not None else None
+            if member is None:
+                group_ids.discard(group_id)
+            else:
+                result[group_id] = member
+        if not group_ids:
+            del self._user_groups[user_id]
+        return result
+
+    def _index_user(self, group_id: int, user_id: str) -> None:
+        """将成员所在群写入跨群索引"""
+        self._user_groups.setdefault(user_id, set()).add(group_id)
+
+    def _unindex_user(self, group_id: int, user_id: str) -> None:
+        """从跨群索引中移除成员所在群"""
+        group_ids = self._user_groups.get(user_id)
+        if group_ids is not None:
+            group_ids.discard(group_id)
+            if not group_ids:
+                del self._user_groups[user_id]
+
+    def _unindex_roster(self, group_id: int, roster: GroupRoster) -> None:
+        """从跨群索引中移除名单内的所有成员（也作为名单淘汰、过期时的回调）"""
+        for user_id in roster.members:
+            self._unindex_user(group_id, user_id)
+
+    def _drop_roster(self, group_id: int) -> None:
+        """丢弃群的名单，并从跨群索引中移除"""
+        roster = self._rosters.pop(group_id)
+        if roster is not None:
+            self._unindex_roster(group_id, roster)
+
+    async def _load(self, bot: Any, group_id: int) -> GroupRoster:
+        """完整获取群成员列表并写入缓存"""
+        members = await fetch_group_member_list(bot, group_id)
+        roster = GroupRoster(
+            {member["user_id"]: member for member in map(compact_member, members) if member["user_id"]},
+            time.monotonic(),
+        )
+        # 取出旧名单（即使已过期）与新名单比较，只移除已不在群内的成员的索引
+        previous = self._rosters.pop(group_id)
+        if previous is not None:
+            for user_id in previous.members.keys() - roster.members.keys():
+                self._unindex_user(group_id, user_id)
+        self._rosters.set(group_id, roster)
+        # 容量为 0 时名单不会被缓存，也不写入索引
+        if self._rosters.peek(group_id) is roster:
+            for user_id in roster.members:
+                self._index_user(group_id, user_id)
+        self.member_roles.update_from_member_list(group_id, members)
+        self.loads += 1
+        core.logger.debug(f"[群管缓存] 已加载群{group_id}的成员名单，共 {len(roster.members)} 人")
+        return roster
+
+    async def _fill_member(self, bot: Any, group_id: int, user_id: str) -> None:
+        """获取新入群成员的完整信息（昵称等）并写入名单"""
+        member_info = await fetch_group_member_info(bot, group_id, user_id)
+        roster = self._rosters.get(group_id, count=False)
+        if roster is not None and user_id in roster.members:
+            roster.put(compact_member(member_info))
+
+    def _spawn(self, key: Any, coro: Any) -> None:
+        """启动后台任务，相同键的任务进行中时不重复启动"""
+        task = self._background_tasks.get(key)
+        if task is not None and not task.done():
+            coro.close()
+            return
+        task = asyncio.ensure_future(coro)
+        self._background_tasks[key] = task
+
+        def on_done(finished: asyncio.Task) -> None:
+            if self._background_tasks.get(key) is finished:
+                del self._background_tasks[key]
+            if not finished.cancelled() and finished.exception() is not None:
+                core.logger.warning(f"[群管缓存] 后台更新成员名单失败: {finished.exception()}")
+        
+        task.add_done_callback(on_done)
+
+    def handle_notice(
+        self,
+        notice_type: str,
+        sub_type: Optional[str],
+        group_id: int,
+        user_id: str,
+        self_id: Optional[str] = None,
+        card_new: Optional[str] = None,
+        bot: Any = None
+    ) -> bool:
+        """根据 OneBot 群通知事件增量更新已缓存的名单
+        
+        Args:
+            notice_type: 通知类型（group_increase / group_decrease / group_card / group_admin）
+            sub_type: 通知子类型
+            group_id: 群号
+            user_id: 事件涉及的成员QQ号
+            self_id: bot 的QQ号，用于识别 bot 自身入群/退群
+            card_new: 新的群名片（group_card 通知）
+            bot: OneBot 实例，提供时在后台补全新成员的昵称
+        
+        Returns:
+            是否更新了缓存
+        """
+        roster = self._rosters.get(group_id, count=False)
+        if roster is None:
+            return False
+        user_id = str(user_id)
+        
+        if notice_type in ("group_increase", "group_decrease") and (user_id == self_id or sub_type == "kick_me"):
+            # bot 自身入群/退群，丢弃整个名单
+            self._drop_roster(group_id)
+            return True
+        if notice_type == "group_increase":
+            roster.put(compact_member({"user_id": user_id, "join_time": int(time.time())}))
+            self._index_user(group_id, user_id)
+            if bot is not None:
+                self._spawn(("member", group_id, user_id), self._fill_member(bot, group_id, user_id))
+        elif notice_type == "group_decrease":
+            roster.remove(user_id)
+            self._unindex_user(group_id, user_id)
+        elif notice_type == "group_card" and user_id in roster.members:
+            roster.put({**roster.members[user_id], "card": card_new or ""})
+        elif notice_type == "group_admin" and user_id in roster.members:
+            roster.put({**roster.members[user_id], "role": "admin" if sub_type == "set" else "member"})
+        else:
+            return False
+        self.incremental_updates += 1
+        return True
+
+    def invalidate(self, group_id: int) -> None:
+        """丢弃指定群的名单，下次使用时重新获取
+        
+        Args:
+            group_id: 群号
+        """
+        self._drop_roster(group_id)
+
+    def clear(self) -> None:
+        """清除所有名单并取消进行中的后台任务"""
+        for task in self._background_tasks.values():
+            task.cancel()
+        self._background_tasks.clear()
+        self._rosters.clear()
+        self._user_groups.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """获取名单缓存的统计信息
+        
+        Returns:
+            LRUCache.stats() 格式的统计信息，另含完整加载次数（loads）、增量更新次数（incremental_updates）
+            与跨群索引中的用户数（indexed_users）
+        """
+        stats = self._rosters.stats()
+        stats["loads"] = self.loads
+        stats["incremental_updates"] = self.incremental_updates
+        stats["indexed_users"] = len(self._user_groups)
+        return stats
@@ -31,9 +31,15 @@
 此插件由 AI 根据用户请求或自主判断调用，用户可以通过对话请求 AI 执行管理操作。
 """
 
+import asyncio
+import time
 from enum import IntEnum
-from typing import Any, Literal, Optional, List
+from itertools import islice
+from typing import Any, Awaitable, Callable, Literal, Optional, List, get_args, get_origin
 
+from nonebot import on_notice
+from nonebot.adapters.onebot.v11 import NoticeEvent
+from nonebot.matcher import Matcher
 from pydantic import Field
 
 from nekro_agent.adapters.onebot_v11.core.bot import get_bot
@@ -44,7 +50,13 @@ from nekro_agent.api.schemas import AgentCtx
 from nekro_agent.core.config import config
 from nekro_agent.schemas.chat_message import ChatType
 
-from .config_manager import GroupConfigManager
+from .cache import LRUCache
+from .config_manager import (
+    PROFILE_REF_KEY, ConfigConflictError, EffectiveConfig, GroupConfigManager, freeze_value, normalize_id, to_id_set
+)
+from .config_storage import JournalConfigStorage, open_sqlite_storage
+from .member_search import MATCH_EXACT, MATCH_PREFIX
+from .onebot_cache import MEMBER_SORT_KEYS, BotInfoCache, GroupRosterCache, MemberRoleCache, onebot_flight
 
 
 # ============== 插件实例 ==============
@@ -103,6 +115,18 @@ class GroupAdminConfig(ConfigBase):
         description="启用后，管理操作将发送报告给管理频道",
     )
     
+    CONFIG_STORAGE: Literal["json", "sqlite", "journal"] = Field(
+        default="json",
+        title="分群配置存储方式",
+        description="json: 保存在 data/group_configs.json; sqlite: 保存在 data/group_configs.db，适合管理大量群组，首次启用时自动从 JSON 文件迁移; journal: 以 group_configs.json 为快照，每次修改只追加一行变更日志并记录修改人，定期压缩。修改后需重载插件生效",
+    )
+    
+    CONFIG_CACHE_SIZE: int = Field(
+        default=4096,
+        title="有效配置缓存容量",
+        description="最多缓存多少个群的有效配置，超出时淘汰最久未使用的群，缓存条目1小时后过期。修改后需重载插件生效",
+    )
+    
     # ===== AI敏感功能开关 =====
     
     ENABLE_MUTE: bool = Field(
@@ -187,47 +211,146 @@ def get_admin_config() -> GroupAdminConfig:
     """
     return plugin.get_config(GroupAdminConfig)
 
-# 初始化分群配置管理器
-group_config_manager = GroupConfigManager("data/group_configs.json")
+# 分群配置文件路径
+GROUP_CONFIG_JSON_PATH = "data/group_configs.json"
+GROUP_CONFIG_SQLITE_PATH = "data/group_configs.db"
+
+# 初始化分群配置管理器（默认使用 JSON 文件存储，插件初始化时按配置切换存储后端）
+group_config_manager = GroupConfigManager(GROUP_CONFIG_JSON_PATH)
+
+# 群成员角色缓存（由群通知事件保持最新）与 bot 身份缓存
+member_role_cache = MemberRoleCache()
+roster_cache = GroupRosterCache(member_role_cache)
+bot_info_cache = BotInfoCache(member_role_cache, roster_cache)
+
+# 监听群通知事件的 matcher，插件初始化时创建、清理时销毁
+role_notice_matcher: Optional[type[Matcher]] = None
+
+# 启动预热状态，预热未完成时工具调用照常工作（缓存未命中时直接请求 OneBot），不会等待预热
+cache_warmup_state: dict[str, Any] = {"ready": False, "warmed": 0, "total": 0, "task": None}
 
 
 # ============== 配置获取函数 ==============
 
-async def get_effective_config(group_id: int) -> dict[str, Any]:
-    """获取群的有效配置（分群配置优先）
+# 参与分群配置合并的全局配置项
+GLOBAL_CONFIG_KEYS = (
+    "PERMISSION_MODE",
+    "SUPER_ADMINS",
+    "PROTECTED_USERS",
+    "MAX_MUTE_DURATION",
+    "ENABLE_ADMIN_REPORT",
+    "ENABLE_MUTE",
+    "ENABLE_MUTE_ALL",
+    "ENABLE_KICK",
+    "ENABLE_KICK_AND_BAN",
+    "ENABLE_SET_CARD",
+    "ENABLE_SET_TITLE",
+    "ENABLE_SET_ADMIN",
+    "ENABLE_DELETE_MSG",
+    "ENABLE_SET_ESSENCE",
+    "ENABLE_SET_GROUP_NAME",
+    "ENABLE_SET_GROUP_PORTRAIT",
+    "ENABLE_SEND_NOTICE",
+)
+
+# 各配置项的取值类型，与插件配置类的字段声明一致
+CONFIG_VALUE_TYPES: dict[str, Any] = {key: GroupAdminConfig.__annotations__[key] for key in GLOBAL_CONFIG_KEYS}
+
+
+def _is_valid_config_value(expected_type: Any, value: Any) -> bool:
+    """检查配置值是否符合字段声明的类型"""
+    origin = get_origin(expected_type)
+    if origin is Literal:
+        return value in get_args(expected_type)
+    if origin is list:
+        # QQ号列表允许字符串或整数，使用时统一规范化
+        return isinstance(value, list) and all(
+            isinstance(item, (str, int)) and not isinstance(item, bool) for item in value
+        )
+    if expected_type is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, expected_type)
+
+
+def validate_config_values(config_dict: dict[str, Any]) -> Optional[str]:
+    """按插件配置的字段类型校验分群配置或配置模板
     
     Args:
-        group_id: 群号
-        
+        config_dict: 待写入的配置项
+    
     Returns:
-        合并后的配置字典
+        Optional[str]: 错误信息，全部合法时返回 None
+    """
+    unknown_keys = [key for key in config_dict if key not in CONFIG_VALUE_TYPES]
+    if unknown_keys:
+        return f"未知的配置项: {', '.join(unknown_keys)}"
+    
+    invalid = [
+        f"{key}={value!r}" for key, value in config_dict.items()
+        if not _is_valid_config_value(CONFIG_VALUE_TYPES[key], value)
+    ]
+    if invalid:
+        return f"配置值类型不正确: {', '.join(invalid)}（开关为 true/false，时长为整数秒，QQ号列表为列表）"
+    
+    if config_dict.get("MAX_MUTE_DURATION", 0) < 0:
+        return "MAX_MUTE_DURATION 不能为负数"
+    return None
+
+
+# 上次同步到配置管理器的全局配置值（列表转为元组的副本），用于快速判断全局配置是否变化
+_synced_global_values: tuple = ()
+
+
+def sync_global_config() -> None:
+    """将最新的全局配置同步到分群配置管理器
+    
+    按值比较配置的不可变副本，列表被原地修改也能发现；值未变化时直接返回，变化时交由配置管理器更新快照。
     """
-    # 每次都重新获取最新的全局配置
+    global _synced_global_values
+    
     admin_config = get_admin_config()
+    values = tuple(freeze_value(getattr(admin_config, key)) for key in GLOBAL_CONFIG_KEYS)
+    if values == _synced_global_values:
+        return
     
-    # 将全局配置转换为字典
-    global_config_dict = {
-        "PERMISSION_MODE": admin_config.PERMISSION_MODE,
-        "SUPER_ADMINS": admin_config.SUPER_ADMINS,
-        "PROTECTED_USERS": admin_config.PROTECTED_USERS,
-        "MAX_MUTE_DURATION": admin_config.MAX_MUTE_DURATION,
-        "ENABLE_ADMIN_REPORT": admin_config.ENABLE_ADMIN_REPORT,
-        "ENABLE_MUTE": admin_config.ENABLE_MUTE,
-        "ENABLE_MUTE_ALL": admin_config.ENABLE_MUTE_ALL,
-        "ENABLE_KICK": admin_config.ENABLE_KICK,
-        "ENABLE_KICK_AND_BAN": admin_config.ENABLE_KICK_AND_BAN,
-        "ENABLE_SET_CARD": admin_config.ENABLE_SET_CARD,
-        "ENABLE_SET_TITLE": admin_config.ENABLE_SET_TITLE,
-        "ENABLE_SET_ADMIN": admin_config.ENABLE_SET_ADMIN,
-        "ENABLE_DELETE_MSG": admin_config.ENABLE_DELETE_MSG,
-        "ENABLE_SET_ESSENCE": admin_config.ENABLE_SET_ESSENCE,
-        "ENABLE_SET_GROUP_NAME": admin_config.ENABLE_SET_GROUP_NAME,
-        "ENABLE_SET_GROUP_PORTRAIT": admin_config.ENABLE_SET_GROUP_PORTRAIT,
-        "ENABLE_SEND_NOTICE": admin_config.ENABLE_SEND_NOTICE,
-    }
+    _synced_global_values = values
+    group_config_manager.update_global_config(dict(zip(GLOBAL_CONFIG_KEYS, values)))
+
+
+def get_super_admins() -> frozenset[str]:
+    """获取全局超级管理员的规范化QQ号集合（按全局配置代数缓存）"""
+    sync_global_config()
+    return group_config_manager.get_global_snapshot().id_set("SUPER_ADMINS")
+
+
+# 已编译的允许群列表: (ALLOW_GROUPS 配置值的元组副本, 规范化群号集合)
+_compiled_allow_groups: tuple[Optional[tuple], frozenset[str]] = (None, frozenset())
+
+
+def get_allow_groups() -> frozenset[str]:
+    """获取允许使用群管功能的规范化群号集合（配置值变化时才重新编译，原地修改列表同样生效），为空表示不限制"""
+    global _compiled_allow_groups
+    
+    allow_groups = tuple(get_admin_config().ALLOW_GROUPS or ())
+    if _compiled_allow_groups[0] != allow_groups:
+        _compiled_allow_groups = (allow_groups, to_id_set(allow_groups))
+    return _compiled_allow_groups[1]
+
+
+async def get_effective_config(group_id: int) -> EffectiveConfig:
+    """获取群的有效配置（分群配置优先）
     
-    # 获取合并后的配置
-    return await group_config_manager.get_group_config(group_id, global_config_dict)
+    Args:
+        group_id: 群号
+        
+    Returns:
+        合并后的只读配置快照
+    """
+    # 每次都同步最新的全局配置，未变化时不产生任何合并开销
+    sync_global_config()
+    # 配置文件被外部修改时等待后台线程重新加载完成，间隔内不产生任何 I/O
+    await group_config_manager.refresh()
+    return group_config_manager.get_effective_snapshot(group_id)
 
 
 # ============== 权限等级枚举 ==============
@@ -251,23 +374,17 @@ async def get_bot_permission_level(group_id: int) -> PermissionLevel:
     Returns:
         PermissionLevel: bot的权限等级
     """
-    admin_config = get_admin_config()
     try:
-        # 获取bot的QQ号
-        bot_info = await get_bot().get_login_info()
-        bot_qq = str(bot_info.get("user_id", ""))
+        bot = get_bot()
+        # 获取bot的QQ号（已缓存）
+        bot_qq = await bot_info_cache.get_self_id(bot)
         
         # 检查是否是超级管理员
-        if bot_qq in admin_config.SUPER_ADMINS:
+        if bot_qq in get_super_admins():
             return PermissionLevel.SUPER_ADMIN
         
-        # 获取bot在群内的成员信息
-        member_info = await get_bot().get_group_member_info(
-            group_id=group_id,
-            user_id=int(bot_qq),
-            no_cache=True
-        )
-        role = member_info.get("role", "member")
+        # 获取bot在群内的角色（已缓存）
+        role = await bot_info_cache.get_group_role(bot, group_id)
         
         if role == "owner":
             return PermissionLevel.OWNER
@@ -290,19 +407,13 @@ async def get_user_permission_level(group_id: int, user_qq: str) -> PermissionLe
     Returns:
         PermissionLevel: 权限等级
     """
-    admin_config = get_admin_config()
     # 检查是否是超级管理员
-    if user_qq in admin_config.SUPER_ADMINS:
+    if normalize_id(user_qq) in get_super_admins():
         return PermissionLevel.SUPER_ADMIN
     
     try:
-        # 获取群成员信息
-        member_info = await get_bot().get_group_member_info(
-            group_id=group_id,
-            user_id=int(user_qq),
-            no_cache=True
-        )
-        role = member_info.get("role", "member")
+        # 获取群成员角色（已缓存）
+        role = await member_role_cache.get_role(get_bot(), group_id, user_qq)
         
         if role == "owner":
             return PermissionLevel.OWNER
@@ -315,16 +426,77 @@ async def get_user_permission_level(group_id: int, user_qq: str) -> PermissionLe
         return PermissionLevel.MEMBER
 
 
+class PermissionDecision:
+    """权限检查结果
+    
+    除是否允许和提示信息外，还携带检查过程中获取到的各方权限等级，调用方无需再次请求。
+    未获取的等级为 None（例如 AI 自主模式下不获取请求者权限）。
+    """
+
+    __slots__ = ("allowed", "message", "bot_level", "requester_level", "target_level", "target_role")
+
+    def __init__(
+        self,
+        allowed: bool,
+        message: str,
+        bot_level: Optional[PermissionLevel] = None,
+        requester_level: Optional[PermissionLevel] = None,
+        target_level: Optional[PermissionLevel] = None,
+        target_role: Optional[str] = None
+    ):
+        self.allowed = allowed
+        self.message = message
+        self.bot_level = bot_level
+        self.requester_level = requester_level
+        self.target_level = target_level
+        self.target_role = target_role
+
+    def __repr__(self) -> str:
+        return f"PermissionDecision(allowed={self.allowed}, message={self.message!r})"
+
+
+# 权限判断结果缓存: (群号, 请求者, 目标, 所需等级, 操作名称, 配置代数, 角色版本) -> PermissionDecision
+# 配置或成员角色变化时键随之变化，旧结果不再命中；过期时间仅作兜底
+permission_decision_cache: LRUCache[tuple, "PermissionDecision"] = LRUCache(4096, ttl=30)
+
+PERMISSION_LEVEL_NAMES = {
+    PermissionLevel.MEMBER: "普通成员",
+    PermissionLevel.ADMIN: "管理员",
+    PermissionLevel.OWNER: "群主",
+    PermissionLevel.SUPER_ADMIN: "超级管理员",
+}
+
+
+async def get_target_role(group_id: int, target_qq: str) -> Optional[str]:
+    """获取目标用户在群内的角色，获取失败时返回 None
+    
+    Args:
+        group_id: 群号
+        target_qq: 目标用户QQ
+        
+    Returns:
+        角色: owner / admin / member，获取失败时为 None
+    """
+    try:
+        return await member_role_cache.get_role(get_bot(), group_id, target_qq)
+    except Exception as e:
+        core.logger.error(f"获取目标用户权限失败: {e}")
+        return None
+
+
 async def check_permission(
     ctx: AgentCtx,
     group_id: int,
     target_qq: str,
     required_level: PermissionLevel = PermissionLevel.ADMIN,
     operation_name: str = "此操作",
-    requester_qq: Optional[str] = None
-) -> tuple[bool, str]:
+    requester_qq: Optional[str] = None,
+    effective_config: Optional[EffectiveConfig] = None
+) -> PermissionDecision:
     """检查权限（使用分群配置）
     
+    bot、目标用户、请求者的权限互不依赖，并发获取。
+    
     Args:
         ctx: 上下文
         group_id: 群号
@@ -332,102 +504,228 @@ async def check_permission(
         required_level: 执行操作需要的最低权限等级
         operation_name: 操作名称（用于错误提示）
         requester_qq: 请求者QQ号（check_requester模式下必须提供）
+        effective_config: 该群的有效配置快照，调用方已获取时传入以免重复获取
         
     Returns:
-        tuple[bool, str]: (是否有权限, 提示信息)
+        PermissionDecision: 权限检查结果
     """
+    # QQ号统一为规范化字符串，与编译后的号码集合比较
+    target_qq = normalize_id(target_qq)
+    requester_qq = normalize_id(requester_qq) if requester_qq is not None else None
+    
     # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
+    if effective_config is None:
+        effective_config = await get_effective_config(group_id)
+    ai_autonomous = effective_config.get("PERMISSION_MODE") == "ai_autonomous"
     
-    # 先检查bot自身的权限
-    bot_level = await get_bot_permission_level(group_id)
+    # 配置与成员角色都未变化时直接复用之前的判断结果
+    cache_key = (
+        group_id, None if ai_autonomous else requester_qq, target_qq, required_level, operation_name,
+        effective_config.generation, member_role_cache.role_version(group_id),
+    )
+    cached_decision = permission_decision_cache.get(cache_key)
+    if cached_decision is not None:
+        return cached_decision
+    
+    # 并发获取bot权限、目标用户角色，以及（check_requester模式下）请求者权限
+    lookups = [get_bot_permission_level(group_id), get_target_role(group_id, target_qq)]
+    if not ai_autonomous and requester_qq:
+        lookups.append(get_user_permission_level(group_id, requester_qq))
+    results = await asyncio.gather(*lookups)
+    bot_level, target_role = results[0], results[1]
+    requester_level = results[2] if len(results) > 2 else None
+    
+    decision, cacheable = decide_target_permission(
+        effective_config, required_level, operation_name,
+        bot_level, requester_qq, requester_level, target_qq, target_role,
+    )
+    if cacheable:
+        permission_decision_cache.set(cache_key, decision)
+    return decision
+
+
+def decide_target_permission(
+    effective_config: EffectiveConfig,
+    required_level: PermissionLevel,
+    operation_name: str,
+    bot_level: PermissionLevel,
+    requester_qq: Optional[str],
+    requester_level: Optional[PermissionLevel],
+    target_qq: str,
+    target_role: Optional[str]
+) -> tuple[PermissionDecision, bool]:
+    """根据已获取的各方权限判断能否对目标用户执行操作（不发起任何请求）
     
-    if bot_level < required_level:
-        level_names = {
-            PermissionLevel.MEMBER: "普通成员",
-            PermissionLevel.ADMIN: "管理员",
-            PermissionLevel.OWNER: "群主",
-            PermissionLevel.SUPER_ADMIN: "超级管理员",
-        }
-        return False, f"bot权限不足：{operation_name}需要{level_names[required_level]}及以上权限，bot当前权限为 {level_names[bot_level]}"
-    
-    # 获取目标用户的权限等级（两种模式都需要）
-    try:
-        target_member_info = await get_bot().get_group_member_info(
-            group_id=group_id,
-            user_id=int(target_qq),
-            no_cache=True
-        )
-        target_role = target_member_info.get("role", "member")
-        
-        # 映射角色到权限等级
-        role_to_level = {
-            "owner": PermissionLevel.OWNER,
-            "admin": PermissionLevel.ADMIN,
-            "member": PermissionLevel.MEMBER
-        }
-        target_level = role_to_level.get(target_role, PermissionLevel.MEMBER)
+    Args:
+        effective_config: 该群的有效配置快照
+        required_level: 执行操作需要的最低权限等级
+        operation_name: 操作名称（用于错误提示）
+        bot_level: bot的权限等级
+        requester_qq: 请求者QQ号（已规范化）
+        requester_level: 请求者权限等级，AI自主模式或未提供请求者时为 None
+        target_qq: 目标用户QQ（已规范化）
+        target_role: 目标用户角色，获取失败时为 None
         
-        # 检查QQ协议的特殊限制
-        if target_role == "owner":
-            return False, f"无法对群主执行{operation_name}（QQ协议限制：不能禁言/踢出群主）"
-    except Exception as e:
-        core.logger.error(f"获取目标用户权限失败: {e}")
-        # 如果获取失败，继续后续检查
-        target_level = PermissionLevel.MEMBER
+    Returns:
+        tuple[PermissionDecision, bool]: (权限检查结果, 结果是否可以缓存)
+    """
+    # 目标用户的权限等级（超级管理员优先，获取角色失败时视为普通成员）
+    role_to_level = {
+        "owner": PermissionLevel.OWNER,
+        "admin": PermissionLevel.ADMIN,
+        "member": PermissionLevel.MEMBER
+    }
+    if target_qq in get_super_admins():
+        target_level = PermissionLevel.SUPER_ADMIN
+    else:
+        target_level = role_to_level.get(target_role, PermissionLevel.MEMBER)
+    
+    def decide(allowed: bool, message: str, cacheable: bool = True) -> tuple[PermissionDecision, bool]:
+        decision = PermissionDecision(allowed, message, bot_level, requester_level, target_level, target_role)
+        # 获取角色失败时的结果不缓存
+        return decision, cacheable and target_role is not None
+    
+    # 先检查bot自身的权限（获取失败时也会表现为权限不足，因此不缓存）
+    if bot_level < required_level:
+        return decide(False, f"bot权限不足：{operation_name}需要{PERMISSION_LEVEL_NAMES[required_level]}及以上权限，bot当前权限为 {PERMISSION_LEVEL_NAMES[bot_level]}", cacheable=False)
+    
+    # 检查QQ协议的特殊限制
+    if target_role == "owner":
+        return decide(False, f"无法对群主执行{operation_name}（QQ协议限制：不能禁言/踢出群主）")
     
     # AI自主模式下不检查请求者权限
     if effective_config.get("PERMISSION_MODE") == "ai_autonomous":
         # 检查目标是否受保护
-        protected_users = effective_config.get("PROTECTED_USERS", [])
-        if target_qq in protected_users:
-            return False, f"用户 {target_qq} 是受保护用户，无法执行{operation_name}"
-        return True, "AI自主模式"
+        if target_qq in effective_config.id_set("PROTECTED_USERS"):
+            return decide(False, f"用户 {target_qq} 是受保护用户，无法执行{operation_name}")
+        return decide(True, "AI自主模式")
     
     # check_requester 模式下必须提供请求者QQ
     if not requester_qq:
-        return False, f"权限检查模式下需要提供请求者QQ（requester_qq参数），请让AI在调用时传入发起请求的用户QQ号"
-    
-    # 获取请求者权限
-    requester_level = await get_user_permission_level(group_id, requester_qq)
+        return decide(False, f"权限检查模式下需要提供请求者QQ（requester_qq参数），请让AI在调用时传入发起请求的用户QQ号")
     
     # 检查请求者是否有足够权限
     if requester_level < required_level:
-        level_names = {
-            PermissionLevel.MEMBER: "普通成员",
-            PermissionLevel.ADMIN: "管理员",
-            PermissionLevel.OWNER: "群主",
-            PermissionLevel.SUPER_ADMIN: "超级管理员",
-        }
-        return False, f"权限不足：{operation_name}需要{level_names[required_level]}及以上权限，用户 {requester_qq} 当前权限为 {level_names[requester_level]}"
+        return decide(False, f"权限不足：{operation_name}需要{PERMISSION_LEVEL_NAMES[required_level]}及以上权限，用户 {requester_qq} 当前权限为 {PERMISSION_LEVEL_NAMES[requester_level]}", cacheable=False)
     
     # 检查目标是否受保护
-    protected_users = effective_config.get("PROTECTED_USERS", [])
-    if target_qq in protected_users and requester_level < PermissionLevel.SUPER_ADMIN:
-        return False, f"用户 {target_qq} 是受保护用户，只有超级管理员才能操作"
-    
-    # 获取目标权限
-    target_level = await get_user_permission_level(group_id, target_qq)
+    if target_qq in effective_config.id_set("PROTECTED_USERS") and requester_level < PermissionLevel.SUPER_ADMIN:
+        return decide(False, f"用户 {target_qq} 是受保护用户，只有超级管理员才能操作")
     
     # 检查是否有权操作目标用户（只能操作权限比自己低的用户）
     if target_level >= requester_level and requester_level < PermissionLevel.SUPER_ADMIN:
-        level_names = {
-            PermissionLevel.MEMBER: "普通成员",
-            PermissionLevel.ADMIN: "管理员",
-            PermissionLevel.OWNER: "群主",
-            PermissionLevel.SUPER_ADMIN: "超级管理员",
-        }
-        return False, f"无法对同级或更高权限的用户执行{operation_name}（目标用户权限: {level_names[target_level]}）"
+        return decide(False, f"无法对同级或更高权限的用户执行{operation_name}（目标用户权限: {PERMISSION_LEVEL_NAMES[target_level]}）")
     
-    return True, "权限检查通过"
+    return decide(True, "权限检查通过")
+
+
+# 批量检查时，未缓存角色的目标超过此数量则改为一次性获取群成员列表
+BULK_MEMBER_LIST_THRESHOLD = 3
+
+
+async def get_target_roles(group_id: int, target_qqs: list[str]) -> dict[str, Optional[str]]:
+    """批量获取目标用户在群内的角色
+    
+    优先使用成员角色缓存；未缓存的目标较多时使用群成员名单缓存（名单加载时同时写入角色缓存），
+    较少时并发逐个获取。
+    
+    Args:
+        group_id: 群号
+        target_qqs: 目标用户QQ列表（已规范化）
+        
+    Returns:
+        dict[str, Optional[str]]: QQ号 -> 角色，获取失败或不在群内时为 None
+    """
+    roles = {qq: member_role_cache.peek_role(group_id, qq) for qq in target_qqs}
+    missing = [qq for qq, role in roles.items() if role is None]
+    if not missing:
+        return roles
+    
+    if len(missing) > BULK_MEMBER_LIST_THRESHOLD:
+        try:
+            await roster_cache.get_members(get_bot(), group_id)
+            for qq in missing:
+                member = roster_cache.peek_member(group_id, qq)
+                roles[qq] = member["role"] if member is not None else None
+            return roles
+        except Exception as e:
+            core.logger.error(f"获取群成员列表失败，改为逐个获取目标用户权限: {e}")
+    
+    fetched = await asyncio.gather(*(get_target_role(group_id, qq) for qq in missing))
+    roles.update(zip(missing, fetched))
+    return roles
+
+
+async def check_permissions_bulk(
+    group_id: int,
+    requester_qq: Optional[str],
+    target_qqs: list[str],
+    required_level: PermissionLevel = PermissionLevel.ADMIN,
+    operation_name: str = "此操作",
+    effective_config: Optional[EffectiveConfig] = None
+) -> dict[str, PermissionDecision]:
+    """批量检查对多个目标用户的操作权限
+    
+    有效配置、bot权限和请求者权限只获取一次；目标用户角色优先取自缓存，
+    否则一次性从群成员列表中解析。判断规则与 check_permission 完全相同。
+    
+    Args:
+        group_id: 群号
+        requester_qq: 请求者QQ号（check_requester模式下必须提供）
+        target_qqs: 目标用户QQ列表
+        required_level: 执行操作需要的最低权限等级
+        operation_name: 操作名称（用于错误提示）
+        effective_config: 该群的有效配置快照，调用方已获取时传入以免重复获取
+        
+    Returns:
+        dict[str, PermissionDecision]: 规范化QQ号 -> 权限检查结果（按传入顺序，重复的QQ号只检查一次）
+    """
+    targets = list(dict.fromkeys(normalize_id(qq) for qq in target_qqs))
+    requester_qq = normalize_id(requester_qq) if requester_qq is not None else None
+    
+    if effective_config is None:
+        effective_config = await get_effective_config(group_id)
+    ai_autonomous = effective_config.get("PERMISSION_MODE") == "ai_autonomous"
+    
+    # 先查判断结果缓存
+    key_prefix = (group_id, None if ai_autonomous else requester_qq)
+    key_suffix = (
+        required_level, operation_name,
+        effective_config.generation, member_role_cache.role_version(group_id),
+    )
+    decisions: dict[str, Optional[PermissionDecision]] = {
+        qq: permission_decision_cache.get(key_prefix + (qq,) + key_suffix) for qq in targets
+    }
+    pending = [qq for qq, decision in decisions.items() if decision is None]
+    if not pending:
+        return decisions
+    
+    # bot权限、请求者权限与所有目标角色并发获取，各只获取一次
+    lookups = [get_bot_permission_level(group_id), get_target_roles(group_id, pending)]
+    if not ai_autonomous and requester_qq:
+        lookups.append(get_user_permission_level(group_id, requester_qq))
+    results = await asyncio.gather(*lookups)
+    bot_level, target_roles = results[0], results[1]
+    requester_level = results[2] if len(results) > 2 else None
+    
+    for qq in pending:
+        decision, cacheable = decide_target_permission(
+            effective_config, required_level, operation_name,
+            bot_level, requester_qq, requester_level, qq, target_roles.get(qq),
+        )
+        if cacheable:
+            permission_decision_cache.set(key_prefix + (qq,) + key_suffix, decision)
+        decisions[qq] = decision
+    return decisions
 
 
 async def check_requester_permission(
     group_id: int,
     requester_qq: Optional[str],
     required_level: PermissionLevel,
-    operation_name: str
-) -> tuple[bool, str]:
+    operation_name: str,
+    effective_config: Optional[EffectiveConfig] = None
+) -> PermissionDecision:
     """仅检查请求者权限（不涉及目标用户的操作）
     
     Args:
@@ -435,47 +733,69 @@ async def check_requester_permission(
         requester_qq: 请求者QQ号
         required_level: 执行操作需要的最低权限等级
         operation_name: 操作名称
+        effective_config: 该群的有效配置快照，调用方已获取时传入以免重复获取
         
     Returns:
-        tuple[bool, str]: (是否有权限, 提示信息)
+        PermissionDecision: 权限检查结果
     """
-    # 先检查bot自身的权限
-    bot_level = await get_bot_permission_level(group_id)
-    
-    if bot_level < required_level:
-        level_names = {
-            PermissionLevel.MEMBER: "普通成员",
-            PermissionLevel.ADMIN: "管理员",
-            PermissionLevel.OWNER: "群主",
-            PermissionLevel.SUPER_ADMIN: "超级管理员",
-        }
-        return False, f"bot权限不足：{operation_name}需要{level_names[required_level]}及以上权限，bot当前权限为 {level_names[bot_level]}"
+    requester_qq = normalize_id(requester_qq) if requester_qq is not None else None
     
     # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
+    if effective_config is None:
+        effective_config = await get_effective_config(group_id)
+    ai_autonomous = effective_config.get("PERMISSION_MODE") == "ai_autonomous"
     
-    # AI自主模式下不检查请求者权限
-    if effective_config.get("PERMISSION_MODE") == "ai_autonomous":
-        return True, "AI自主模式"
+    # 配置与成员角色都未变化时直接复用之前的判断结果
+    cache_key = (
+        group_id, None if ai_autonomous else requester_qq, None, required_level, operation_name,
+        effective_config.generation, member_role_cache.role_version(group_id),
+    )
+    cached_decision = permission_decision_cache.get(cache_key)
+    if cached_decision is not None:
+        return cached_decision
+    
+    # 并发获取bot权限与（check_requester模式下）请求者权限
+    if not ai_autonomous and requester_qq:
+        bot_level, requester_level = await asyncio.gather(
+            get_bot_permission_level(group_id),
+            get_user_permission_level(group_id, requester_qq),
+        )
+    else:
+        bot_level, requester_level = await get_bot_permission_level(group_id), None
+    
+    # 先检查bot自身的权限
+    if bot_level < required_level:
+        return PermissionDecision(
+            False,
+            f"bot权限不足：{operation_name}需要{PERMISSION_LEVEL_NAMES[required_level]}及以上权限，bot当前权限为 {PERMISSION_LEVEL_NAMES[bot_level]}",
+            bot_level, requester_level,
+        )
+    
+    # AI自主模式下不检查请求者权限（只缓存允许的结果，拒绝的结果可能源于获取权限失败）
+    if ai_autonomous:
+        decision = PermissionDecision(True, "AI自主模式", bot_level)
+        permission_decision_cache.set(cache_key, decision)
+        return decision
     
     # check_requester 模式下必须提供请求者QQ
     if not requester_qq:
-        return False, f"权限检查模式下需要提供请求者QQ（requester_qq参数），请让AI在调用时传入发起请求的用户QQ号"
-    
-    # 获取请求者权限
-    requester_level = await get_user_permission_level(group_id, requester_qq)
+        return PermissionDecision(
+            False,
+            f"权限检查模式下需要提供请求者QQ（requester_qq参数），请让AI在调用时传入发起请求的用户QQ号",
+            bot_level,
+        )
     
     # 检查请求者是否有足够权限
     if requester_level < required_level:
-        level_names = {
-            PermissionLevel.MEMBER: "普通成员",
-            PermissionLevel.ADMIN: "管理员",
-            PermissionLevel.OWNER: "群主",
-            PermissionLevel.SUPER_ADMIN: "超级管理员",
-        }
-        return False, f"权限不足：{operation_name}需要{level_names[required_level]}及以上权限，用户 {requester_qq} 当前权限为 {level_names[requester_level]}"
+        return PermissionDecision(
+            False,
+            f"权限不足：{operation_name}需要{PERMISSION_LEVEL_NAMES[required_level]}及以上权限，用户 {requester_qq} 当前权限为 {PERMISSION_LEVEL_NAMES[requester_level]}",
+            bot_level, requester_level,
+        )
     
-    return True, "权限检查通过"
+    decision = PermissionDecision(True, "权限检查通过", bot_level, requester_level)
+    permission_decision_cache.set(cache_key, decision)
+    return decision
 
 
 def parse_chat_key(ctx: AgentCtx) -> tuple[str, str]:
@@ -500,6 +820,406 @@ async def send_admin_report(ctx: AgentCtx, operation: str, details: str):
         )
 
 
+# ============== 目标成员解析 ==============
+
+MEMBER_ROLE_NAMES = {
+    "owner": "群主",
+    "admin": "管理员",
+    "member": "普通成员"
+}
+
+# 昵称匹配到多个成员时最多列出的候选数
+TARGET_CANDIDATE_LIMIT = 5
+
+
+def parse_target_qq(target: str) -> Optional[str]:
+    """目标用户为QQ号或@QQ号时返回规范化的QQ号，否则返回 None（需按群名片/昵称解析）
+    
+    Args:
+        target: 目标用户
+    
+    Returns:
+        Optional[str]: QQ号
+    """
+    qq = normalize_id(target).lstrip("@")
+    return qq if qq.isascii() and qq.isdigit() else None
+
+
+async def resolve_target_member(group_id: int, target: str) -> tuple[Optional[str], Optional[str]]:
+    """将目标用户解析为QQ号，目标可以是QQ号、@QQ号、群名片或昵称
+    
+    全部为数字的目标（可带@前缀）一律视为QQ号，不查询成员名单，也不检查该用户是否在群内
+    （不在群内时由 OneBot 返回错误）；群名片或昵称恰好是纯数字的成员需要用其QQ号指定。
+    
+    群名片/昵称通过成员名单的搜索索引匹配：唯一的完全匹配，或没有完全匹配时唯一的前缀匹配才直接使用；
+    其余情况（包括只有一个包含匹配）返回候选成员列表，由AI确认后使用QQ号重新调用，避免误操作。
+    获取成员名单失败时抛出异常。
+    
+    Args:
+        group_id: 群号
+        target: 目标用户
+        
+    Returns:
+        tuple[Optional[str], Optional[str]]: (QQ号, 错误信息)，解析成功时错误信息为 None
+    """
+    qq = parse_target_qq(target)
+    if qq is not None:
+        return qq, None
+    target = normalize_id(target)
+    if not target:
+        return None, "未提供目标用户（user_qq参数）"
+    
+    matches = await roster_cache.search_members(get_bot(), group_id, target)
+    if not matches:
+        return None, f"未找到群名片或昵称匹配 '{target}' 的成员，请确认后重试，或使用 `群管_获取成员列表` 查找"
+    exact = [member for rank, member in matches if rank == MATCH_EXACT]
+    prefix = [member for rank, member in matches if rank == MATCH_PREFIX]
+    unique = exact if exact else prefix
+    if len(unique) == 1:
+        member = unique[0]
+        core.logger.info(f"[群{group_id}] 已将目标 '{target}' 解析为成员 {member['user_id']}")
+        return member["user_id"], None
+    
+    # 无法唯一确定，返回候选（有完全匹配时只列出完全匹配的成员）
+    candidates = exact or [member for _, member in matches]
+    result = f"'{target}' 匹配到 {len(candidates)} 个成员，请确认目标后使用QQ号重新调用：\n"
+    for member in candidates[:TARGET_CANDIDATE_LIMIT]:
+        role_name = MEMBER_ROLE_NAMES.get(member["role"], member["role"])
+        result += f"- {member['user_id']} {member['card'] or member['nickname']} ({role_name})\n"
+    if len(candidates) > TARGET_CANDIDATE_LIMIT:
+        result += f"...还有 {len(candidates) - TARGET_CANDIDATE_LIMIT} 个成员未列出"
+    return None, result.rstrip("\n")
+
+
+# ============== 工具调用流水线 ==============
+
+class AdminToolSpec:
+    """群管操作工具的静态描述
+    
+    run_admin_tool 按此描述执行 上下文 -> 配置快照 -> 权限判断 -> 执行操作 -> 发送报告 的流水线。
+    """
+
+    __slots__ = (
+        "name", "scope_name", "switch_key", "switch_name", "operation_name",
+        "required_level", "report_name", "error_name",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        scope_name: str,
+        switch_key: str,
+        switch_name: str,
+        operation_name: str,
+        required_level: PermissionLevel,
+        report_name: Optional[str] = None,
+        error_name: Optional[str] = None
+    ):
+        """初始化工具描述
+        
+        Args:
+            name: 工具名称（用于日志和耗时统计）
+            scope_name: 非群聊时提示「{scope_name}功能仅支持群聊」
+            switch_key: 功能开关配置键
+            switch_name: 功能未开启时提示「{switch_name}功能未开启」
+            operation_name: 权限检查中的操作名称
+            required_level: 执行操作需要的最低权限等级
+            report_name: 管理操作报告中的操作名称，默认同 operation_name
+            error_name: 操作失败时提示「{error_name}: 错误」，默认为 operation_name + "失败"
+        """
+        self.name = name
+        self.scope_name = scope_name
+        self.switch_key = switch_key
+        self.switch_name = switch_name
+        self.operation_name = operation_name
+        self.required_level = required_level
+        self.report_name = report_name or operation_name
+        self.error_name = error_name or f"{operation_name}失败"
+
+
+class ToolInvocation:
+    """单次工具调用的状态，流水线每个阶段的结果只计算一次并保存在此"""
+
+    __slots__ = ("ctx", "spec", "group_id", "target_qq", "config", "decision", "outcome", "timings", "_stage_start")
+
+    def __init__(self, ctx: AgentCtx, spec: AdminToolSpec):
+        self.ctx = ctx
+        self.spec = spec
+        self.group_id: Optional[int] = None
+        self.target_qq: Optional[str] = None  # 解析后的目标用户QQ号
+        self.config: Optional[EffectiveConfig] = None
+        self.decision: Optional[PermissionDecision] = None
+        self.outcome = "pending"  # rejected / denied / done / failed
+        self.timings: dict[str, float] = {}  # 各阶段耗时（秒）
+        self._stage_start = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        """记录上一阶段结束，保存其耗时"""
+        now = time.perf_counter()
+        self.timings[stage] = now - self._stage_start
+        self._stage_start = now
+
+    @property
+    def elapsed(self) -> float:
+        """已记录阶段的总耗时（秒）"""
+        return sum(self.timings.values())
+
+
+# 工具调用完成后的钩子，参数为 ToolInvocation；可用于耗时统计、审计等
+ToolHook = Callable[[ToolInvocation], None]
+tool_hooks: list[ToolHook] = []
+
+# 执行操作前的钩子，参数为已完成配置与权限判断的 ToolInvocation；
+# 返回字符串时拒绝本次调用并以其作为结果，返回 None 时继续执行（可用于频率限制、维护模式等）
+ToolPreHook = Callable[[ToolInvocation], Optional[str]]
+tool_pre_hooks: list[ToolPreHook] = []
+
+# 各工具的调用次数与总耗时: 工具名 -> [调用次数, 总耗时]
+tool_timing_stats: dict[str, list] = {}
+
+
+def register_tool_hook(hook: ToolHook) -> ToolHook:
+    """注册工具调用完成后的钩子，可用作装饰器
+    
+    Args:
+        hook: 钩子函数
+        
+    Returns:
+        原钩子函数
+    """
+    tool_hooks.append(hook)
+    return hook
+
+
+def register_tool_pre_hook(hook: ToolPreHook) -> ToolPreHook:
+    """注册执行操作前的钩子，可用作装饰器
+    
+    Args:
+        hook: 钩子函数，返回字符串时拒绝本次调用
+        
+    Returns:
+        原钩子函数
+    """
+    tool_pre_hooks.append(hook)
+    return hook
+
+
+@register_tool_hook
+def record_tool_timing(invocation: ToolInvocation) -> None:
+    """记录各工具的调用次数与耗时"""
+    stats = tool_timing_stats.setdefault(invocation.spec.name, [0, 0.0])
+    stats[0] += 1
+    stats[1] += invocation.elapsed
+    core.logger.debug(
+        f"[{invocation.spec.name}] {invocation.outcome}，耗时 "
+        + ", ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in invocation.timings.items())
+    )
+
+
+async def run_admin_tool(
+    ctx: AgentCtx,
+    spec: AdminToolSpec,
+    report: str,
+    requester_qq: Optional[str],
+    action: Callable[[ToolInvocation], Awaitable[tuple[str, Optional[str]]]],
+    target_qq: Optional[str] = None
+) -> str:
+    """执行群管操作工具的公共流水线
+    
+    依次执行: 解析会话 -> 获取有效配置快照并检查功能开关 -> 解析目标用户（昵称转为QQ号）
+    -> 权限判断（复用同一配置快照） -> 前置钩子 -> 执行操作 -> 发送管理操作报告，每个阶段只执行一次，
+    结束后调用已注册的钩子。任一前置钩子返回字符串时不执行操作，以其作为结果。
+    目标需要按昵称解析时，先检查请求者权限再获取成员名单，无权限的请求不会触发 OneBot 请求。
+    
+    Args:
+        ctx: 上下文
+        spec: 工具描述
+        report: 操作理由
+        requester_qq: 请求者QQ号
+        action: 执行操作的协程函数，返回 (结果文本, 报告详情)；报告详情为 None 表示未实际执行操作，不发送报告
+        target_qq: 目标用户（QQ号、群名片或昵称），提供时解析为QQ号（保存在 invocation.target_qq）
+            并检查对目标用户的操作权限，否则只检查请求者权限
+        
+    Returns:
+        str: 操作结果
+    """
+    invocation = ToolInvocation(ctx, spec)
+    try:
+        chat_type, chat_id = parse_chat_key(ctx)
+        if chat_type != ChatType.GROUP.value:
+            invocation.outcome = "rejected"
+            return f"{spec.scope_name}功能仅支持群聊，当前频道类型: {chat_type}"
+        group_id = invocation.group_id = int(chat_id)
+        
+        # 获取该群的有效配置并检查功能开关
+        invocation.config = await get_effective_config(group_id)
+        invocation.mark("config")
+        if not invocation.config.get(spec.switch_key):
+            invocation.outcome = "rejected"
+            return f"{spec.switch_name}功能未开启，无法执行此操作"
+        
+        # 将昵称解析为QQ号，无法唯一确定时返回候选成员
+        if target_qq is not None:
+            if parse_target_qq(target_qq) is None:
+                # 获取成员名单前先检查请求者权限（开销小，且结果可缓存）
+                requester_decision = await check_requester_permission(
+                    group_id, requester_qq, spec.required_level, spec.operation_name,
+                    effective_config=invocation.config,
+                )
+                if not requester_decision.allowed:
+                    invocation.decision = requester_decision
+                    invocation.outcome = "denied"
+                    return requester_decision.message
+            try:
+                invocation.target_qq, error = await resolve_target_member(group_id, target_qq)
+            except Exception as e:
+                invocation.outcome = "failed"
+                core.logger.error(f"[群{chat_id}] 解析目标用户 '{target_qq}' 失败: {e}")
+                return f"解析目标用户失败（获取群成员名单出错: {e}），请稍后重试或直接使用QQ号"
+            invocation.mark("resolve")
+            if error is not None:
+                invocation.outcome = "rejected"
+                return error
+        
+        # 权限检查（复用上面的配置快照）
+        if target_qq is None:
+            invocation.decision = await check_requester_permission(
+                group_id, requester_qq, spec.required_level, spec.operation_name,
+                effective_config=invocation.config,
+            )
+        else:
+            invocation.decision = await check_permission(
+                ctx, group_id, invocation.target_qq, spec.required_level, spec.operation_name, requester_qq,
+                effective_config=invocation.config,
+            )
+        invocation.mark("permission")
+        if not invocation.decision.allowed:
+            invocation.outcome = "denied"
+            return invocation.decision.message
+        
+        for pre_hook in tool_pre_hooks:
+            try:
+                rejection = pre_hook(invocation)
+            except Exception as e:
+                core.logger.error(f"[{spec.name}] 工具前置钩子执行失败: {e}")
+                continue
+            if rejection is not None:
+                invocation.outcome = "rejected"
+                return rejection
+        
+        try:
+            result, details = await action(invocation)
+            invocation.mark("action")
+            if details is None:
+                invocation.outcome = "rejected"
+                return result
+            
+            await send_admin_report(ctx, spec.report_name, f"{details}\n理由: {report}")
+            core.logger.info(f"[群{chat_id}] {result}，理由: {report}")
+            invocation.mark("report")
+            invocation.outcome = "done"
+            return result
+        except Exception as e:
+            invocation.outcome = "failed"
+            core.logger.error(f"{spec.error_name}: {e}")
+            return f"{spec.error_name}: {e}"
+    finally:
+        for hook in tool_hooks:
+            try:
+                hook(invocation)
+            except Exception as e:
+                core.logger.error(f"[{spec.name}] 工具钩子执行失败: {e}")
+
+
+# 批量操作单次最多的目标数、并发请求数与单个请求的超时时间（秒）
+BULK_MAX_TARGETS = 200
+BULK_ACTION_CONCURRENCY = 5
+BULK_ACTION_TIMEOUT = 10
+
+
+async def run_bulk_target_action(
+    invocation: ToolInvocation,
+    requester_qq: Optional[str],
+    target_qqs: list[str],
+    act: Callable[[str], Awaitable[Any]],
+    details: str = "",
+    timeout: Optional[float] = None
+) -> tuple[str, Optional[str]]:
+    """在 run_admin_tool 的操作阶段内对多个目标用户执行同一操作
+    
+    复用流水线的配置快照，用 check_permissions_bulk 一次性判断所有目标的权限，
+    再以有限并发对允许的目标执行操作（每个请求单独计时，超时视为失败），汇总每个目标的结果。
+    
+    Args:
+        invocation: 当前工具调用（已完成配置与请求者权限检查）
+        requester_qq: 请求者QQ号
+        target_qqs: 目标用户QQ列表
+        act: 对单个目标（规范化QQ号）执行操作的协程函数，抛出异常视为失败
+        details: 附加在管理操作报告中的操作详情（如禁言时长）
+        timeout: 单个目标操作的超时时间（秒），默认为 BULK_ACTION_TIMEOUT
+        
+    Returns:
+        tuple[str, Optional[str]]: (结果文本, 报告详情)，没有任何目标成功时报告详情为 None
+    """
+    spec = invocation.spec
+    if timeout is None:
+        timeout = BULK_ACTION_TIMEOUT
+    targets = list(dict.fromkeys(normalize_id(qq) for qq in target_qqs))
+    if not targets:
+        return "未提供目标用户", None
+    if len(targets) > BULK_MAX_TARGETS:
+        return f"单次最多对 {BULK_MAX_TARGETS} 个用户执行{spec.operation_name}，当前为 {len(targets)} 个", None
+    invalid = [qq for qq in targets if not (qq.isascii() and qq.isdigit())]
+    if invalid:
+        return f"以下目标不是有效的QQ号: {', '.join(invalid)}", None
+    
+    decisions = await check_permissions_bulk(
+        invocation.group_id, requester_qq, targets, spec.required_level, spec.operation_name,
+        effective_config=invocation.config,
+    )
+    invocation.mark("target_permission")
+    allowed = [qq for qq, decision in decisions.items() if decision.allowed]
+    
+    semaphore = asyncio.Semaphore(BULK_ACTION_CONCURRENCY)
+    
+    async def act_on(qq: str) -> Optional[str]:
+        async with semaphore:
+            try:
+                await asyncio.wait_for(act(qq), timeout)
+                return None
+            except asyncio.TimeoutError:
+                return f"请求超时（{timeout}秒），操作可能未生效"
+            except Exception as e:
+                return str(e) or type(e).__name__
+    
+    errors = dict(zip(allowed, await asyncio.gather(*(act_on(qq) for qq in allowed))))
+    succeeded = [qq for qq, error in errors.items() if error is None]
+    failed = {qq: error for qq, error in errors.items() if error is not None}
+    denied = {qq: decision.message for qq, decision in decisions.items() if not decision.allowed}
+    
+    result = (
+        f"{spec.operation_name}: 共 {len(targets)} 人，成功 {len(succeeded)}，"
+        f"失败 {len(failed)}，无权限跳过 {len(denied)}"
+    )
+    for qq, error in failed.items():
+        result += f"\n- {qq} 失败: {error}"
+    for qq, message in denied.items():
+        result += f"\n- {qq} 跳过: {message}"
+    if failed:
+        core.logger.warning(f"[{spec.name}] {len(failed)} 个目标执行失败: {failed}")
+    if not succeeded:
+        return result, None
+    
+    report_details = f"目标: {len(targets)} 人\n成功: {', '.join(succeeded)}"
+    if failed:
+        report_details += f"\n失败: {', '.join(failed)}"
+    if denied:
+        report_details += f"\n跳过: {', '.join(denied)}"
+    if details:
+        report_details += f"\n{details}"
+    return result, report_details
+
+
 # ============== 提示词注入 ==============
 
 @plugin.mount_prompt_inject_method(name="group_admin_prompt_inject")
@@ -508,17 +1228,12 @@ async def group_admin_prompt_inject(_ctx: AgentCtx):
     # 获取当前群的配置
     chat_type, chat_id = parse_chat_key(_ctx)
     
-    # 获取最新的全局配置
-    admin_config = get_admin_config()
-    
     if chat_type == ChatType.GROUP.value:
         group_id = int(chat_id)
         effective_config = await get_effective_config(group_id)
         
         # 检查是否有分群配置
-        all_configs = await group_config_manager.list_group_configs()
-        group_key = str(group_id)
-        has_custom_config = group_key in all_configs
+        has_custom_config = group_config_manager.has_group_config(group_id)
         
         if has_custom_config:
             config_mode = "分群配置（优先级高于全局配置）"
@@ -526,21 +1241,8 @@ async def group_admin_prompt_inject(_ctx: AgentCtx):
             config_mode = "全局默认配置"
     else:
         # 非群聊，使用全局配置
-        effective_config = {
-            "PERMISSION_MODE": admin_config.PERMISSION_MODE,
-            "ENABLE_MUTE": admin_config.ENABLE_MUTE,
-            "ENABLE_MUTE_ALL": admin_config.ENABLE_MUTE_ALL,
-            "ENABLE_KICK": admin_config.ENABLE_KICK,
-            "ENABLE_KICK_AND_BAN": admin_config.ENABLE_KICK_AND_BAN,
-            "ENABLE_SET_CARD": admin_config.ENABLE_SET_CARD,
-            "ENABLE_SET_TITLE": admin_config.ENABLE_SET_TITLE,
-            "ENABLE_SET_ADMIN": admin_config.ENABLE_SET_ADMIN,
-            "ENABLE_DELETE_MSG": admin_config.ENABLE_DELETE_MSG,
-            "ENABLE_SET_ESSENCE": admin_config.ENABLE_SET_ESSENCE,
-            "ENABLE_SET_GROUP_NAME": admin_config.ENABLE_SET_GROUP_NAME,
-            "ENABLE_SET_GROUP_PORTRAIT": admin_config.ENABLE_SET_GROUP_PORTRAIT,
-            "ENABLE_SEND_NOTICE": admin_config.ENABLE_SEND_NOTICE,
-        }
+        sync_global_config()
+        effective_config = group_config_manager.get_global_snapshot()
         config_mode = "全局默认配置"
     
     if effective_config.get("PERMISSION_MODE") == "check_requester":
@@ -558,11 +1260,11 @@ async def group_admin_prompt_inject(_ctx: AgentCtx):
     
     # 成员管理
     if effective_config.get("ENABLE_MUTE"):
-        available_features.append("- 禁言/解禁群成员")
+        available_features.append("- 禁言/解禁群成员（多人时使用 `群管_批量禁言` 一次完成）")
     if effective_config.get("ENABLE_MUTE_ALL"):
         available_features.append("- 全体禁言")
     if effective_config.get("ENABLE_KICK"):
-        available_features.append("- 踢出成员")
+        available_features.append("- 踢出成员（多人时使用 `群管_批量踢出` 一次完成）")
     if effective_config.get("ENABLE_KICK_AND_BAN"):
         available_features.append("- 踢出并拉黑")
     if effective_config.get("ENABLE_SET_CARD"):
@@ -589,13 +1291,14 @@ async def group_admin_prompt_inject(_ctx: AgentCtx):
     features_text = "\n".join(available_features) if available_features else "（暂无可用功能）"
     
     # 检查 ALLOW_GROUPS 配置
-    if len(admin_config.ALLOW_GROUPS) == 0:
+    allow_groups = get_allow_groups()
+    if not allow_groups:
         allow_groups_status = "所有群组均可使用群管功能"
     else:
         chat_type, chat_id = parse_chat_key(_ctx)
         if chat_type == ChatType.GROUP.value:
-            group_id = str(chat_id)
-            if group_id in admin_config.ALLOW_GROUPS:
+            group_id = normalize_id(chat_id)
+            if group_id in allow_groups:
                 allow_groups_status = f"当前群 ({group_id}) 在允许列表中，可以使用群管功能"
             else:
                 allow_groups_status = f"当前群 ({group_id}) 不在允许列表中，无法使用群管功能"
@@ -634,17 +1337,19 @@ async def group_admin_prompt_inject(_ctx: AgentCtx):
 ### 分群配置查看
 你可以使用以下工具查看分群配置：
 - `群管_查看群配置`: 查看当前群或指定群的配置，包括功能开关状态
+- `群管_全局同步所有群` / `群管_复制配置到所有群`: 批量修改所有群的配置，仅在用户明确要求时使用
+- `群管_查看配置模板` / `群管_设置配置模板` / `群管_应用配置模板`: 管理多个群共享的命名配置模板
 
-### 通过昵称查找成员（必须遵守）
-当用户要求对某个昵称的成员执行管理操作时，**必须**按以下步骤进行：
-1. 先调用 `群管_获取成员列表` 工具，传入昵称作为搜索关键词
-2. 从返回的列表中找到匹配的成员及其QQ号
-3. 使用找到的QQ号调用相应的管理操作工具（如 `群管_禁言用户`）
+### 通过昵称指定成员
+对成员执行管理操作的工具（禁言、踢出、修改群昵称、设置头衔、设置管理员等）的 `user_qq` 参数可以直接填写用户提到的**群名片或昵称**，系统会自动匹配群成员，无需先调用 `群管_获取成员列表`：
+- 唯一的完全匹配（或没有完全匹配时唯一的前缀匹配）时直接执行操作
+- 匹配到多个成员或只是部分包含时不会执行操作，而是返回候选成员列表，请根据上下文确认目标后使用QQ号重新调用
+- 纯数字的 `user_qq` 一律按QQ号处理，不会匹配群名片或昵称
+- 不确定时不要猜测QQ号，也不要使用发送消息的用户QQ号代替
 
-**错误示例**：
+**示例**：
 - 用户说："禁言下 救命啊家人们十分钟"
-- ❌ 错误做法：直接使用发送消息的用户QQ号或随便猜测一个QQ号
-- ✅ 正确做法：先调用 `群管_获取成员列表(search_keyword="救命啊家人们")`，找到匹配的QQ号，再禁言
+- ✅ 正确做法：直接调用 `群管_禁言用户(user_qq="救命啊家人们", duration=600, ...)`
 
 ### 群主限制
 - QQ协议限制：**无法禁言或踢出群主**
@@ -663,17 +1368,89 @@ async def group_admin_prompt_inject(_ctx: AgentCtx):
 
 # ============== 成员管理功能 ==============
 
+# 成员列表的排序方式（match 仅在搜索时可用）
+MEMBER_SORT_NAMES = {
+    "match": "匹配程度",
+    "role": "角色",
+    "join_time": "入群时间",
+    "last_speak": "最后发言时间",
+}
+# 成员列表每页最多条数
+MEMBER_PAGE_SIZE_LIMIT = 100
+
+
+def encode_member_cursor(sort: str, position: Any) -> str:
+    """生成成员列表翻页的 cursor
+    
+    Args:
+        sort: 排序方式
+        position: match 排序时为下一页的起始序号，其他排序时为本页最后一个成员的排序键
+        
+    Returns:
+        str: cursor
+    """
+    if sort == "match":
+        return f"match:{position}"
+    return f"{sort}:{position[0]}:{position[2]}"
+
+
+def decode_member_cursor(cursor: str, sort: str) -> Any:
+    """解析成员列表翻页的 cursor
+    
+    Args:
+        cursor: encode_member_cursor 生成的 cursor
+        sort: 当前的排序方式
+        
+    Returns:
+        起始序号或排序键，cursor 无效或与排序方式不符时返回 None
+    """
+    parts = cursor.strip().split(":")
+    if parts[0] != sort:
+        return None
+    try:
+        if sort == "match":
+            return int(parts[1])
+        return (int(parts[1]), len(parts[2]), parts[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def format_member_row(member: dict[str, Any]) -> str:
+    """将成员信息格式化为一行表格: QQ|名片或昵称|角色|入群日期|最后发言日期"""
+    name = (member["card"] or member["nickname"]).replace("|", "/")
+    role_name = MEMBER_ROLE_NAMES.get(member["role"], member["role"])
+    dates = [
+        time.strftime("%Y-%m-%d", time.localtime(timestamp)) if timestamp else "-"
+        for timestamp in (member["join_time"], member["last_sent_time"])
+    ]
+    return f"{member['user_id']}|{name}|{role_name}|{dates[0]}|{dates[1]}"
+
+
 @plugin.mount_sandbox_method(
     SandboxMethodType.TOOL,
     name="群管_获取成员列表",
-    description="获取群成员列表，支持按昵称或QQ号搜索成员。返回成员的QQ号、昵称、角色等信息。",
+    description=(
+        "分页获取群成员列表，支持按群名片、昵称或QQ号搜索成员（忽略大小写和全角/半角差异）。"
+        "可按匹配程度(match，仅搜索时)、角色(role)、入群时间(join_time)、最后发言时间(last_speak)排序；"
+        "结果末尾给出 cursor 时，传入该 cursor 获取下一页。返回成员的QQ号、昵称、角色、入群和最后发言日期。"
+    ),
 )
-async def admin_get_member_list(_ctx: AgentCtx, search_keyword: str = "", requester_qq: Optional[str] = None) -> str:
-    """获取群成员列表，支持搜索
+async def admin_get_member_list(
+    _ctx: AgentCtx,
+    search_keyword: str = "",
+    requester_qq: Optional[str] = None,
+    sort: str = "",
+    page_size: int = 20,
+    cursor: str = ""
+) -> str:
+    """分页获取群成员列表，支持搜索
     
     Args:
-        search_keyword (str): 搜索关键词（QQ号或昵称），留空则返回所有成员
+        search_keyword (str): 搜索关键词（群名片、昵称或QQ号），留空则列出所有成员
         requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
+        sort (str): 排序方式: match / role / join_time / last_speak，默认搜索时为 match，否则为 role
+        page_size (int): 每页条数，最多100
+        cursor (str): 翻页位置，传入上一页结果中的 cursor，留空则从第一页开始
         
     Returns:
         str: 成员列表信息
@@ -685,63 +1462,59 @@ async def admin_get_member_list(_ctx: AgentCtx, search_keyword: str = "", reques
     
     group_id = int(chat_id)
     
+    sort = sort or ("match" if search_keyword else "role")
+    if sort not in MEMBER_SORT_NAMES or (sort == "match" and not search_keyword):
+        return f"不支持的排序方式 '{sort}'，可选: role, join_time, last_speak（搜索时还可使用 match）"
+    page_size = min(max(page_size, 1), MEMBER_PAGE_SIZE_LIMIT)
+    position = decode_member_cursor(cursor, sort) if cursor else None
+    if cursor and position is None:
+        return "无效的 cursor，请传入上一页结果中给出的 cursor，并保持排序方式不变"
+    
     # 权限检查 - 获取成员列表需要管理员权限
-    can_operate, msg = await check_requester_permission(
+    decision = await check_requester_permission(
         group_id, requester_qq, PermissionLevel.ADMIN, "获取成员列表"
     )
-    if not can_operate:
-        return msg
+    if not decision.allowed:
+        return decision.message
     
     try:
-        # 获取群成员列表
-        member_list = await get_bot().get_group_member_list(group_id=group_id)
-        
-        # 搜索匹配的成员
-        matched_members = []
-        for member in member_list:
-            user_id = str(member.get("user_id", ""))
-            card = member.get("card", "") or member.get("nickname", "")
-            role = member.get("role", "member")
-            
-            # 角色映射
-            role_names = {
-                "owner": "群主",
-                "admin": "管理员",
-                "member": "普通成员"
-            }
-            role_name = role_names.get(role, role)
-            
-            # 如果有搜索关键词，进行匹配
-            if search_keyword:
-                if search_keyword in user_id or search_keyword in card:
-                    matched_members.append({
-                        "qq": user_id,
-                        "昵称": card,
-                        "角色": role_name
-                    })
-            else:
-                matched_members.append({
-                    "qq": user_id,
-                    "昵称": card,
-                    "角色": role_name
-                })
+        roster = await roster_cache.get_roster(get_bot(), group_id)
         
-        if not matched_members:
+        # 惰性产出候选成员，取满一页即停止；同一关键词的搜索结果在名单变化前复用，翻页时不重新排序
+        if search_keyword:
+            matches = roster.search(search_keyword)
+            total = len(matches)
+            if sort == "match":
+                start = position or 0
+                candidates = (matches[i][1] for i in range(start, total))
+            else:
+                matched_ids = {member["user_id"] for _, member in matches}
+                candidates = (member for member in roster.iter_sorted(sort, position) if member["user_id"] in matched_ids)
+        else:
+            total = len(roster.members)
+            candidates = roster.iter_sorted(sort, position)
+        page = list(islice(candidates, page_size + 1))
+        has_more = len(page) > page_size
+        page = page[:page_size]
+        
+        if not page:
+            if cursor:
+                return "没有更多成员了"
             return f"未找到匹配 '{search_keyword}' 的成员"
         
         # 格式化输出
         if search_keyword:
-            result = f"找到 {len(matched_members)} 个匹配 '{search_keyword}' 的成员：\n"
+            result = f"找到 {total} 个匹配 '{search_keyword}' 的成员"
         else:
-            result = f"群成员列表（共 {len(matched_members)} 人）：\n"
-        
-        for idx, member in enumerate(matched_members[:20], 1):  # 最多显示20个
-            result += f"{idx}. QQ: {member['qq']}, 昵称: {member['昵称']}, 角色: {member['角色']}\n"
-        
-        if len(matched_members) > 20:
-            result += f"...还有 {len(matched_members) - 20} 个成员未显示"
-        
-        core.logger.info(f"[群{chat_id}] 获取成员列表成功，搜索关键词: '{search_keyword}'，匹配数: {len(matched_members)}")
+            result = f"群成员列表（共 {total} 人）"
+        result += f"，按{MEMBER_SORT_NAMES[sort]}排序，本页 {len(page)} 条：\n"
+        result += "QQ|昵称|角色|入群|最后发言\n"
+        result += "\n".join(map(format_member_row, page))
+        if has_more:
+            next_position = (start + page_size) if sort == "match" else MEMBER_SORT_KEYS[sort](page[-1])
+            result += f"\n下一页 cursor: {encode_member_cursor(sort, next_position)}"
+        
+        core.logger.info(f"[群{chat_id}] 获取成员列表成功，搜索关键词: '{search_keyword}'，匹配数: {total}，本页: {len(page)}")
         return result
         
     except Exception as e:
@@ -751,74 +1524,161 @@ async def admin_get_member_list(_ctx: AgentCtx, search_keyword: str = "", reques
 
 @plugin.mount_sandbox_method(
     SandboxMethodType.TOOL,
-    name="群管_禁言用户",
-    description="禁言群成员指定时长，设置时长为0则解除禁言。注意：无法禁言群主。权限检查模式下需提供requester_qq参数。",
+    name="群管_查找用户所在群",
+    description="查找指定QQ号的用户在bot管理的哪些群中以及在各群的角色，不请求 OneBot，只覆盖已缓存成员名单的群，结果可能不完整。可用于处理在多个群刷屏、打广告的用户。",
 )
-async def admin_mute_user(_ctx: AgentCtx, user_qq: str, duration: int, report: str, requester_qq: Optional[str] = None) -> str:
-    """禁言群成员（需要管理员及以上权限）
+async def admin_find_user_groups(_ctx: AgentCtx, user_qq: str, requester_qq: Optional[str] = None) -> str:
+    """查找用户所在的群
+    
+    结果并不完整：只覆盖成员名单仍在缓存中的群（最近使用过且未过期，启动预热只加载少量群的名单），
+    未找到不代表用户不在其他群中。
     
     Args:
-        user_qq (str): 被禁言用户的QQ号
-        duration (int): 禁言时长（秒），设置为0则解除禁言，最大30天
-        report (str): 禁言理由，需详细说明原因
-        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供，用于验证权限
+        user_qq (str): 要查找的用户QQ号
+        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
         
     Returns:
-        str: 操作结果
+        str: 用户所在的群及角色
     """
     chat_type, chat_id = parse_chat_key(_ctx)
     
-    if chat_type != ChatType.GROUP.value:
-        result = f"禁言功能仅支持群聊，当前频道类型: {chat_type}"
-        core.logger.warning(f"[群管_禁言用户] {result}")
-        return result
-    
-    group_id = int(chat_id)
-    
-    # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
-    
-    # 检查功能开关
-    if not effective_config.get("ENABLE_MUTE"):
-        return "禁言功能未开启，无法执行此操作"
+    # 群聊中需要当前群的管理员权限，其他会话中按跨群操作检查
+    if chat_type == ChatType.GROUP.value:
+        decision = await check_requester_permission(
+            int(chat_id), requester_qq, PermissionLevel.ADMIN, "查找用户所在群"
+        )
+        if not decision.allowed:
+            return decision.message
+    else:
+        can_operate, msg = check_config_admin_permission(requester_qq, "查找用户所在群")
+        if not can_operate:
+            return msg
     
-    core.logger.info(f"[群管_禁言用户] 收到请求: user_qq={user_qq}, duration={duration}, requester_qq={requester_qq}")
+    user_qq = normalize_id(user_qq)
+    groups = roster_cache.find_user_groups(user_qq)
+    covered = roster_cache.stats()["size"]
+    if not groups:
+        return f"在已缓存成员名单的 {covered} 个群中未找到用户 {user_qq}"
     
-    # 权限检查（已在check_permission中检查目标用户角色）
-    can_operate, msg = await check_permission(
-        _ctx, group_id, user_qq,
-        PermissionLevel.ADMIN, "禁言用户", requester_qq
-    )
-    core.logger.info(f"[群管_禁言用户] 权限检查结果: can_operate={can_operate}, msg={msg}")
-    if not can_operate:
-        return msg
+    result = f"用户 {user_qq} 在 {len(groups)} 个群中（已缓存成员名单的群共 {covered} 个）：\n"
+    result += "群号|昵称|角色|入群|最后发言\n"
+    for group_id, member in sorted(groups.items()):
+        # 表格第一列换成群号，其余列与成员列表相同
+        result += f"{group_id}|{format_member_row(member).split('|', 1)[1]}\n"
+    return result.rstrip("\n")
+
+
+def check_mute_duration(effective_config: EffectiveConfig, duration: int) -> Optional[str]:
+    """检查禁言时长是否在允许范围内
     
-    # 检查禁言时长
+    Args:
+        effective_config: 该群的有效配置快照
+        duration: 禁言时长（秒）
+        
+    Returns:
+        Optional[str]: 不合法时返回错误提示，否则为 None
+    """
     if duration < 0:
         return "禁言时长不能为负数"
-    admin_config = get_admin_config()
-    max_duration = effective_config.get("MAX_MUTE_DURATION", admin_config.MAX_MUTE_DURATION)
+    max_duration = effective_config.get("MAX_MUTE_DURATION", get_admin_config().MAX_MUTE_DURATION)
     if duration > max_duration:
         return f"禁言时长不能超过 {max_duration // 86400} 天"
+    return None
+
+
+MUTE_USER_TOOL = AdminToolSpec(
+    "群管_禁言用户", scope_name="禁言", switch_key="ENABLE_MUTE", switch_name="禁言",
+    operation_name="禁言用户", required_level=PermissionLevel.ADMIN,
+)
+
+
+@plugin.mount_sandbox_method(
+    SandboxMethodType.TOOL,
+    name="群管_禁言用户",
+    description="禁言群成员指定时长，设置时长为0则解除禁言。注意：无法禁言群主。user_qq 可直接填写QQ号、群名片或昵称（纯数字一律视为QQ号）。权限检查模式下需提供requester_qq参数。",
+)
+async def admin_mute_user(_ctx: AgentCtx, user_qq: str, duration: int, report: str, requester_qq: Optional[str] = None) -> str:
+    """禁言群成员（需要管理员及以上权限）
     
-    try:
-        core.logger.info(f"[群管_禁言用户] 调用 OneBot API: set_group_ban(group_id={group_id}, user_id={user_qq}, duration={duration})")
+    Args:
+        user_qq (str): 被禁言用户的QQ号，也可以是群名片或昵称（自动匹配群成员）
+        duration (int): 禁言时长（秒），设置为0则解除禁言，最大30天
+        report (str): 禁言理由，需详细说明原因
+        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供，用于验证权限
+        
+    Returns:
+        str: 操作结果
+    """
+    async def mute(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        target_qq = invocation.target_qq
+        # 检查禁言时长
+        error = check_mute_duration(invocation.config, duration)
+        if error:
+            return error, None
+        
+        core.logger.info(f"[群管_禁言用户] 调用 OneBot API: set_group_ban(group_id={invocation.group_id}, user_id={target_qq}, duration={duration})")
         await get_bot().set_group_ban(
-            group_id=group_id,
-            user_id=int(user_qq),
+            group_id=invocation.group_id,
+            user_id=int(target_qq),
             duration=duration
         )
         
         action = "解除禁言" if duration == 0 else f"禁言 {duration} 秒"
-        result = f"已对用户 {user_qq} 执行{action}"
+        return f"已对用户 {target_qq} 执行{action}", f"目标: {target_qq}\n时长: {duration}秒"
+    
+    return await run_admin_tool(_ctx, MUTE_USER_TOOL, report, requester_qq, mute, target_qq=user_qq)
+
+
+BULK_MUTE_TOOL = AdminToolSpec(
+    "群管_批量禁言", scope_name="禁言", switch_key="ENABLE_MUTE", switch_name="禁言",
+    operation_name="批量禁言", required_level=PermissionLevel.ADMIN,
+)
+
+
+@plugin.mount_sandbox_method(
+    SandboxMethodType.TOOL,
+    name="群管_批量禁言",
+    description=f"一次禁言多个群成员（如处理刷屏、炸群账号），设置时长为0则批量解除禁言，单次最多{BULK_MAX_TARGETS}人。返回每个用户的结果。权限检查模式下需提供requester_qq参数。",
+)
+async def admin_bulk_mute(
+    _ctx: AgentCtx,
+    user_qqs: List[str],
+    duration: int,
+    report: str,
+    requester_qq: Optional[str] = None
+) -> str:
+    """批量禁言群成员（需要管理员及以上权限）
+    
+    Args:
+        user_qqs (List[str]): 被禁言用户的QQ号列表
+        duration (int): 禁言时长（秒），设置为0则解除禁言，最大30天
+        report (str): 禁言理由，需详细说明原因
+        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
+        
+    Returns:
+        str: 每个用户的操作结果
+    """
+    async def bulk_mute(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        error = check_mute_duration(invocation.config, duration)
+        if error:
+            return error, None
         
-        await send_admin_report(_ctx, "禁言用户", f"目标: {user_qq}\n时长: {duration}秒\n理由: {report}")
-        core.logger.info(f"[群{chat_id}] {result}，理由: {report}")
+        bot = get_bot()
         
-        return result
-    except Exception as e:
-        core.logger.error(f"禁言用户失败: {e}", exc_info=True)
-        return f"禁言用户失败: {e}"
+        async def mute_one(qq: str) -> None:
+            await bot.set_group_ban(group_id=invocation.group_id, user_id=int(qq), duration=duration)
+        
+        return await run_bulk_target_action(
+            invocation, requester_qq, user_qqs, mute_one, details=f"时长: {duration}秒",
+        )
+    
+    return await run_admin_tool(_ctx, BULK_MUTE_TOOL, report, requester_qq, bulk_mute)
+
+
+MUTE_ALL_TOOL = AdminToolSpec(
+    "群管_全体禁言", scope_name="全体禁言", switch_key="ENABLE_MUTE_ALL", switch_name="全体禁言",
+    operation_name="全体禁言", required_level=PermissionLevel.ADMIN, error_name="全体禁言操作失败",
+)
 
 
 @plugin.mount_sandbox_method(
@@ -837,164 +1697,153 @@ async def admin_mute_all(_ctx: AgentCtx, enable: bool, report: str, requester_qq
     Returns:
         str: 操作结果
     """
-    chat_type, chat_id = parse_chat_key(_ctx)
-    
-    if chat_type != ChatType.GROUP.value:
-        return f"全体禁言功能仅支持群聊，当前频道类型: {chat_type}"
-    
-    group_id = int(chat_id)
-    
-    # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
-    
-    # 检查功能开关
-    if not effective_config.get("ENABLE_MUTE_ALL"):
-        return "全体禁言功能未开启，无法执行此操作"
-    
-    # 全体禁言只检查操作者权限，不针对特定用户
-    can_operate, msg = await check_requester_permission(
-        group_id, requester_qq, PermissionLevel.ADMIN, "全体禁言"
-    )
-    if not can_operate:
-        return msg
-    
-    try:
-        await get_bot().set_group_whole_ban(group_id=group_id, enable=enable)
+    async def mute_all(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        await get_bot().set_group_whole_ban(group_id=invocation.group_id, enable=enable)
         
         action = "开启" if enable else "关闭"
-        result = f"已{action}全体禁言"
-        
-        await send_admin_report(_ctx, "全体禁言", f"操作: {action}\n理由: {report}")
-        core.logger.info(f"[群{chat_id}] {result}，理由: {report}")
-        
-        return result
-    except Exception as e:
-        core.logger.error(f"全体禁言操作失败: {e}")
-        return f"全体禁言操作失败: {e}"
+        return f"已{action}全体禁言", f"操作: {action}"
+    
+    # 全体禁言只检查操作者权限，不针对特定用户
+    return await run_admin_tool(_ctx, MUTE_ALL_TOOL, report, requester_qq, mute_all)
+
+
+KICK_USER_TOOL = AdminToolSpec(
+    "群管_踢出成员", scope_name="踢人", switch_key="ENABLE_KICK", switch_name="踢人",
+    operation_name="踢出成员", required_level=PermissionLevel.ADMIN,
+)
 
 
 @plugin.mount_sandbox_method(
     SandboxMethodType.TOOL,
     name="群管_踢出成员",
-    description="将成员踢出群聊。权限检查模式下需提供requester_qq参数。",
+    description="将成员踢出群聊。user_qq 可直接填写QQ号、群名片或昵称（纯数字一律视为QQ号）。权限检查模式下需提供requester_qq参数。",
 )
 async def admin_kick_user(_ctx: AgentCtx, user_qq: str, report: str, requester_qq: Optional[str] = None) -> str:
     """踢出群成员（需要管理员及以上权限）
     
     Args:
-        user_qq (str): 被踢出用户的QQ号
+        user_qq (str): 被踢出用户的QQ号，也可以是群名片或昵称（自动匹配群成员）
         report (str): 踢出理由，需详细说明原因
         requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
         
     Returns:
         str: 操作结果
     """
-    chat_type, chat_id = parse_chat_key(_ctx)
-    
-    if chat_type != ChatType.GROUP.value:
-        return f"踢人功能仅支持群聊，当前频道类型: {chat_type}"
-    
-    group_id = int(chat_id)
-    
-    # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
-    
-    # 检查功能开关
-    if not effective_config.get("ENABLE_KICK"):
-        return "踢人功能未开启，无法执行此操作"
-    
-    # 权限检查
-    can_operate, msg = await check_permission(
-        _ctx, group_id, user_qq,
-        PermissionLevel.ADMIN, "踢出成员", requester_qq
-    )
-    if not can_operate:
-        return msg
-    
-    try:
+    async def kick(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        target_qq = invocation.target_qq
         await get_bot().set_group_kick(
-            group_id=group_id,
-            user_id=int(user_qq),
+            group_id=invocation.group_id,
+            user_id=int(target_qq),
             reject_add_request=False
         )
-        
-        result = f"已将用户 {user_qq} 踢出群聊"
-        
-        await send_admin_report(_ctx, "踢出成员", f"目标: {user_qq}\n理由: {report}")
-        core.logger.info(f"[群{chat_id}] {result}，理由: {report}")
-        
-        return result
-    except Exception as e:
-        core.logger.error(f"踢出成员失败: {e}")
-        return f"踢出成员失败: {e}"
+        return f"已将用户 {target_qq} 踢出群聊", f"目标: {target_qq}"
+    
+    return await run_admin_tool(_ctx, KICK_USER_TOOL, report, requester_qq, kick, target_qq=user_qq)
+
+
+KICK_AND_BAN_TOOL = AdminToolSpec(
+    "群管_踢出并拉黑", scope_name="踢人", switch_key="ENABLE_KICK_AND_BAN", switch_name="踢出并拉黑",
+    operation_name="踢出并拉黑", required_level=PermissionLevel.ADMIN,
+)
 
 
 @plugin.mount_sandbox_method(
     SandboxMethodType.TOOL,
     name="群管_踢出并拉黑",
-    description="将成员踢出群聊并拉黑（禁止再次加群）。权限检查模式下需提供requester_qq参数。",
+    description="将成员踢出群聊并拉黑（禁止再次加群）。user_qq 可直接填写QQ号、群名片或昵称（纯数字一律视为QQ号）。权限检查模式下需提供requester_qq参数。",
 )
 async def admin_kick_and_ban(_ctx: AgentCtx, user_qq: str, report: str, requester_qq: Optional[str] = None) -> str:
     """踢出并拉黑群成员（需要管理员及以上权限）
     
     Args:
-        user_qq (str): 被踢出用户的QQ号
+        user_qq (str): 被踢出用户的QQ号，也可以是群名片或昵称（自动匹配群成员）
         report (str): 踢出并拉黑的理由，需详细说明原因
         requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
         
     Returns:
         str: 操作结果
     """
-    chat_type, chat_id = parse_chat_key(_ctx)
-    
-    if chat_type != ChatType.GROUP.value:
-        return f"踢人功能仅支持群聊，当前频道类型: {chat_type}"
-    
-    group_id = int(chat_id)
-    
-    # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
-    
-    # 检查功能开关
-    if not effective_config.get("ENABLE_KICK_AND_BAN"):
-        return "踢出并拉黑功能未开启，无法执行此操作"
-    
-    # 权限检查
-    can_operate, msg = await check_permission(
-        _ctx, group_id, user_qq,
-        PermissionLevel.ADMIN, "踢出并拉黑", requester_qq
-    )
-    if not can_operate:
-        return msg
-    
-    try:
+    async def kick_and_ban(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        target_qq = invocation.target_qq
         await get_bot().set_group_kick(
-            group_id=group_id,
-            user_id=int(user_qq),
+            group_id=invocation.group_id,
+            user_id=int(target_qq),
             reject_add_request=True
         )
+        return f"已将用户 {target_qq} 踢出群聊并拉黑", f"目标: {target_qq}"
+    
+    return await run_admin_tool(_ctx, KICK_AND_BAN_TOOL, report, requester_qq, kick_and_ban, target_qq=user_qq)
+
+
+BULK_KICK_TOOL = AdminToolSpec(
+    "群管_批量踢出", scope_name="踢人", switch_key="ENABLE_KICK", switch_name="踢人",
+    operation_name="批量踢出", required_level=PermissionLevel.ADMIN,
+)
+# 群管_批量踢出 的拉黑模式使用独立的开关与操作名称，日志和耗时统计中单独列出
+BULK_KICK_AND_BAN_TOOL = AdminToolSpec(
+    "群管_批量踢出并拉黑", scope_name="踢人", switch_key="ENABLE_KICK_AND_BAN", switch_name="踢出并拉黑",
+    operation_name="批量踢出并拉黑", required_level=PermissionLevel.ADMIN,
+)
+
+
+@plugin.mount_sandbox_method(
+    SandboxMethodType.TOOL,
+    name="群管_批量踢出",
+    description=f"一次将多个成员踢出群聊（如清理炸群账号），可选同时拉黑（禁止再次加群），单次最多{BULK_MAX_TARGETS}人。返回每个用户的结果，部分失败时会列出失败原因。权限检查模式下需提供requester_qq参数。",
+)
+async def admin_bulk_kick(
+    _ctx: AgentCtx,
+    user_qqs: List[str],
+    report: str,
+    reject_add_request: bool = False,
+    requester_qq: Optional[str] = None
+) -> str:
+    """批量踢出群成员（需要管理员及以上权限）
+    
+    Args:
+        user_qqs (List[str]): 被踢出用户的QQ号列表
+        report (str): 踢出理由，需详细说明原因
+        reject_add_request (bool): 是否同时拉黑（拒绝再次加群），需开启踢出并拉黑功能
+        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
         
-        result = f"已将用户 {user_qq} 踢出群聊并拉黑"
-        
-        await send_admin_report(_ctx, "踢出并拉黑", f"目标: {user_qq}\n理由: {report}")
-        core.logger.info(f"[群{chat_id}] {result}，理由: {report}")
-        
-        return result
-    except Exception as e:
-        core.logger.error(f"踢出并拉黑失败: {e}")
-        return f"踢出并拉黑失败: {e}"
+    Returns:
+        str: 每个用户的操作结果
+    """
+    async def bulk_kick(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        bot = get_bot()
+        
+        async def kick_one(qq: str) -> None:
+            await bot.set_group_kick(
+                group_id=invocation.group_id,
+                user_id=int(qq),
+                reject_add_request=reject_add_request
+            )
+        
+        return await run_bulk_target_action(
+            invocation, requester_qq, user_qqs, kick_one,
+            details=f"拉黑: {'是' if reject_add_request else '否'}",
+        )
+    
+    spec = BULK_KICK_AND_BAN_TOOL if reject_add_request else BULK_KICK_TOOL
+    return await run_admin_tool(_ctx, spec, report, requester_qq, bulk_kick)
+
+
+SET_CARD_TOOL = AdminToolSpec(
+    "群管_修改群昵称", scope_name="修改群昵称", switch_key="ENABLE_SET_CARD", switch_name="修改群昵称",
+    operation_name="修改群昵称", required_level=PermissionLevel.ADMIN,
+)
 
 
 @plugin.mount_sandbox_method(
     SandboxMethodType.TOOL,
     name="群管_修改群昵称",
-    description="修改群成员的群昵称（群名片）。权限检查模式下需提供requester_qq参数。",
+    description="修改群成员的群昵称（群名片）。user_qq 可直接填写QQ号、群名片或昵称（纯数字一律视为QQ号）。权限检查模式下需提供requester_qq参数。",
 )
 async def admin_set_group_card(_ctx: AgentCtx, user_qq: str, card: str, report: str, requester_qq: Optional[str] = None) -> str:
     """修改群成员昵称（需要管理员及以上权限）
     
     Args:
-        user_qq (str): 目标用户的QQ号
+        user_qq (str): 目标用户的QQ号，也可以是群名片或昵称（自动匹配群成员）
         card (str): 新的群昵称，留空则删除群昵称
         report (str): 修改理由
         requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
@@ -1002,57 +1851,36 @@ async def admin_set_group_card(_ctx: AgentCtx, user_qq: str, card: str, report:
     Returns:
         str: 操作结果
     """
-    chat_type, chat_id = parse_chat_key(_ctx)
-    
-    if chat_type != ChatType.GROUP.value:
-        return f"修改群昵称功能仅支持群聊，当前频道类型: {chat_type}"
-    
-    group_id = int(chat_id)
-    
-    # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
-    
-    # 检查功能开关
-    if not effective_config.get("ENABLE_SET_CARD"):
-        return "修改群昵称功能未开启，无法执行此操作"
-    
-    # 权限检查
-    can_operate, msg = await check_permission(
-        _ctx, group_id, user_qq,
-        PermissionLevel.ADMIN, "修改群昵称", requester_qq
-    )
-    if not can_operate:
-        return msg
-    
-    try:
+    async def set_card(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        target_qq = invocation.target_qq
         await get_bot().set_group_card(
-            group_id=group_id,
-            user_id=int(user_qq),
+            group_id=invocation.group_id,
+            user_id=int(target_qq),
             card=card
         )
         
         action = f"修改为 '{card}'" if card else "清空"
-        result = f"已将用户 {user_qq} 的群昵称{action}"
-        
-        await send_admin_report(_ctx, "修改群昵称", f"目标: {user_qq}\n新昵称: {card or '(空)'}\n理由: {report}")
-        core.logger.info(f"[群{chat_id}] {result}，理由: {report}")
-        
-        return result
-    except Exception as e:
-        core.logger.error(f"修改群昵称失败: {e}")
-        return f"修改群昵称失败: {e}"
+        return f"已将用户 {target_qq} 的群昵称{action}", f"目标: {target_qq}\n新昵称: {card or '(空)'}"
+    
+    return await run_admin_tool(_ctx, SET_CARD_TOOL, report, requester_qq, set_card, target_qq=user_qq)
+
+
+SET_TITLE_TOOL = AdminToolSpec(
+    "群管_设置专属头衔", scope_name="设置头衔", switch_key="ENABLE_SET_TITLE", switch_name="设置头衔",
+    operation_name="设置专属头衔", required_level=PermissionLevel.OWNER,
+)
 
 
 @plugin.mount_sandbox_method(
     SandboxMethodType.TOOL,
     name="群管_设置专属头衔",
-    description="设置群成员的专属头衔（仅群主可操作）。权限检查模式下需提供requester_qq参数。",
+    description="设置群成员的专属头衔（仅群主可操作）。user_qq 可直接填写QQ号、群名片或昵称（纯数字一律视为QQ号）。权限检查模式下需提供requester_qq参数。",
 )
 async def admin_set_special_title(_ctx: AgentCtx, user_qq: str, title: str, report: str, requester_qq: Optional[str] = None) -> str:
     """设置专属头衔（仅群主可操作）
     
     Args:
-        user_qq (str): 目标用户的QQ号
+        user_qq (str): 目标用户的QQ号，也可以是群名片或昵称（自动匹配群成员）
         title (str): 新的专属头衔，留空则删除头衔
         report (str): 设置理由
         requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
@@ -1060,58 +1888,38 @@ async def admin_set_special_title(_ctx: AgentCtx, user_qq: str, title: str, repo
     Returns:
         str: 操作结果
     """
-    chat_type, chat_id = parse_chat_key(_ctx)
-    
-    if chat_type != ChatType.GROUP.value:
-        return f"设置头衔功能仅支持群聊，当前频道类型: {chat_type}"
-    
-    group_id = int(chat_id)
-    
-    # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
-    
-    # 检查功能开关
-    if not effective_config.get("ENABLE_SET_TITLE"):
-        return "设置头衔功能未开启，无法执行此操作"
-    
-    # 权限检查 - 设置头衔需要群主权限
-    can_operate, msg = await check_permission(
-        _ctx, group_id, user_qq,
-        PermissionLevel.OWNER, "设置专属头衔", requester_qq
-    )
-    if not can_operate:
-        return msg
-    
-    try:
+    async def set_title(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        target_qq = invocation.target_qq
         await get_bot().set_group_special_title(
-            group_id=group_id,
-            user_id=int(user_qq),
+            group_id=invocation.group_id,
+            user_id=int(target_qq),
             special_title=title,
             duration=-1  # 永久
         )
         
         action = f"设置为 '{title}'" if title else "清空"
-        result = f"已将用户 {user_qq} 的专属头衔{action}"
-        
-        await send_admin_report(_ctx, "设置专属头衔", f"目标: {user_qq}\n新头衔: {title or '(空)'}\n理由: {report}")
-        core.logger.info(f"[群{chat_id}] {result}，理由: {report}")
-        
-        return result
-    except Exception as e:
-        core.logger.error(f"设置专属头衔失败: {e}")
-        return f"设置专属头衔失败: {e}"
+        return f"已将用户 {target_qq} 的专属头衔{action}", f"目标: {target_qq}\n新头衔: {title or '(空)'}"
+    
+    # 设置头衔需要群主权限
+    return await run_admin_tool(_ctx, SET_TITLE_TOOL, report, requester_qq, set_title, target_qq=user_qq)
+
+
+SET_ADMIN_TOOL = AdminToolSpec(
+    "群管_设置管理员", scope_name="设置管理员", switch_key="ENABLE_SET_ADMIN", switch_name="设置管理员",
+    operation_name="设置管理员", required_level=PermissionLevel.OWNER,
+)
 
 
 @plugin.mount_sandbox_method(
     SandboxMethodType.TOOL,
     name="群管_设置管理员",
-    description="设置或取消群管理员（仅群主可操作）。权限检查模式下需提供requester_qq参数。",
+    description="设置或取消群管理员（仅群主可操作）。user_qq 可直接填写QQ号、群名片或昵称（纯数字一律视为QQ号）。权限检查模式下需提供requester_qq参数。",
 )
 async def admin_set_admin(_ctx: AgentCtx, user_qq: str, enable: bool, report: str, requester_qq: Optional[str] = None) -> str:
     """设置或取消管理员（仅群主可操作）
     
     Args:
-        user_qq (str): 目标用户的QQ号
+        user_qq (str): 目标用户的QQ号，也可以是群名片或昵称（自动匹配群成员）
         enable (bool): True设置为管理员，False取消管理员
         report (str): 操作理由
         requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
@@ -1119,49 +1927,29 @@ async def admin_set_admin(_ctx: AgentCtx, user_qq: str, enable: bool, report: st
     Returns:
         str: 操作结果
     """
-    chat_type, chat_id = parse_chat_key(_ctx)
-    
-    if chat_type != ChatType.GROUP.value:
-        return f"设置管理员功能仅支持群聊，当前频道类型: {chat_type}"
-    
-    group_id = int(chat_id)
-    
-    # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
-    
-    # 检查功能开关
-    if not effective_config.get("ENABLE_SET_ADMIN"):
-        return "设置管理员功能未开启，无法执行此操作"
-    
-    # 权限检查 - 设置管理员需要群主权限
-    can_operate, msg = await check_permission(
-        _ctx, group_id, user_qq,
-        PermissionLevel.OWNER, "设置管理员", requester_qq
-    )
-    if not can_operate:
-        return msg
-    
-    try:
+    async def set_admin(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        target_qq = invocation.target_qq
         await get_bot().set_group_admin(
-            group_id=group_id,
-            user_id=int(user_qq),
+            group_id=invocation.group_id,
+            user_id=int(target_qq),
             enable=enable
         )
         
         action = "设置为管理员" if enable else "取消管理员"
-        result = f"已将用户 {user_qq} {action}"
-        
-        await send_admin_report(_ctx, "设置管理员", f"目标: {user_qq}\n操作: {action}\n理由: {report}")
-        core.logger.info(f"[群{chat_id}] {result}，理由: {report}")
-        
-        return result
-    except Exception as e:
-        core.logger.error(f"设置管理员失败: {e}")
-        return f"设置管理员失败: {e}"
+        return f"已将用户 {target_qq} {action}", f"目标: {target_qq}\n操作: {action}"
+    
+    # 设置管理员需要群主权限
+    return await run_admin_tool(_ctx, SET_ADMIN_TOOL, report, requester_qq, set_admin, target_qq=user_qq)
 
 
 # ============== 消息管理功能 ==============
 
+DELETE_MSG_TOOL = AdminToolSpec(
+    "群管_撤回消息", scope_name="撤回消息", switch_key="ENABLE_DELETE_MSG", switch_name="撤回消息",
+    operation_name="撤回消息", required_level=PermissionLevel.ADMIN,
+)
+
+
 @plugin.mount_sandbox_method(
     SandboxMethodType.TOOL,
     name="群管_撤回消息",
@@ -1178,39 +1966,18 @@ async def admin_delete_message(_ctx: AgentCtx, message_id: str, report: str, req
     Returns:
         str: 操作结果
     """
-    chat_type, chat_id = parse_chat_key(_ctx)
-    
-    if chat_type != ChatType.GROUP.value:
-        return f"撤回消息功能仅支持群聊，当前频道类型: {chat_type}"
-    
-    group_id = int(chat_id)
-    
-    # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
-    
-    # 检查功能开关
-    if not effective_config.get("ENABLE_DELETE_MSG"):
-        return "撤回消息功能未开启，无法执行此操作"
+    async def delete_message(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        await get_bot().delete_msg(message_id=int(message_id))
+        return f"已撤回消息 {message_id}", f"消息ID: {message_id}"
     
     # 撤回消息只检查操作者权限
-    can_operate, msg = await check_requester_permission(
-        group_id, requester_qq, PermissionLevel.ADMIN, "撤回消息"
-    )
-    if not can_operate:
-        return msg
-    
-    try:
-        await get_bot().delete_msg(message_id=int(message_id))
-        
-        result = f"已撤回消息 {message_id}"
-        
-        await send_admin_report(_ctx, "撤回消息", f"消息ID: {message_id}\n理由: {report}")
-        core.logger.info(f"[群{chat_id}] {result}，理由: {report}")
-        
-        return result
-    except Exception as e:
-        core.logger.error(f"撤回消息失败: {e}")
-        return f"撤回消息失败: {e}"
+    return await run_admin_tool(_ctx, DELETE_MSG_TOOL, report, requester_qq, delete_message)
+
+
+SET_ESSENCE_TOOL = AdminToolSpec(
+    "群管_设置精华消息", scope_name="设置精华", switch_key="ENABLE_SET_ESSENCE", switch_name="设置精华",
+    operation_name="设置精华消息", required_level=PermissionLevel.ADMIN, report_name="设置精华", error_name="设置精华失败",
+)
 
 
 @plugin.mount_sandbox_method(
@@ -1229,43 +1996,22 @@ async def admin_set_essence(_ctx: AgentCtx, message_id: str, report: str, reques
     Returns:
         str: 操作结果
     """
-    chat_type, chat_id = parse_chat_key(_ctx)
-    
-    if chat_type != ChatType.GROUP.value:
-        return f"设置精华功能仅支持群聊，当前频道类型: {chat_type}"
-    
-    group_id = int(chat_id)
-    
-    # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
-    
-    # 检查功能开关
-    if not effective_config.get("ENABLE_SET_ESSENCE"):
-        return "设置精华功能未开启，无法执行此操作"
+    async def set_essence(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        await get_bot().set_essence_msg(message_id=int(message_id))
+        return f"已将消息 {message_id} 设为精华", f"消息ID: {message_id}"
     
     # 设置精华只检查操作者权限
-    can_operate, msg = await check_requester_permission(
-        group_id, requester_qq, PermissionLevel.ADMIN, "设置精华消息"
-    )
-    if not can_operate:
-        return msg
-    
-    try:
-        await get_bot().set_essence_msg(message_id=int(message_id))
-        
-        result = f"已将消息 {message_id} 设为精华"
-        
-        await send_admin_report(_ctx, "设置精华", f"消息ID: {message_id}\n理由: {report}")
-        core.logger.info(f"[群{chat_id}] {result}，理由: {report}")
-        
-        return result
-    except Exception as e:
-        core.logger.error(f"设置精华失败: {e}")
-        return f"设置精华失败: {e}"
+    return await run_admin_tool(_ctx, SET_ESSENCE_TOOL, report, requester_qq, set_essence)
 
 
 # ============== 群设置功能 ==============
 
+SET_GROUP_NAME_TOOL = AdminToolSpec(
+    "群管_修改群名称", scope_name="修改群名", switch_key="ENABLE_SET_GROUP_NAME", switch_name="修改群名称",
+    operation_name="修改群名称", required_level=PermissionLevel.OWNER,
+)
+
+
 @plugin.mount_sandbox_method(
     SandboxMethodType.TOOL,
     name="群管_修改群名称",
@@ -1282,39 +2028,18 @@ async def admin_set_group_name(_ctx: AgentCtx, name: str, report: str, requester
     Returns:
         str: 操作结果
     """
-    chat_type, chat_id = parse_chat_key(_ctx)
-    
-    if chat_type != ChatType.GROUP.value:
-        return f"修改群名功能仅支持群聊，当前频道类型: {chat_type}"
-    
-    group_id = int(chat_id)
-    
-    # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
-    
-    # 检查功能开关
-    if not effective_config.get("ENABLE_SET_GROUP_NAME"):
-        return "修改群名称功能未开启，无法执行此操作"
+    async def set_group_name(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        await get_bot().set_group_name(group_id=invocation.group_id, group_name=name)
+        return f"已将群名称修改为 '{name}'", f"新群名: {name}"
     
     # 修改群名需要群主权限
-    can_operate, msg = await check_requester_permission(
-        group_id, requester_qq, PermissionLevel.OWNER, "修改群名称"
-    )
-    if not can_operate:
-        return msg
-    
-    try:
-        await get_bot().set_group_name(group_id=group_id, group_name=name)
-        
-        result = f"已将群名称修改为 '{name}'"
-        
-        await send_admin_report(_ctx, "修改群名称", f"新群名: {name}\n理由: {report}")
-        core.logger.info(f"[群{chat_id}] {result}，理由: {report}")
-        
-        return result
-    except Exception as e:
-        core.logger.error(f"修改群名称失败: {e}")
-        return f"修改群名称失败: {e}"
+    return await run_admin_tool(_ctx, SET_GROUP_NAME_TOOL, report, requester_qq, set_group_name)
+
+
+SET_GROUP_PORTRAIT_TOOL = AdminToolSpec(
+    "群管_修改群头像", scope_name="修改群头像", switch_key="ENABLE_SET_GROUP_PORTRAIT", switch_name="修改群头像",
+    operation_name="修改群头像", required_level=PermissionLevel.OWNER,
+)
 
 
 @plugin.mount_sandbox_method(
@@ -1333,39 +2058,18 @@ async def admin_set_group_portrait(_ctx: AgentCtx, file: str, report: str, reque
     Returns:
         str: 操作结果
     """
-    chat_type, chat_id = parse_chat_key(_ctx)
-    
-    if chat_type != ChatType.GROUP.value:
-        return f"修改群头像功能仅支持群聊，当前频道类型: {chat_type}"
-    
-    group_id = int(chat_id)
-    
-    # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
-    
-    # 检查功能开关
-    if not effective_config.get("ENABLE_SET_GROUP_PORTRAIT"):
-        return "修改群头像功能未开启，无法执行此操作"
+    async def set_group_portrait(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        await get_bot().set_group_portrait(group_id=invocation.group_id, file=file)
+        return "已修改群头像", f"图片: {file}"
     
     # 修改群头像需要群主权限
-    can_operate, msg = await check_requester_permission(
-        group_id, requester_qq, PermissionLevel.OWNER, "修改群头像"
-    )
-    if not can_operate:
-        return msg
-    
-    try:
-        await get_bot().set_group_portrait(group_id=group_id, file=file)
-        
-        result = "已修改群头像"
-        
-        await send_admin_report(_ctx, "修改群头像", f"图片: {file}\n理由: {report}")
-        core.logger.info(f"[群{chat_id}] {result}，理由: {report}")
-        
-        return result
-    except Exception as e:
-        core.logger.error(f"修改群头像失败: {e}")
-        return f"修改群头像失败: {e}"
+    return await run_admin_tool(_ctx, SET_GROUP_PORTRAIT_TOOL, report, requester_qq, set_group_portrait)
+
+
+SEND_NOTICE_TOOL = AdminToolSpec(
+    "群管_发布群公告", scope_name="发布群公告", switch_key="ENABLE_SEND_NOTICE", switch_name="发布群公告",
+    operation_name="发布群公告", required_level=PermissionLevel.ADMIN,
+)
 
 
 @plugin.mount_sandbox_method(
@@ -1384,39 +2088,12 @@ async def admin_send_group_notice(_ctx: AgentCtx, content: str, report: str, req
     Returns:
         str: 操作结果
     """
-    chat_type, chat_id = parse_chat_key(_ctx)
-    
-    if chat_type != ChatType.GROUP.value:
-        return f"发布群公告功能仅支持群聊，当前频道类型: {chat_type}"
-    
-    group_id = int(chat_id)
-    
-    # 获取该群的有效配置
-    effective_config = await get_effective_config(group_id)
-    
-    # 检查功能开关
-    if not effective_config.get("ENABLE_SEND_NOTICE"):
-        return "发布群公告功能未开启，无法执行此操作"
+    async def send_group_notice(invocation: ToolInvocation) -> tuple[str, Optional[str]]:
+        await get_bot()._send_group_notice(group_id=invocation.group_id, content=content)
+        return "已发布群公告", f"内容: {content}"
     
     # 发布群公告需要管理员权限
-    can_operate, msg = await check_requester_permission(
-        group_id, requester_qq, PermissionLevel.ADMIN, "发布群公告"
-    )
-    if not can_operate:
-        return msg
-    
-    try:
-        await get_bot()._send_group_notice(group_id=group_id, content=content)
-        
-        result = "已发布群公告"
-        
-        await send_admin_report(_ctx, "发布群公告", f"内容: {content}\n理由: {report}")
-        core.logger.info(f"[群{chat_id}] {result}，内容: {content}，理由: {report}")
-        
-        return result
-    except Exception as e:
-        core.logger.error(f"发布群公告失败: {e}")
-        return f"发布群公告失败: {e}"
+    return await run_admin_tool(_ctx, SEND_NOTICE_TOOL, report, requester_qq, send_group_notice)
 
 
 # ============== 分群配置管理功能 ==============
@@ -1449,20 +2126,25 @@ async def admin_view_group_config(
     effective_config = await get_effective_config(group_id)
     
     # 获取该群的单独配置
-    all_configs = await group_config_manager.list_group_configs()
-    group_key = str(group_id)
-    has_custom_config = group_key in all_configs
+    custom_config = group_config_manager.get_group_override(group_id)
+    has_custom_config = bool(custom_config)
     
     # 格式化输出
     result = f"=== 群{group_id}的群管配置 ===\n\n"
     
     if has_custom_config:
         result += "【配置状态】使用分群配置（优先级高于全局配置）\n"
-        custom_config = all_configs[group_key]
         result += f"【分群配置项】共 {len(custom_config)} 项\n"
     else:
         result += "【配置状态】使用全局默认配置（无单独配置）\n"
     
+    profile_name = effective_config.get(PROFILE_REF_KEY)
+    if profile_name:
+        if profile_name in group_config_manager.list_profiles():
+            result += f"【配置模板】{profile_name}\n"
+        else:
+            result += f"【配置模板】{profile_name}（模板不存在，未生效）\n"
+    
     result += "\n【当前有效配置】\n"
     result += f"  权限模式: {effective_config.get('PERMISSION_MODE', '未设置')}\n"
     result += f"  最大禁言时长: {effective_config.get('MAX_MUTE_DURATION', 0) // 86400} 天\n"
@@ -1498,6 +2180,483 @@ async def admin_view_group_config(
     return result
 
 
+def check_config_admin_permission(requester_qq: Optional[str], operation_name: str) -> tuple[bool, str]:
+    """检查跨群配置操作的权限（影响所有群，check_requester 模式下仅超级管理员可操作）
+    
+    Args:
+        requester_qq: 请求者QQ号
+        operation_name: 操作名称
+        
+    Returns:
+        tuple[bool, str]: (是否有权限, 提示信息)
+    """
+    sync_global_config()
+    global_config = group_config_manager.get_global_snapshot()
+    
+    # AI自主模式下不检查请求者权限
+    if global_config.get("PERMISSION_MODE") == "ai_autonomous":
+        return True, "AI自主模式"
+    
+    if not requester_qq:
+        return False, f"权限检查模式下需要提供请求者QQ（requester_qq参数），请让AI在调用时传入发起请求的用户QQ号"
+    
+    if normalize_id(requester_qq) not in global_config.id_set("SUPER_ADMINS"):
+        return False, f"权限不足：{operation_name}会影响所有群，仅超级管理员可操作"
+    
+    return True, "权限检查通过"
+
+
+async def check_scoped_admin_permission(
+    _ctx: AgentCtx,
+    requester_qq: Optional[str],
+    operation_name: str,
+    group_id: Optional[int] = None
+) -> Optional[str]:
+    """检查查看或维护群管状态的权限：群聊中针对当前群需要该群管理员权限，其他情况按跨群操作检查
+    
+    Args:
+        _ctx: 上下文
+        requester_qq: 请求者QQ号
+        operation_name: 操作名称
+        group_id: 操作的群号，不提供表示当前群
+    
+    Returns:
+        Optional[str]: 无权限时的提示信息，有权限时返回 None
+    """
+    chat_type, chat_id = parse_chat_key(_ctx)
+    if chat_type == ChatType.GROUP.value and (group_id is None or str(group_id) == chat_id):
+        decision = await check_requester_permission(int(chat_id), requester_qq, PermissionLevel.ADMIN, operation_name)
+        return None if decision.allowed else decision.message
+    
+    can_operate, msg = check_config_admin_permission(requester_qq, operation_name)
+    return None if can_operate else msg
+
+
+# 批量配置工具在读取配置与提交修改之间配置被其他操作改变时的提示
+CONFIG_CONFLICT_MESSAGE = "配置在操作期间被其他修改改变，本次未应用任何修改，请重新执行"
+
+# 批量配置工具的返回结果中最多列出的群号数量（管理报告中列出全部群号）
+GROUP_ID_DISPLAY_LIMIT = 20
+
+
+def format_group_ids(group_ids: list[str], limit: Optional[int] = None) -> str:
+    """格式化群号列表
+    
+    Args:
+        group_ids: 群号列表
+        limit: 最多列出的群号数量，为 None 时全部列出
+        
+    Returns:
+        以顿号分隔的群号，超出数量上限时注明总数
+    """
+    if limit is None or len(group_ids) <= limit:
+        return "、".join(group_ids)
+    return "、".join(group_ids[:limit]) + f" 等 {len(group_ids)} 个群"
+
+
+async def get_bot_group_ids() -> list[str]:
+    """获取bot所在的所有群号
+    
+    Returns:
+        群号字符串列表
+    """
+    group_list = await get_bot().get_group_list()
+    return [str(group.get("group_id")) for group in group_list if group.get("group_id")]
+
+
+@plugin.mount_sandbox_method(
+    SandboxMethodType.TOOL,
+    name="群管_全局同步所有群",
+    description="将全局配置同步到所有群：清除所有群的单独配置，使所有群都使用全局配置。权限检查模式下仅超级管理员可操作，需提供requester_qq参数。",
+)
+async def admin_sync_global_config(_ctx: AgentCtx, report: str, requester_qq: Optional[str] = None) -> str:
+    """全局同步所有群
+    
+    Args:
+        report (str): 操作理由
+        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
+        
+    Returns:
+        str: 操作结果
+    """
+    can_operate, msg = check_config_admin_permission(requester_qq, "全局同步所有群")
+    if not can_operate:
+        return msg
+    
+    start_time = time.perf_counter()
+    group_ids = group_config_manager.list_configured_groups()
+    try:
+        async with group_config_manager.transaction(group_config_manager.version, actor=requester_qq) as txn:
+            for group_id in group_ids:
+                txn.replace(group_id, {})
+    except ConfigConflictError:
+        return CONFIG_CONFLICT_MESSAGE
+    changed_groups = txn.changed_groups
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    
+    result = f"已将全局配置同步到所有群：{len(changed_groups)} 个群的单独配置已清除，耗时 {elapsed_ms:.1f}ms"
+    if changed_groups:
+        result += f"\n已清除单独配置的群: {format_group_ids(changed_groups, GROUP_ID_DISPLAY_LIMIT)}"
+    await send_admin_report(
+        _ctx, "全局同步所有群",
+        f"变更群数: {len(changed_groups)}\n变更群: {format_group_ids(changed_groups) or '无'}\n"
+        f"耗时: {elapsed_ms:.1f}ms\n理由: {report}"
+    )
+    core.logger.info(f"[群管配置] {result}，理由: {report}")
+    return result
+
+
+@plugin.mount_sandbox_method(
+    SandboxMethodType.TOOL,
+    name="群管_复制配置到所有群",
+    description="将指定群（默认当前群）的单独配置复制到bot所在的所有其他群，目标群原有的单独配置会被替换。来源群没有单独配置时不执行。默认不复制来源群引用的配置模板，需要时设置include_profile为true。权限检查模式下仅超级管理员可操作，需提供requester_qq参数。",
+)
+async def admin_copy_config_to_all_groups(
+    _ctx: AgentCtx,
+    report: str,
+    source_group_id: Optional[int] = None,
+    include_profile: bool = False,
+    requester_qq: Optional[str] = None
+) -> str:
+    """复制配置到所有群
+    
+    Args:
+        report (str): 操作理由
+        source_group_id (int, optional): 配置来源群号，不提供则使用当前群
+        include_profile (bool): 是否同时复制来源群引用的配置模板，默认不复制
+        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
+        
+    Returns:
+        str: 操作结果
+    """
+    if source_group_id is None:
+        chat_type, chat_id = parse_chat_key(_ctx)
+        if chat_type != ChatType.GROUP.value:
+            return "非群聊中使用时需要提供来源群号（source_group_id参数）"
+        source_group_id = int(chat_id)
+    
+    can_operate, msg = check_config_admin_permission(requester_qq, "复制配置到所有群")
+    if not can_operate:
+        return msg
+    
+    start_time = time.perf_counter()
+    source_config = group_config_manager.get_group_override(source_group_id)
+    expected_version = group_config_manager.version
+    if not include_profile:
+        source_config.pop(PROFILE_REF_KEY, None)
+    if not source_config:
+        # 用空配置整体替换会清除所有目标群的单独配置，这种操作应使用 群管_全局同步所有群
+        return f"来源群{source_group_id}没有单独配置，无需复制（如需清除所有群的单独配置请使用 群管_全局同步所有群）"
+    
+    try:
+        group_ids = await get_bot_group_ids()
+    except Exception as e:
+        core.logger.error(f"获取群组列表失败: {e}")
+        return f"获取群组列表失败: {e}"
+    
+    source_key = str(source_group_id)
+    target_ids = [group_id for group_id in group_ids if group_id != source_key]
+    try:
+        async with group_config_manager.transaction(expected_version, actor=requester_qq) as txn:
+            for group_id in target_ids:
+                txn.replace(group_id, source_config)
+    except ConfigConflictError:
+        return CONFIG_CONFLICT_MESSAGE
+    changed_groups = txn.changed_groups
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    
+    result = (
+        f"已将群{source_group_id}的配置（{len(source_config)}项）复制到 {len(target_ids)} 个群，"
+        f"其中 {len(changed_groups)} 个群的配置发生变化，耗时 {elapsed_ms:.1f}ms"
+    )
+    if changed_groups:
+        result += f"\n配置发生变化的群: {format_group_ids(changed_groups, GROUP_ID_DISPLAY_LIMIT)}"
+    await send_admin_report(
+        _ctx, "复制配置到所有群",
+        f"来源群: {source_group_id}\n复制配置: {source_config}\n目标群数: {len(target_ids)}\n"
+        f"变更群数: {len(changed_groups)}\n变更群: {format_group_ids(changed_groups) or '无'}\n"
+        f"耗时: {elapsed_ms:.1f}ms\n理由: {report}"
+    )
+    core.logger.info(f"[群管配置] {result}，理由: {report}")
+    return result
+
+
+@plugin.mount_sandbox_method(
+    SandboxMethodType.TOOL,
+    name="群管_设置配置模板",
+    description="创建或覆盖一个命名配置模板（如 strict、lenient），多个群可共享同一模板。配置项名称与分群配置相同。权限检查模式下仅超级管理员可操作，需提供requester_qq参数。",
+)
+async def admin_set_config_profile(
+    _ctx: AgentCtx,
+    profile_name: str,
+    config: dict[str, Any],
+    report: str,
+    requester_qq: Optional[str] = None
+) -> str:
+    """设置配置模板
+    
+    Args:
+        profile_name (str): 模板名称
+        config (dict): 模板配置，如 {"ENABLE_KICK": true, "ENABLE_MUTE_ALL": true}
+        report (str): 操作理由
+        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
+        
+    Returns:
+        str: 操作结果
+    """
+    can_operate, msg = check_config_admin_permission(requester_qq, "设置配置模板")
+    if not can_operate:
+        return msg
+    
+    profile_name = profile_name.strip()
+    if not profile_name:
+        return "模板名称不能为空"
+    
+    error = validate_config_values(config)
+    if error:
+        return error
+    
+    await group_config_manager.set_profile(profile_name, config, actor=requester_qq)
+    
+    result = f"已设置配置模板 '{profile_name}'（共 {len(config)} 项）"
+    await send_admin_report(_ctx, "设置配置模板", f"模板: {profile_name}\n配置: {config}\n理由: {report}")
+    core.logger.info(f"[群管配置] {result}，理由: {report}")
+    return result
+
+
+@plugin.mount_sandbox_method(
+    SandboxMethodType.TOOL,
+    name="群管_应用配置模板",
+    description="为一个或多个群指定配置模板（不提供群号则为当前群），模板名称留空则取消模板。配置优先级: 全局配置 < 模板 < 分群配置。权限检查模式下仅超级管理员可操作，需提供requester_qq参数。",
+)
+async def admin_assign_config_profile(
+    _ctx: AgentCtx,
+    profile_name: str,
+    report: str,
+    group_ids: Optional[List[int]] = None,
+    keep_overrides: bool = False,
+    requester_qq: Optional[str] = None
+) -> str:
+    """为群指定配置模板
+    
+    Args:
+        profile_name (str): 模板名称，留空则取消模板
+        report (str): 操作理由
+        group_ids (list[int], optional): 目标群号列表，不提供则为当前群
+        keep_overrides (bool): 是否保留各群原有的单独配置，默认不保留（各群只引用模板）
+        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
+        
+    Returns:
+        str: 操作结果
+    """
+    if not group_ids:
+        chat_type, chat_id = parse_chat_key(_ctx)
+        if chat_type != ChatType.GROUP.value:
+            return "非群聊中使用时需要提供目标群号（group_ids参数）"
+        group_ids = [int(chat_id)]
+    
+    can_operate, msg = check_config_admin_permission(requester_qq, "应用配置模板")
+    if not can_operate:
+        return msg
+    
+    profile_name = profile_name.strip()
+    if profile_name and profile_name not in group_config_manager.list_profiles():
+        return f"配置模板 '{profile_name}' 不存在，请先使用 群管_设置配置模板 创建"
+    
+    changed_count = await group_config_manager.assign_profile(
+        group_ids, profile_name or None, keep_overrides=keep_overrides, actor=requester_qq
+    )
+    
+    action = f"指定配置模板 '{profile_name}'" if profile_name else "取消配置模板"
+    result = f"已为 {len(group_ids)} 个群{action}，其中 {changed_count} 个群的配置发生变化"
+    await send_admin_report(
+        _ctx, "应用配置模板",
+        f"模板: {profile_name or '(取消)'}\n目标群数: {len(group_ids)}\n变更群数: {changed_count}\n理由: {report}"
+    )
+    core.logger.info(f"[群管配置] {result}，理由: {report}")
+    return result
+
+
+@plugin.mount_sandbox_method(
+    SandboxMethodType.TOOL,
+    name="群管_查看配置模板",
+    description="查看所有配置模板及其配置项和引用群数。权限检查模式下群聊中需要管理员权限，其他会话中仅超级管理员可查看，需提供requester_qq参数。",
+)
+async def admin_view_config_profiles(_ctx: AgentCtx, requester_qq: Optional[str] = None) -> str:
+    """查看配置模板
+    
+    Args:
+        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
+    
+    Returns:
+        str: 模板信息
+    """
+    error = await check_scoped_admin_permission(_ctx, requester_qq, "查看配置模板")
+    if error:
+        return error
+    
+    profiles = group_config_manager.list_profiles()
+    if not profiles:
+        return "暂无配置模板"
+    
+    usage = group_config_manager.count_profile_usage()
+    result = f"=== 配置模板（共 {len(profiles)} 个）===\n"
+    for name, profile_config in profiles.items():
+        result += f"\n【{name}】引用群数: {usage.get(name, 0)}\n"
+        for key, value in profile_config.items():
+            result += f"  {key}: {value}\n"
+    return result
+
+
+@plugin.mount_sandbox_method(
+    SandboxMethodType.TOOL,
+    name="群管_查看配置变更记录",
+    description="查看分群配置的变更记录（谁在什么时间修改了什么配置）。仅在分群配置存储方式为 journal 时记录。权限检查模式下查看当前群需要管理员权限，查看其他群或所有群仅超级管理员可操作，需提供requester_qq参数。",
+)
+async def admin_view_config_history(
+    _ctx: AgentCtx,
+    group_id: Optional[int] = None,
+    limit: int = 10,
+    requester_qq: Optional[str] = None
+) -> str:
+    """查看配置变更记录
+    
+    Args:
+        group_id: 群号，如果不提供则查看当前群（非群聊时查看所有群）
+        limit: 最多显示的记录数，默认10条
+        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
+        
+    Returns:
+        str: 变更记录
+    """
+    error = await check_scoped_admin_permission(_ctx, requester_qq, "查看配置变更记录", group_id)
+    if error:
+        return error
+    
+    if group_id is None:
+        chat_type, chat_id = parse_chat_key(_ctx)
+        if chat_type == ChatType.GROUP.value:
+            group_id = int(chat_id)
+    
+    limit = max(1, min(limit, 50))
+    history = await group_config_manager.get_change_history(group_id, limit)
+    if not history:
+        if get_admin_config().CONFIG_STORAGE != "journal":
+            return "当前分群配置存储方式不记录变更历史，如需记录请将存储方式设置为 journal"
+        return "暂无配置变更记录"
+    
+    scope = f"群{group_id}" if group_id is not None else "所有群"
+    result = f"=== {scope}最近 {len(history)} 条配置变更记录 ===\n"
+    for entry in history:
+        changed_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry.get("ts", 0)))
+        actor = entry.get("actor") or "未知"
+        target = entry.get("key") or "全部配置"
+        if entry.get("op") == "delete":
+            change = f"删除 {target}"
+        else:
+            change = f"{target}={entry.get('value')}"
+        result += f"  [{changed_at}] 群{entry.get('group')} {change}（操作人: {actor}）\n"
+    return result
+
+
+def format_cache_stats(name: str, stats: dict[str, Any]) -> str:
+    """格式化缓存统计信息
+    
+    Args:
+        name: 缓存名称
+        stats: LRUCache.stats() 返回的统计信息
+        
+    Returns:
+        str: 单行统计文本
+    """
+    return (
+        f"【{name}】{stats['size']}/{stats['max_entries']} 条，"
+        f"命中 {stats['hits']}，未命中 {stats['misses']}，命中率 {stats['hit_rate']:.1%}，"
+        f"淘汰 {stats['evictions']}，过期 {stats['expirations']}\n"
+    )
+
+
+@plugin.mount_sandbox_method(
+    SandboxMethodType.TOOL,
+    name="群管_查看缓存状态",
+    description="查看群管插件内部缓存的容量、命中率和淘汰情况，用于排查性能和内存问题。权限检查模式下群聊中需要管理员权限，其他会话中仅超级管理员可查看，需提供requester_qq参数。",
+)
+async def admin_view_cache_stats(_ctx: AgentCtx, requester_qq: Optional[str] = None) -> str:
+    """查看缓存状态
+    
+    Args:
+        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
+    
+    Returns:
+        str: 缓存统计信息
+    """
+    error = await check_scoped_admin_permission(_ctx, requester_qq, "查看缓存状态")
+    if error:
+        return error
+    
+    config_stats = group_config_manager.cache_stats()
+    result = "=== 群管缓存状态 ===\n"
+    result += format_cache_stats("有效配置快照", config_stats)
+    result += f"  共享快照数: {config_stats['interned']}\n"
+    result += format_cache_stats("群成员角色", member_role_cache.stats())
+    roster_stats = roster_cache.stats()
+    result += format_cache_stats("群成员名单", roster_stats)
+    result += (
+        f"  完整加载 {roster_stats['loads']} 次，增量更新 {roster_stats['incremental_updates']} 次，"
+        f"跨群索引用户 {roster_stats['indexed_users']} 人\n"
+    )
+    result += format_cache_stats("权限判断结果", permission_decision_cache.stats())
+    flight_stats = onebot_flight.stats()
+    result += (
+        f"【OneBot请求合并】实际请求 {flight_stats['calls']}，合并 {flight_stats['coalesced']}，"
+        f"进行中 {flight_stats['inflight']}\n"
+    )
+    if tool_timing_stats:
+        result += "【工具调用耗时】\n"
+        for tool_name, (count, total_seconds) in sorted(tool_timing_stats.items()):
+            result += f"  {tool_name}: {count} 次，平均 {total_seconds / count * 1000:.1f}ms\n"
+    if cache_warmup_state["ready"]:
+        result += f"【启动预热】已完成，预热 {cache_warmup_state['warmed']}/{cache_warmup_state['total']} 个群\n"
+    else:
+        result += f"【启动预热】进行中，已预热 {cache_warmup_state['warmed']}/{cache_warmup_state['total']} 个群\n"
+    return result
+
+
+@plugin.mount_sandbox_method(
+    SandboxMethodType.TOOL,
+    name="群管_刷新成员权限缓存",
+    description="丢弃指定群已缓存的成员角色（群主/管理员/成员）和成员名单，下次使用时重新获取。仅在发现权限判断或成员列表与群内实际情况不符时使用。权限检查模式下刷新当前群需要管理员权限，刷新其他群仅超级管理员可操作，需提供requester_qq参数。",
+)
+async def admin_refresh_member_roles(
+    _ctx: AgentCtx,
+    group_id: Optional[int] = None,
+    requester_qq: Optional[str] = None
+) -> str:
+    """刷新成员权限缓存
+    
+    Args:
+        group_id: 群号，如果不提供则为当前群
+        requester_qq (str, optional): 请求者的QQ号，权限检查模式下必须提供
+        
+    Returns:
+        str: 操作结果
+    """
+    if group_id is None:
+        chat_type, chat_id = parse_chat_key(_ctx)
+        if chat_type != ChatType.GROUP.value:
+            return "非群聊中使用时需要提供群号（group_id参数）"
+        group_id = int(chat_id)
+    
+    error = await check_scoped_admin_permission(_ctx, requester_qq, "刷新成员权限缓存", group_id)
+    if error:
+        return error
+    
+    member_role_cache.invalidate(group_id)
+    roster_cache.invalidate(group_id)
+    core.logger.info(f"[群管缓存] 已刷新群{group_id}的成员角色与成员名单缓存")
+    return f"已刷新群 {group_id} 的成员权限缓存，下次操作时将重新获取成员角色和成员名单"
+
+
 # ============== 动态收集可用方法 ==============
 
 @plugin.mount_collect_methods()
@@ -1507,11 +2666,9 @@ async def collect_available_methods(_ctx: AgentCtx):
     如果 ALLOW_GROUPS 为空，则所有方法都可用
     如果 ALLOW_GROUPS 不为空，则只有配置的群可以使用群管方法
     """
-    # 获取最新的配置
-    admin_config = get_admin_config()
-    
     # 如果 ALLOW_GROUPS 为空，所有方法都可用
-    if len(admin_config.ALLOW_GROUPS) == 0:
+    allow_groups = get_allow_groups()
+    if not allow_groups:
         return plugin.sandbox_methods  # 返回所有已注册的方法
 
     # 获取当前群 ID
@@ -1524,7 +2681,7 @@ async def collect_available_methods(_ctx: AgentCtx):
     group_id = chat_id
 
     # 检查当前群是否在允许列表中
-    if str(group_id) in admin_config.ALLOW_GROUPS:
+    if normalize_id(group_id) in allow_groups:
         return plugin.sandbox_methods  # 在允许列表中，所有方法都可用
 
     # 不在允许列表中，返回空列表
@@ -1533,14 +2690,165 @@ async def collect_available_methods(_ctx: AgentCtx):
 
 # ============== 初始化和清理方法 ==============
 
+async def handle_role_notice(event: NoticeEvent) -> None:
+    """根据群管理员变动、成员增减、群名片变更通知更新成员角色缓存与成员名单缓存"""
+    group_id = getattr(event, "group_id", None)
+    user_id = getattr(event, "user_id", None)
+    if group_id is None or user_id is None:
+        return
+    sub_type = getattr(event, "sub_type", None)
+    self_id = str(event.self_id)
+    if event.notice_type != "group_card":
+        updated = member_role_cache.handle_notice(
+            event.notice_type, sub_type, int(group_id), str(user_id), self_id=self_id,
+        )
+        if updated:
+            core.logger.debug(f"[群管缓存] 群{group_id}成员{user_id}角色缓存已按通知事件更新: {event.notice_type}")
+    try:
+        bot = get_bot()
+    except Exception:
+        bot = None
+    if roster_cache.handle_notice(
+        event.notice_type, sub_type, int(group_id), str(user_id), self_id=self_id,
+        card_new=getattr(event, "card_new", None), bot=bot,
+    ):
+        core.logger.debug(f"[群管缓存] 群{group_id}成员名单已按通知事件更新: {event.notice_type}")
+
+
+def create_role_notice_matcher() -> type[Matcher]:
+    """创建监听群通知事件的 matcher（不阻断事件传播）"""
+    
+    async def is_role_notice(event: NoticeEvent) -> bool:
+        return event.notice_type in ("group_admin", "group_decrease", "group_increase", "group_card")
+    
+    matcher = on_notice(rule=is_role_notice, priority=1, block=False)
+    matcher.append_handler(handle_role_notice)
+    return matcher
+
+
+# 启动预热的最大并发请求数
+WARMUP_CONCURRENCY = 8
+# 启动预热时加载完整成员名单的群数上限（其余群只获取 bot 角色），避免重启后集中拉取大量名单
+WARMUP_ROSTER_GROUPS = 16
+# 等待 bot 连接的重试次数与间隔（秒）
+WARMUP_CONNECT_RETRIES = 6
+WARMUP_CONNECT_INTERVAL = 10
+
+
+async def warm_up_caches() -> None:
+    """后台预热缓存：分群有效配置快照、bot 身份、bot 在各群内的角色以及成员名单
+    
+    优先预热 ALLOW_GROUPS 中的群和有单独配置的群，以有限并发请求 OneBot，避免重启后集中请求。
+    优先级最高的 WARMUP_ROSTER_GROUPS 个群（不超过成员名单缓存容量）加载完整成员名单，其余群只获取 bot 角色；
+    有效配置快照只预热不超过配置缓存容量的群，更多的快照只会被立即淘汰。
+    """
+    # bot 可能尚未连接，稍后重试
+    for attempt in range(WARMUP_CONNECT_RETRIES):
+        try:
+            bot = get_bot()
+            await bot_info_cache.get_self_id(bot)
+            all_group_ids = await get_bot_group_ids()
+            break
+        except Exception as e:
+            if attempt == WARMUP_CONNECT_RETRIES - 1:
+                core.logger.warning(f"[群管缓存] 启动预热失败，bot 未就绪: {e}")
+                cache_warmup_state["ready"] = True
+                return
+            await asyncio.sleep(WARMUP_CONNECT_INTERVAL)
+    
+    # 按优先级排序: ALLOW_GROUPS > 有单独配置的群 > 其他群
+    allow_groups = get_allow_groups()
+    configured_groups = set(group_config_manager.list_configured_groups())
+    ordered_group_ids = sorted(
+        set(all_group_ids),
+        key=lambda gid: (gid not in allow_groups, gid not in configured_groups),
+    )
+    if allow_groups:
+        # 设置了 ALLOW_GROUPS 时其他群不会使用群管功能，无需预热
+        ordered_group_ids = [gid for gid in ordered_group_ids if gid in allow_groups]
+    cache_warmup_state["total"] = len(ordered_group_ids)
+    
+    start_time = time.perf_counter()
+    semaphore = asyncio.Semaphore(WARMUP_CONCURRENCY)
+    
+    # 各类缓存分别按自身容量限制预热的群数
+    config_group_count = group_config_manager.cache_stats()["max_entries"]
+    # 优先级最高的群同时加载成员名单（包含 bot 自身角色），供跨群查找用户使用
+    roster_group_count = min(WARMUP_ROSTER_GROUPS, roster_cache.stats()["max_entries"])
+    
+    async def warm_group(group_id: int, index: int) -> None:
+        if index < config_group_count:
+            await get_effective_config(group_id)
+        async with semaphore:
+            try:
+                if index < roster_group_count:
+                    await roster_cache.get_roster(bot, group_id)
+                else:
+                    await bot_info_cache.get_group_role(bot, group_id)
+            except Exception as e:
+                core.logger.debug(f"[群管缓存] 预热群{group_id}的bot角色失败: {e}")
+                return
+        cache_warmup_state["warmed"] += 1
+    
+    await asyncio.gather(*(
+        warm_group(int(gid), index) for index, gid in enumerate(ordered_group_ids)
+    ))
+    cache_warmup_state["ready"] = True
+    core.logger.info(
+        f"[群管缓存] 启动预热完成，预热 {cache_warmup_state['warmed']}/{len(ordered_group_ids)} 个群，"
+        f"耗时 {time.perf_counter() - start_time:.2f}s"
+    )
+
+
 @plugin.mount_init_method()
 async def init():
     """插件初始化"""
-    pass
+    global role_notice_matcher
+    admin_config = get_admin_config()
+    
+    group_config_manager.configure_cache(admin_config.CONFIG_CACHE_SIZE, ttl=3600)
+    
+    # 按配置切换分群配置的存储后端
+    if admin_config.CONFIG_STORAGE == "sqlite":
+        # 先写入 JSON 存储中尚未保存的修改，保证迁移时拿到的是最新配置
+        await group_config_manager.flush()
+        try:
+            storage = await asyncio.to_thread(
+                open_sqlite_storage, GROUP_CONFIG_SQLITE_PATH, GROUP_CONFIG_JSON_PATH
+            )
+        except Exception as e:
+            core.logger.error(f"[群管配置] 打开 SQLite 存储失败，继续使用 JSON 文件存储: {e}")
+        else:
+            await group_config_manager.switch_storage(storage)
+    elif admin_config.CONFIG_STORAGE == "journal":
+        # 日志存储以 JSON 配置文件为快照，无需迁移
+        await group_config_manager.flush()
+        storage = await asyncio.to_thread(JournalConfigStorage, GROUP_CONFIG_JSON_PATH)
+        await group_config_manager.switch_storage(storage)
+    
+    # 监听群通知事件，保持成员角色缓存最新
+    if role_notice_matcher is None:
+        role_notice_matcher = create_role_notice_matcher()
+    
+    # 在后台预热缓存，不阻塞插件加载
+    cache_warmup_state.update(ready=False, warmed=0, total=0)
+    cache_warmup_state["task"] = asyncio.create_task(warm_up_caches())
 
 
 @plugin.mount_cleanup_method()
 async def clean_up():
     """清理插件资源"""
-    # 此插件不需要清理任何资源
-    pass
+    global role_notice_matcher
+    warmup_task = cache_warmup_state.get("task")
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    cache_warmup_state["task"] = None
+    
+    if role_notice_matcher is not None:
+        role_notice_matcher.destroy()
+        role_notice_matcher = None
+    bot_info_cache.clear()
+    permission_decision_cache.clear()
+    
+    # 将尚未写入的分群配置保存到存储，并释放存储后端资源
+    await group_config_manager.close()
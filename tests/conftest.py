@@ -0,0 +1,302 @@
+"""
+群管插件测试配置
+
+插件运行在 nekro-agent 中，测试环境通常没有安装 nekro_agent / nonebot / pydantic。
+这里在缺少这些宿主依赖时注册最小的替身模块，只提供插件导入和被测代码用到的接口；
+已安装时直接使用真实依赖。仓库根目录以 group_admin 包名加载（不执行 __init__.py，
+按需导入子模块），plugin 模块在临时工作目录中导入，避免在仓库中创建 data/ 目录。
+"""
+
+import asyncio
+import enum
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+import types
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+# ============== 宿主依赖替身 ==============
+
+def _module(name: str, **attrs: Any) -> types.ModuleType:
+    """创建并注册替身模块（同时注册各级父包）"""
+    parts = name.split(".")
+    for i in range(1, len(parts)):
+        parent = ".".join(parts[:i])
+        if parent not in sys.modules:
+            sys.modules[parent] = types.ModuleType(parent)
+            sys.modules[parent].__path__ = []
+    module = sys.modules.get(name) or types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    if len(parts) > 1:
+        setattr(sys.modules[".".join(parts[:-1])], parts[-1], module)
+    return module
+
+
+def _can_import(name: str) -> bool:
+    try:
+        importlib.import_module(name)
+        return True
+    except ImportError:
+        return False
+
+
+class FakeMessage:
+    """记录插件发送的消息"""
+    
+    sent: list[tuple[str, str]] = []
+
+    @staticmethod
+    async def send_text(chat_key: str, text: str, ctx: Any) -> None:
+        FakeMessage.sent.append((chat_key, text))
+
+
+class FakeNekroPlugin:
+    """只记录挂载内容的插件对象"""
+
+    def __init__(self, **kwargs: Any):
+        self.kwargs = kwargs
+        self.sandbox_methods: list = []
+        self.tools: dict[str, Any] = {}
+        self._config = None
+
+    def mount_config(self):
+        return lambda cls: cls
+
+    def get_config(self, cls):
+        if self._config is None:
+            self._config = cls()
+        return self._config
+
+    def mount_sandbox_method(self, method_type, name, description="", **kwargs):
+        def decorator(func):
+            self.sandbox_methods.append(func)
+            self.tools[name] = func
+            return func
+        return decorator
+
+    def _passthrough(self, *args, **kwargs):
+        return lambda func: func
+    
+    mount_prompt_inject_method = mount_collect_methods = _passthrough
+    mount_init_method = mount_cleanup_method = _passthrough
+
+
+class FakeAgentCtx:
+    def __init__(self, chat_key: str = "onebot_v11-group_100", channel_id: Optional[str] = None):
+        self.chat_key = chat_key
+        self.channel_id = channel_id if channel_id is not None else chat_key.split("-", 1)[-1]
+
+
+class FakeMatcher:
+    handlers: list = []
+
+    @classmethod
+    def append_handler(cls, handler):
+        cls.handlers.append(handler)
+
+    @classmethod
+    def destroy(cls):
+        pass
+
+
+_current_bot: list = [None]
+
+
+def _get_bot():
+    if _current_bot[0] is None:
+        raise RuntimeError("bot 未连接")
+    return _current_bot[0]
+
+
+def _install_host_fakes() -> None:
+    if not _can_import("nekro_agent"):
+        class ChatType(enum.Enum):
+            GROUP = "group"
+            PRIVATE = "private"
+
+        class SandboxMethodType(enum.Enum):
+            TOOL = "tool"
+            AGENT = "agent"
+            BEHAVIOR = "behavior"
+
+        class ExtraField:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+
+            def model_dump(self):
+                return self.kwargs
+        
+        _module("nekro_agent.api", core=types.SimpleNamespace(logger=logging.getLogger("group_admin")), message=FakeMessage)
+        _module(
+            "nekro_agent.api.plugin",
+            ConfigBase=type("ConfigBase", (), {}),
+            NekroPlugin=FakeNekroPlugin,
+            SandboxMethodType=SandboxMethodType,
+            ExtraField=ExtraField,
+        )
+        _module("nekro_agent.api.schemas", AgentCtx=FakeAgentCtx)
+        _module("nekro_agent.core.config", config=types.SimpleNamespace(ADMIN_CHAT_KEY=""))
+        _module("nekro_agent.schemas.chat_message", ChatType=ChatType)
+        _module("nekro_agent.adapters.onebot_v11.core.bot", get_bot=_get_bot)
+    
+    if not _can_import("nonebot"):
+        def on_notice(rule=None, priority=1, block=False):
+            return type("NoticeMatcher", (FakeMatcher,), {"handlers": [], "rule": rule})
+        
+        _module("nonebot.matcher", Matcher=FakeMatcher)
+        _module("nonebot", on_notice=on_notice)
+        _module("nonebot.adapters.onebot.v11", NoticeEvent=type("NoticeEvent", (), {}))
+    
+    if not _can_import("pydantic"):
+        _module("pydantic", Field=lambda default=None, **kwargs: default)
+
+
+_install_host_fakes()
+
+
+# 以 group_admin 包名注册仓库根目录，不执行 __init__.py（其中会导入 plugin）
+if "group_admin" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "group_admin", REPO_ROOT / "__init__.py", submodule_search_locations=[str(REPO_ROOT)]
+    )
+    sys.modules["group_admin"] = importlib.util.module_from_spec(_spec)
+
+
+# ============== OneBot 替身 ==============
+
+class FakeBot:
+    """记录调用的 OneBot 替身
+    
+    roles: (群号, QQ号字符串) -> 角色；members: 群号 -> 成员列表。
+    fail 中的 API 名称被调用时抛出对应异常。
+    """
+    
+    self_id = "10000"
+
+    def __init__(self, roles=None, members=None, fail=None):
+        self.roles: dict[tuple[int, str], str] = dict(roles or {})
+        self.members: dict[int, list[dict]] = dict(members or {})
+        self.fail: dict[str, Exception] = dict(fail or {})
+        self.calls: list[tuple[str, dict]] = []
+
+    def _record(self, name: str, **kwargs: Any) -> None:
+        self.calls.append((name, kwargs))
+        if name in self.fail:
+            raise self.fail[name]
+
+    def count(self, name: str) -> int:
+        return sum(1 for call_name, _ in self.calls if call_name == name)
+
+    async def get_login_info(self):
+        self._record("get_login_info")
+        return {"user_id": int(self.self_id)}
+
+    async def get_group_member_info(self, group_id, user_id, no_cache=False):
+        self._record("get_group_member_info", group_id=group_id, user_id=user_id)
+        for member in self.members.get(group_id, []):
+            if str(member["user_id"]) == str(user_id):
+                return member
+        if group_id in self.members and (group_id, str(user_id)) not in self.roles:
+            # 与真实 OneBot 一致：提供了成员名单的群中，不在群内的用户查询失败
+            raise RuntimeError(f"用户 {user_id} 不在群 {group_id} 中")
+        return {"user_id": user_id, "role": self.roles.get((group_id, str(user_id)), "member")}
+
+    async def get_group_member_list(self, group_id):
+        self._record("get_group_member_list", group_id=group_id)
+        return self.members.get(group_id, [])
+
+    async def get_group_list(self):
+        self._record("get_group_list")
+        return [{"group_id": group_id} for group_id in self.members]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        async def action(**kwargs):
+            self._record(name, **kwargs)
+            return {}
+        return action
+
+
+@pytest.fixture
+def run():
+    """在新的事件循环中运行协程"""
+    def runner(coro):
+        return asyncio.run(coro)
+    return runner
+
+
+@pytest.fixture(scope="session")
+def plugin_module(tmp_path_factory):
+    """在临时工作目录中导入 plugin 模块"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("plugin_cwd"))
+    try:
+        return importlib.import_module("group_admin.plugin")
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def plugin(plugin_module, tmp_path, monkeypatch):
+    """每个测试使用独立的配置管理器、插件配置和空缓存"""
+    from group_admin.config_manager import GroupConfigManager
+    
+    P = plugin_module
+    monkeypatch.setattr(P, "group_config_manager", GroupConfigManager(str(tmp_path / "group_configs.json")))
+    monkeypatch.setattr(P, "_synced_global_values", ())
+    monkeypatch.setattr(P, "_compiled_allow_groups", (None, frozenset()))
+    P.plugin._config = None
+    P.bot_info_cache.clear()
+    P.roster_cache.clear()
+    P.permission_decision_cache.clear()
+    yield P
+    P.bot_info_cache.clear()
+    P.roster_cache.clear()
+    P.permission_decision_cache.clear()
+    _current_bot[0] = None
+
+
+@pytest.fixture
+def set_bot():
+    """设置 get_bot() 返回的 bot"""
+    def setter(bot):
+        _current_bot[0] = bot
+        return bot
+    yield setter
+    _current_bot[0] = None
+
+
+@pytest.fixture
+def ctx():
+    return FakeAgentCtx()
+
+
+@pytest.fixture
+def check_mode(plugin):
+    """切换到 check_requester 权限模式，超级管理员为 9"""
+    admin_config = plugin.get_admin_config()
+    admin_config.PERMISSION_MODE = "check_requester"
+    admin_config.SUPER_ADMINS = ["9"]
+    return admin_config
+
+
+@pytest.fixture
+def admin_reports(plugin, monkeypatch):
+    """开启管理报告，返回记录已发送消息 (会话, 文本) 的列表"""
+    monkeypatch.setattr(plugin.config, "ADMIN_CHAT_KEY", "onebot_v11-private_9")
+    plugin.get_admin_config().ENABLE_ADMIN_REPORT = True
+    FakeMessage.sent.clear()
+    yield FakeMessage.sent
+    FakeMessage.sent.clear()
@@ -0,0 +1,159 @@
+import asyncio
+
+from conftest import FakeBot
+
+
+# 群100：bot 与 3、6 为管理员，7 为群主，其余为普通成员
+ROLES = {(100, "10000"): "admin", (100, "3"): "admin", (100, "6"): "admin", (100, "7"): "owner"}
+MEMBERS = {100: [
+    {"user_id": int(qq), "role": ROLES.get((100, str(qq)), "member")}
+    for qq in ("10000", "3", "5", "6", "7", "8", "9", "11")
+]}
+
+
+class PartialFailBot(FakeBot):
+    """对指定目标的操作失败或挂起的 OneBot 替身"""
+
+    def __init__(self, failing=(), hanging=(), delay=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.failing = {str(qq) for qq in failing}
+        self.hanging = {str(qq) for qq in hanging}
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    async def _act(self, name, **kwargs):
+        self._record(name, **kwargs)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            user_id = str(kwargs.get("user_id"))
+            if user_id in self.hanging:
+                await asyncio.sleep(3600)
+            await asyncio.sleep(self.delay)
+            if user_id in self.failing:
+                raise RuntimeError(f"retcode=102 用户 {user_id}")
+            return {}
+        finally:
+            self.active -= 1
+
+    async def set_group_ban(self, **kwargs):
+        return await self._act("set_group_ban", **kwargs)
+
+    async def set_group_kick(self, **kwargs):
+        return await self._act("set_group_kick", **kwargs)
+
+
+def _banned(bot):
+    return [call["user_id"] for name, call in bot.calls if name == "set_group_ban"]
+
+
+def test_bulk_mute_rejects_more_than_cap(plugin, set_bot, ctx, run):
+    bot = set_bot(FakeBot(roles=ROLES))
+    cap = plugin.BULK_MAX_TARGETS
+    
+    result = run(plugin.admin_bulk_mute(ctx, [str(qq) for qq in range(20000, 20001 + cap)], 60, "炸群"))
+    assert result == f"单次最多对 {cap} 个用户执行批量禁言，当前为 {cap + 1} 个"
+    assert _banned(bot) == []
+    
+    # 去重后不超过上限即可执行
+    targets = [str(qq) for qq in range(20000, 20000 + cap)]
+    result = run(plugin.admin_bulk_mute(ctx, targets + targets[:5], 60, "炸群"))
+    assert result.startswith(f"批量禁言: 共 {cap} 人，成功 {cap}，")
+
+
+def test_bulk_mute_deduplicates_targets(plugin, set_bot, ctx, run):
+    bot = set_bot(FakeBot(roles=ROLES))
+    
+    result = run(plugin.admin_bulk_mute(ctx, ["5", " 5", "5 ", "8", "8"], 60, "刷屏"))
+    assert result == "批量禁言: 共 2 人，成功 2，失败 0，无权限跳过 0"
+    assert sorted(_banned(bot)) == [5, 8]
+
+
+def test_bulk_mute_skips_admins_and_owner(plugin, check_mode, set_bot, ctx, admin_reports, run):
+    bot = set_bot(FakeBot(roles=ROLES, members=MEMBERS))
+    
+    result = run(plugin.admin_bulk_mute(ctx, ["5", "6", "7", "8"], 60, "刷屏", requester_qq="3"))
+    lines = result.splitlines()
+    assert lines[0] == "批量禁言: 共 4 人，成功 2，失败 0，无权限跳过 2"
+    assert "- 6 跳过: 无法对同级或更高权限的用户执行批量禁言（目标用户权限: 管理员）" in lines
+    assert "- 7 跳过: 无法对群主执行批量禁言（QQ协议限制：不能禁言/踢出群主）" in lines
+    assert sorted(_banned(bot)) == [5, 8]
+    assert "成功: 5, 8\n跳过: 6, 7" in admin_reports[-1][1]
+    
+    # 全部目标都无权限时不执行任何操作，也不发送报告
+    admin_reports.clear()
+    result = run(plugin.admin_bulk_mute(ctx, ["6", "7"], 60, "刷屏", requester_qq="3"))
+    assert result.startswith("批量禁言: 共 2 人，成功 0，失败 0，无权限跳过 2")
+    assert admin_reports == []
+
+
+def test_bulk_mute_aggregates_partial_failures(plugin, set_bot, ctx, admin_reports, run):
+    bot = set_bot(PartialFailBot(failing=["8", "9"], roles=ROLES))
+    
+    result = run(plugin.admin_bulk_mute(ctx, ["5", "8", "9", "11"], 60, "刷屏"))
+    lines = result.splitlines()
+    assert lines[0] == "批量禁言: 共 4 人，成功 2，失败 2，无权限跳过 0"
+    assert lines[1:] == ["- 8 失败: retcode=102 用户 8", "- 9 失败: retcode=102 用户 9"]
+    assert sorted(_banned(bot)) == [5, 8, 9, 11]
+    assert "成功: 5, 11\n失败: 8, 9" in admin_reports[-1][1]
+    
+    # 全部失败时不发送报告
+    admin_reports.clear()
+    result = run(plugin.admin_bulk_mute(ctx, ["8", "9"], 60, "刷屏"))
+    assert result.startswith("批量禁言: 共 2 人，成功 0，失败 2")
+    assert admin_reports == []
+
+
+def _enable_kick(plugin, run):
+    run(plugin.group_config_manager.set_multiple_group_config(100, {"ENABLE_KICK": True, "ENABLE_KICK_AND_BAN": True}))
+
+
+def test_bulk_kick_specs_have_distinct_names(plugin, set_bot, ctx, run, monkeypatch):
+    monkeypatch.setattr(plugin, "tool_timing_stats", {})
+    set_bot(FakeBot(roles=ROLES))
+    _enable_kick(plugin, run)
+    assert plugin.BULK_KICK_TOOL.name != plugin.BULK_KICK_AND_BAN_TOOL.name
+    
+    run(plugin.admin_bulk_kick(ctx, ["5"], "广告"))
+    run(plugin.admin_bulk_kick(ctx, ["8"], "广告", reject_add_request=True))
+    assert set(plugin.tool_timing_stats) == {"群管_批量踢出", "群管_批量踢出并拉黑"}
+
+
+def test_bulk_kick_times_out_each_call(plugin, set_bot, ctx, run, monkeypatch):
+    monkeypatch.setattr(plugin, "BULK_ACTION_TIMEOUT", 0.05)
+    bot = set_bot(PartialFailBot(hanging=["8"], roles=ROLES))
+    _enable_kick(plugin, run)
+    
+    result = run(plugin.admin_bulk_kick(ctx, ["5", "8", "9"], "广告"))
+    assert result.splitlines() == [
+        "批量踢出: 共 3 人，成功 2，失败 1，无权限跳过 0",
+        "- 8 失败: 请求超时（0.05秒），操作可能未生效",
+    ]
+    assert bot.count("set_group_kick") == 3
+
+
+def test_bulk_kick_limits_concurrency(plugin, set_bot, ctx, run):
+    bot = set_bot(PartialFailBot(delay=0.02, roles=ROLES))
+    _enable_kick(plugin, run)
+    targets = [str(qq) for qq in range(20000, 20012)]
+    
+    result = run(plugin.admin_bulk_kick(ctx, targets, "清理炸群账号"))
+    assert result == "批量踢出: 共 12 人，成功 12，失败 0，无权限跳过 0"
+    assert bot.max_active == plugin.BULK_ACTION_CONCURRENCY
+
+
+def test_bulk_kick_reports_mixed_results(plugin, check_mode, set_bot, ctx, admin_reports, run):
+    bot = set_bot(PartialFailBot(failing=["8"], roles=ROLES, members=MEMBERS))
+    _enable_kick(plugin, run)
+    
+    result = run(plugin.admin_bulk_kick(ctx, ["5", "6", "8", "11"], "广告", reject_add_request=True, requester_qq="3"))
+    assert result.splitlines() == [
+        "批量踢出并拉黑: 共 4 人，成功 2，失败 1，无权限跳过 1",
+        "- 8 失败: retcode=102 用户 8",
+        "- 6 跳过: 无法对同级或更高权限的用户执行批量踢出并拉黑（目标用户权限: 管理员）",
+    ]
+    kicked = [(call["user_id"], call["reject_add_request"]) for name, call in bot.calls if name == "set_group_kick"]
+    assert sorted(kicked) == [(5, True), (8, True), (11, True)]
+    report = admin_reports[-1][1]
+    assert "操作: 批量踢出并拉黑\n目标: 4 人\n成功: 5, 11\n失败: 8\n跳过: 6\n拉黑: 是\n理由: 广告" in report
@@ -0,0 +1,68 @@
+import asyncio
+import gc
+
+import pytest
+
+from group_admin.cache import SingleFlight
+
+
+def test_concurrent_calls_share_one_request(run):
+    flight = SingleFlight()
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"user_id": 1}
+    
+    async def scenario():
+        return await asyncio.gather(*(flight.do(("member", 1), fetch) for _ in range(5)))
+    
+    results = run(scenario())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"calls": 1, "coalesced": 4, "inflight": 0}
+    
+    # 请求完成后不再合并，之后的请求重新发起
+    run(scenario())
+    assert len(calls) == 2
+
+
+def test_exception_reaches_every_waiter(run):
+    flight = SingleFlight()
+    
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("onebot down")
+    
+    async def scenario():
+        return await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)), return_exceptions=True)
+    
+    results = run(scenario())
+    assert len(results) == 3
+    assert all(isinstance(result, RuntimeError) and str(result) == "onebot down" for result in results)
+    assert flight.stats()["inflight"] == 0
+
+
+def test_exception_without_waiters_is_retrieved(run):
+    flight = SingleFlight()
+    unretrieved = []
+    
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("onebot down")
+    
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda _, context: unretrieved.append(context))
+        waiter = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0.05)
+        gc.collect()
+    
+    run(scenario())
+    assert unretrieved == []
+    assert flight.stats()["inflight"] == 0
@@ -0,0 +1,45 @@
+from conftest import FakeAgentCtx, FakeBot
+
+
+# 群100：bot 与 3 为管理员，2 为普通成员
+ROLES = {(100, "10000"): "admin", (100, "3"): "admin", (100, "2"): "member"}
+
+
+def test_view_cache_stats_requires_admin(plugin, check_mode, set_bot, ctx, run):
+    set_bot(FakeBot(roles=ROLES))
+    
+    assert "权限不足" in run(plugin.admin_view_cache_stats(ctx, requester_qq="2"))
+    assert "群管缓存状态" in run(plugin.admin_view_cache_stats(ctx, requester_qq="3"))
+    private_ctx = FakeAgentCtx("onebot_v11-private_3")
+    assert "仅超级管理员" in run(plugin.admin_view_cache_stats(private_ctx, requester_qq="3"))
+    assert "群管缓存状态" in run(plugin.admin_view_cache_stats(private_ctx, requester_qq="9"))
+
+
+def test_refresh_other_group_requires_super_admin(plugin, check_mode, set_bot, ctx, run):
+    bot = set_bot(FakeBot(roles=ROLES, members={200: [{"user_id": 5, "role": "member"}]}))
+    run(plugin.roster_cache.get_roster(bot, 200))
+    assert plugin.roster_cache.stats()["size"] == 1
+    
+    assert "权限不足" in run(plugin.admin_refresh_member_roles(ctx, requester_qq="2"))
+    assert "已刷新群 100" in run(plugin.admin_refresh_member_roles(ctx, requester_qq="3"))
+    assert "仅超级管理员" in run(plugin.admin_refresh_member_roles(ctx, group_id=200, requester_qq="3"))
+    assert plugin.roster_cache.stats()["size"] == 1
+    
+    assert "已刷新群 200" in run(plugin.admin_refresh_member_roles(ctx, group_id=200, requester_qq="9"))
+    assert plugin.roster_cache.stats()["size"] == 0
+
+
+def test_warm_up_caps_each_cache_separately(plugin, set_bot, monkeypatch, run):
+    group_ids = range(100, 106)
+    bot = set_bot(FakeBot(members={gid: [{"user_id": 10000, "role": "admin"}] for gid in group_ids}))
+    monkeypatch.setattr(plugin, "WARMUP_ROSTER_GROUPS", 2)
+    monkeypatch.setattr(plugin, "cache_warmup_state", {"ready": False, "warmed": 0, "total": 0, "task": None})
+    plugin.group_config_manager.configure_cache(3)
+    
+    run(plugin.warm_up_caches())
+    
+    # 配置缓存容量小于群数时，成员名单和 bot 角色仍按各自的上限预热
+    assert bot.count("get_group_member_list") == 2
+    assert bot.count("get_group_member_info") == 4
+    assert plugin.group_config_manager.cache_stats()["size"] == 3
+    assert plugin.cache_warmup_state["warmed"] == plugin.cache_warmup_state["total"] == 6
@@ -0,0 +1,305 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+from conftest import FakeBot
+
+
+def test_reload_never_reuses_generations(tmp_path, run):
+    from group_admin.config_manager import GroupConfigManager
+    
+    path = tmp_path / "group_configs.json"
+    manager = GroupConfigManager(str(path))
+    run(manager.set_group_config(100, "ENABLE_KICK", True))
+    run(manager.flush())
+    before = manager.get_effective_snapshot(100).generation
+    untouched = manager.get_effective_snapshot(200).generation
+    
+    path.write_text(json.dumps({"100": {"ENABLE_KICK": False}}), encoding="utf-8")
+    assert run(manager.reload())
+    after = manager.get_effective_snapshot(100)
+    assert after["ENABLE_KICK"] is False
+    assert after.generation != before
+    assert manager.get_effective_snapshot(200).generation == untouched
+    
+    # 改回原内容后代数继续递增，不会与最初的快照重复
+    path.write_text(json.dumps({"100": {"ENABLE_KICK": True}}), encoding="utf-8")
+    assert run(manager.reload())
+    assert manager.get_effective_snapshot(100).generation not in (before, after.generation)
+
+
+def test_external_edit_invalidates_permission_decisions(plugin, check_mode, set_bot, ctx, run):
+    set_bot(FakeBot(roles={(100, "10000"): "admin", (100, "3"): "admin", (100, "5"): "member"}))
+    
+    decision = run(plugin.check_permission(ctx, 100, "5", plugin.PermissionLevel.ADMIN, "禁言", "3"))
+    assert decision.allowed
+    
+    manager = plugin.group_config_manager
+    manager.config_file_path.write_text(json.dumps({"100": {"PROTECTED_USERS": ["5"]}}), encoding="utf-8")
+    manager._last_reload_check = float("-inf")
+    
+    decision = run(plugin.check_permission(ctx, 100, "5", plugin.PermissionLevel.ADMIN, "禁言", "3"))
+    assert not decision.allowed
+    assert "受保护" in decision.message
+
+
+def test_global_config_in_place_mutation_is_seen(plugin):
+    admin_config = plugin.get_admin_config()
+    admin_config.SUPER_ADMINS = ["9"]
+    admin_config.ALLOW_GROUPS = ["100"]
+    assert plugin.get_super_admins() == {"9"}
+    assert plugin.get_allow_groups() == {"100"}
+    
+    admin_config.SUPER_ADMINS.append("8")
+    admin_config.ALLOW_GROUPS.append("200")
+    assert plugin.get_super_admins() == {"8", "9"}
+    assert plugin.get_allow_groups() == {"100", "200"}
+
+
+def _count_persists(manager, fail_times=0):
+    """包装存储后端的 persist，记录调用次数，前 fail_times 次抛出异常"""
+    calls = []
+    persist = manager._storage.persist
+    
+    def counting_persist(snapshot, changes):
+        calls.append(list(changes))
+        if len(calls) <= fail_times:
+            raise OSError("disk full")
+        persist(snapshot, changes)
+    
+    manager._storage.persist = counting_persist
+    return calls
+
+
+def test_writes_are_debounced_into_one_persist(tmp_path, run):
+    from group_admin.config_manager import GroupConfigManager
+    
+    path = tmp_path / "group_configs.json"
+    manager = GroupConfigManager(str(path))
+    manager._flush_delay = 0.05
+    calls = _count_persists(manager)
+    
+    async def scenario():
+        await manager.set_group_config(100, "ENABLE_KICK", True)
+        await manager.set_group_config(100, "ENABLE_MUTE", False)
+        await manager.set_multiple_group_config(200, {"MAX_MUTE_DURATION": 60})
+        # 防抖延迟内不写入
+        assert calls == []
+        await asyncio.sleep(0.2)
+    
+    run(scenario())
+    assert len(calls) == 1
+    assert len(calls[0]) == 3
+    assert json.loads(path.read_text(encoding="utf-8")) == {
+        "100": {"ENABLE_KICK": True, "ENABLE_MUTE": False},
+        "200": {"MAX_MUTE_DURATION": 60},
+    }
+    assert manager._flush_task is None
+
+
+def test_failed_background_write_is_retried(tmp_path, run):
+    from group_admin.config_manager import GroupConfigManager
+    
+    path = tmp_path / "group_configs.json"
+    manager = GroupConfigManager(str(path))
+    manager._flush_delay = 0.05
+    calls = _count_persists(manager, fail_times=1)
+    
+    async def scenario():
+        await manager.set_group_config(100, "ENABLE_KICK", True)
+        await asyncio.sleep(0.3)
+    
+    run(scenario())
+    assert len(calls) == 2
+    assert calls[1] == calls[0]
+    assert not manager._dirty
+    assert json.loads(path.read_text(encoding="utf-8")) == {"100": {"ENABLE_KICK": True}}
+
+
+def test_background_flush_exception_is_logged(tmp_path, run, caplog):
+    from group_admin.config_manager import GroupConfigManager
+    
+    manager = GroupConfigManager(str(tmp_path / "group_configs.json"))
+    
+    async def broken_flush():
+        raise RuntimeError("boom")
+    
+    manager.flush = broken_flush
+    
+    async def scenario():
+        manager._start_flush()
+        task = manager._flush_task
+        assert task is not None
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return task
+    
+    with caplog.at_level(logging.ERROR, logger="group_admin"):
+        task = run(scenario())
+    assert task.done()
+    assert manager._flush_task is None
+    assert any("boom" in record.getMessage() for record in caplog.records)
+
+
+def test_transaction_applies_all_operations_in_one_commit(tmp_path, run):
+    from group_admin.config_manager import GroupConfigManager
+    
+    manager = GroupConfigManager(str(tmp_path / "group_configs.json"))
+    run(manager.set_multiple_group_config(300, {"ENABLE_KICK": True}))
+    version = manager.version
+    
+    async def scenario():
+        async with manager.transaction(expected_version=version, actor="9") as txn:
+            txn.set(100, "ENABLE_KICK", True)
+            txn.replace(200, {"ENABLE_MUTE": False})
+            txn.replace(300, {"ENABLE_KICK": True})  # 内容不变
+            txn.delete(400)  # 没有单独配置
+        return txn
+    
+    txn = run(scenario())
+    assert txn.committed
+    assert txn.changed_groups == ["100", "200"]
+    assert txn.version == manager.version == version + 1
+    assert manager.get_group_override(100) == {"ENABLE_KICK": True}
+    assert manager.get_group_override(200) == {"ENABLE_MUTE": False}
+
+
+def test_stale_transaction_raises_and_applies_nothing(tmp_path, run):
+    from group_admin.config_manager import ConfigConflictError, GroupConfigManager
+    
+    path = tmp_path / "group_configs.json"
+    manager = GroupConfigManager(str(path))
+    
+    async def stale_commit(version):
+        async with manager.transaction(expected_version=version) as txn:
+            txn.set(100, "ENABLE_KICK", True)
+        return txn
+    
+    version = manager.version
+    run(manager.set_group_config(200, "ENABLE_MUTE", False))
+    with pytest.raises(ConfigConflictError) as excinfo:
+        run(stale_commit(version))
+    assert excinfo.value.current_version == manager.version
+    assert not manager.has_group_config(100)
+    
+    # 外部修改配置文件同样使旧版本的事务冲突
+    run(manager.flush())
+    version = manager.version
+    path.write_text(json.dumps({"300": {"ENABLE_KICK": False}}), encoding="utf-8")
+    manager._last_reload_check = float("-inf")
+    with pytest.raises(ConfigConflictError):
+        run(stale_commit(version))
+    assert manager.list_configured_groups() == ["300"]
+
+
+def test_setters_report_actual_changes(tmp_path, run):
+    from group_admin.config_manager import GroupConfigManager
+    
+    manager = GroupConfigManager(str(tmp_path / "group_configs.json"))
+    assert run(manager.set_group_config(100, "ENABLE_KICK", True)) is None
+    assert run(manager.delete_group_config(100, "ENABLE_MUTE")) is False
+    assert run(manager.delete_group_config(100, "ENABLE_KICK")) is True
+    assert run(manager.reset_group_config(100)) is False
+    assert run(manager.set_profile("strict", {"ENABLE_KICK": True})) is True
+    assert run(manager.set_profile("strict", {"ENABLE_KICK": True})) is False
+
+
+def test_copy_config_reports_concurrent_modification(plugin, ctx, set_bot, run):
+    set_bot(FakeBot(members={100: [], 200: [], 300: []}))
+    manager = plugin.group_config_manager
+    run(manager.set_group_config(100, "ENABLE_KICK", True))
+    
+    async def scenario():
+        # 复制工具读取来源配置后、提交前，另一个修改抢先提交
+        async with manager._lock:
+            task = asyncio.ensure_future(plugin.admin_copy_config_to_all_groups(ctx, "测试"))
+            await asyncio.sleep(0.01)
+            manager._apply_update("200", {"ENABLE_MUTE": False})
+            manager._commit()
+        return await task
+    
+    assert run(scenario()) == plugin.CONFIG_CONFLICT_MESSAGE
+    assert manager.get_group_override(200) == {"ENABLE_MUTE": False}
+    assert not manager.has_group_config(300)
+
+
+def test_reload_reads_storage_off_the_event_loop(tmp_path, run):
+    from group_admin.config_manager import GroupConfigManager
+    
+    path = tmp_path / "group_configs.json"
+    manager = GroupConfigManager(str(path))
+    load_all = manager._storage.load_all
+    threads = []
+    
+    def recording_load_all():
+        threads.append(threading.current_thread())
+        return load_all()
+    
+    manager._storage.load_all = recording_load_all
+    path.write_text(json.dumps({"100": {"ENABLE_KICK": True}}), encoding="utf-8")
+    manager._last_reload_check = float("-inf")
+    
+    async def scenario():
+        # 读路径不等待加载，继续返回内存中的配置
+        assert "ENABLE_KICK" not in manager.get_effective_snapshot(100)
+        await manager.refresh()
+        return manager.get_effective_snapshot(100)
+    
+    assert run(scenario())["ENABLE_KICK"] is True
+    assert len(threads) == 1
+    assert threads[0] is not threading.main_thread()
+
+
+def test_reload_discards_result_when_edited_during_load(tmp_path, run):
+    from group_admin.config_manager import GroupConfigManager
+    
+    path = tmp_path / "group_configs.json"
+    manager = GroupConfigManager(str(path))
+    load_all = manager._storage.load_all
+    release = threading.Event()
+    
+    def slow_load_all():
+        release.wait(5)
+        return load_all()
+    
+    manager._storage.load_all = slow_load_all
+    path.write_text(json.dumps({"200": {"ENABLE_KICK": True}}), encoding="utf-8")
+    manager._last_reload_check = time.monotonic()
+    
+    async def scenario():
+        reload_task = asyncio.ensure_future(manager.reload())
+        await asyncio.sleep(0.01)
+        await manager.set_group_config(100, "ENABLE_MUTE", False)
+        release.set()
+        return await reload_task
+    
+    assert run(scenario()) is False
+    assert manager.get_group_override(100) == {"ENABLE_MUTE": False}
+    assert not manager.has_group_config(200)
+
+
+def test_missing_profile_reference_is_kept_in_snapshot(tmp_path, run):
+    from group_admin.config_manager import GroupConfigManager
+    
+    manager = GroupConfigManager(str(tmp_path / "group_configs.json"))
+    manager.update_global_config({"ENABLE_KICK": False})
+    run(manager.set_group_config(100, "PROFILE", "missing"))
+    run(manager.set_multiple_group_config(200, {"PROFILE": "other", "MAX_MUTE_DURATION": 60}))
+    run(manager.set_multiple_group_config(400, {"PROFILE": "missing", "MAX_MUTE_DURATION": 60}))
+    
+    snapshot = manager.get_effective_snapshot(100)
+    assert snapshot["PROFILE"] == "missing"
+    assert snapshot["ENABLE_KICK"] is False
+    assert snapshot is not manager.get_global_snapshot()
+    # 单独配置相同、但引用不同（均不存在的）模板的群不共享快照
+    assert manager.get_effective_snapshot(200)["PROFILE"] == "other"
+    assert manager.get_effective_snapshot(400)["PROFILE"] == "missing"
+    assert "PROFILE" not in manager.get_effective_snapshot(300)
+    
+    # 模板创建后立即生效
+    run(manager.set_profile("missing", {"ENABLE_KICK": True}))
+    assert manager.get_effective_snapshot(100)["ENABLE_KICK"] is True
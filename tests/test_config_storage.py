@@ -0,0 +1,115 @@
+import json
+import os
+import stat
+
+import pytest
+
+from group_admin.config_storage import ConfigStorage, JsonFileStorage, open_sqlite_storage
+
+
+def test_config_storage_is_abstract():
+    with pytest.raises(TypeError):
+        ConfigStorage()
+
+    class Incomplete(ConfigStorage):
+        def load_all(self):
+            return {}
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_json_persist_keeps_file_mode(tmp_path):
+    path = tmp_path / "group_configs.json"
+    storage = JsonFileStorage(str(path))
+    os.chmod(path, 0o640)
+
+    storage.persist({"100": {"ENABLE_KICK": True}}, [])
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    assert json.loads(path.read_text(encoding="utf-8")) == {"100": {"ENABLE_KICK": True}}
+
+
+def test_json_new_file_is_not_private(tmp_path):
+    path = tmp_path / "group_configs.json"
+    JsonFileStorage(str(path))
+
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
+
+
+def test_json_has_changed_ignores_own_writes(tmp_path):
+    path = tmp_path / "group_configs.json"
+    storage = JsonFileStorage(str(path))
+    storage.load_all()
+    storage.persist({"100": {"ENABLE_KICK": True}}, [])
+    assert not storage.has_changed()
+
+    path.write_text(json.dumps({"100": {"ENABLE_KICK": False}, "200": {}}), encoding="utf-8")
+    assert storage.has_changed()
+
+
+def test_sqlite_migrates_json_once(tmp_path):
+    json_path = tmp_path / "group_configs.json"
+    json_path.write_text(
+        json.dumps({"100": {"ENABLE_KICK": True, "PROTECTED_USERS": ["1", "2"]}, "200": {"MAX_MUTE_DURATION": 60}}),
+        encoding="utf-8",
+    )
+    db_path = tmp_path / "group_configs.db"
+
+    storage = open_sqlite_storage(str(db_path), str(json_path))
+    assert storage.load_all() == {
+        "100": {"ENABLE_KICK": True, "PROTECTED_USERS": ["1", "2"]},
+        "200": {"MAX_MUTE_DURATION": 60},
+    }
+    assert storage.load_group("200") == {"MAX_MUTE_DURATION": 60}
+    assert storage.load_group("300") is None
+
+    # 迁移后的修改不会被再次迁移覆盖
+    storage.persist(None, [("100", None, None, True, None), ("300", "ENABLE_KICK", False, False, "1")])
+    storage.close()
+
+    storage = open_sqlite_storage(str(db_path), str(json_path))
+    assert storage.load_all() == {"200": {"MAX_MUTE_DURATION": 60}, "300": {"ENABLE_KICK": False}}
+    storage.close()
+
+
+def test_sqlite_skips_broken_json(tmp_path):
+    json_path = tmp_path / "group_configs.json"
+    json_path.write_text("{broken", encoding="utf-8")
+
+    storage = open_sqlite_storage(str(tmp_path / "group_configs.db"), str(json_path))
+    assert storage.load_all() == {}
+    storage.close()
+
+
+def test_sqlite_detects_other_connection_writes(tmp_path):
+    db_path = str(tmp_path / "group_configs.db")
+    storage = open_sqlite_storage(db_path)
+    other = open_sqlite_storage(db_path)
+    storage.load_all()
+    assert not storage.has_changed()
+
+    other.persist(None, [("100", "ENABLE_KICK", True, False, None)])
+    assert storage.has_changed()
+    assert storage.load_all() == {"100": {"ENABLE_KICK": True}}
+    storage.close()
+    other.close()
+
+
+def test_json_persist_is_atomic(tmp_path, monkeypatch):
+    path = tmp_path / "group_configs.json"
+    storage = JsonFileStorage(str(path))
+    storage.persist({"100": {"ENABLE_KICK": True}}, [])
+
+    def failing_replace(src, dst):
+        raise OSError("rename failed")
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        storage.persist({"100": {"ENABLE_KICK": False}}, [])
+
+    # 写入失败时原文件保持完整，临时文件被清理
+    assert json.loads(path.read_text(encoding="utf-8")) == {"100": {"ENABLE_KICK": True}}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["group_configs.json"]
@@ -0,0 +1,96 @@
+from conftest import FakeAgentCtx, FakeBot
+
+
+# 群100：bot 与 3 为管理员，2 为普通成员
+ROLES = {(100, "10000"): "admin", (100, "3"): "admin", (100, "2"): "member"}
+
+
+def test_view_profiles_requires_group_admin(plugin, check_mode, set_bot, ctx, run):
+    set_bot(FakeBot(roles=ROLES))
+    
+    assert "requester_qq" in run(plugin.admin_view_config_profiles(ctx))
+    assert "权限不足" in run(plugin.admin_view_config_profiles(ctx, requester_qq="2"))
+    assert run(plugin.admin_view_config_profiles(ctx, requester_qq="3")) == "暂无配置模板"
+
+
+def test_view_profiles_outside_group_requires_super_admin(plugin, check_mode, set_bot, run):
+    set_bot(FakeBot(roles=ROLES))
+    private_ctx = FakeAgentCtx("onebot_v11-private_3")
+    
+    assert "仅超级管理员" in run(plugin.admin_view_config_profiles(private_ctx, requester_qq="3"))
+    assert run(plugin.admin_view_config_profiles(private_ctx, requester_qq="9")) == "暂无配置模板"
+
+
+def test_view_history_of_other_group_requires_super_admin(plugin, check_mode, set_bot, ctx, run):
+    set_bot(FakeBot(roles=ROLES))
+    
+    assert "权限不足" in run(plugin.admin_view_config_history(ctx, requester_qq="2"))
+    assert "权限不足" not in run(plugin.admin_view_config_history(ctx, requester_qq="3"))
+    assert "仅超级管理员" in run(plugin.admin_view_config_history(ctx, group_id=200, requester_qq="3"))
+    assert "权限不足" not in run(plugin.admin_view_config_history(ctx, group_id=200, requester_qq="9"))
+
+
+def test_set_profile_validates_value_types(plugin, ctx, run):
+    for config, error in (
+        ({"MAX_MUTE_DURATION": "abc"}, "配置值类型不正确"),
+        ({"ENABLE_KICK": "yes"}, "配置值类型不正确"),
+        ({"PERMISSION_MODE": "everyone"}, "配置值类型不正确"),
+        ({"PROTECTED_USERS": "123"}, "配置值类型不正确"),
+        ({"MAX_MUTE_DURATION": -1}, "不能为负数"),
+        ({"UNKNOWN": 1}, "未知的配置项"),
+    ):
+        assert error in run(plugin.admin_set_config_profile(ctx, "strict", config, "测试"))
+    assert plugin.group_config_manager.list_profiles() == {}
+    
+    config = {"MAX_MUTE_DURATION": 600, "ENABLE_KICK": True, "PROTECTED_USERS": ["1", 2]}
+    assert "已设置配置模板" in run(plugin.admin_set_config_profile(ctx, "strict", config, "测试"))
+    assert plugin.group_config_manager.list_profiles() == {"strict": config}
+
+
+def test_copy_config_refuses_empty_source(plugin, ctx, set_bot, run):
+    set_bot(FakeBot(members={100: [], 200: []}))
+    manager = plugin.group_config_manager
+    run(manager.set_group_config(200, "ENABLE_MUTE", False))
+    
+    assert "没有单独配置" in run(plugin.admin_copy_config_to_all_groups(ctx, "测试"))
+    
+    # 只引用了配置模板的群，默认不复制模板时同样视为没有可复制的配置
+    run(manager.set_profile("strict", {"ENABLE_KICK": True}))
+    run(manager.assign_profile([100], "strict"))
+    assert "没有单独配置" in run(plugin.admin_copy_config_to_all_groups(ctx, "测试"))
+    assert manager.get_group_override(200) == {"ENABLE_MUTE": False}
+
+
+def test_copy_config_to_all_groups(plugin, ctx, set_bot, admin_reports, run):
+    set_bot(FakeBot(members={100: [], 200: [], 300: []}))
+    manager = plugin.group_config_manager
+    run(manager.set_profile("strict", {"ENABLE_KICK": True}))
+    run(manager.set_multiple_group_config(100, {"PROFILE": "strict", "MAX_MUTE_DURATION": 600}))
+    run(manager.set_group_config(200, "ENABLE_MUTE", False))
+    
+    result = run(plugin.admin_copy_config_to_all_groups(ctx, "统一配置"))
+    assert "其中 2 个群的配置发生变化" in result
+    assert manager.get_group_override(200) == {"MAX_MUTE_DURATION": 600}
+    assert manager.get_group_override(300) == {"MAX_MUTE_DURATION": 600}
+    assert manager.get_group_override(100) == {"PROFILE": "strict", "MAX_MUTE_DURATION": 600}
+    assert "变更群: 200、300" in admin_reports[-1][1]
+    
+    run(plugin.admin_copy_config_to_all_groups(ctx, "统一模板", include_profile=True))
+    assert manager.get_group_override(300) == {"PROFILE": "strict", "MAX_MUTE_DURATION": 600}
+
+
+def test_sync_global_config_clears_only_group_overrides(plugin, ctx, admin_reports, run):
+    manager = plugin.group_config_manager
+    run(manager.set_profile("strict", {"ENABLE_KICK": True}))
+    run(manager.set_multiple_group_config(100, {"ENABLE_KICK": False, "PROTECTED_USERS": ["1"]}))
+    run(manager.set_group_config(200, "PROFILE", "strict"))
+    
+    result = run(plugin.admin_sync_global_config(ctx, "恢复默认"))
+    assert "2 个群的单独配置已清除" in result
+    assert "100、200" in result
+    assert manager.list_configured_groups() == []
+    assert manager.get_group_override(100) == {}
+    assert manager.list_profiles() == {"strict": {"ENABLE_KICK": True}}
+    assert "变更群: 100、200" in admin_reports[-1][1]
+    
+    assert "0 个群的单独配置已清除" in run(plugin.admin_sync_global_config(ctx, "再次同步"))
@@ -0,0 +1,81 @@
+import json
+
+from group_admin.config_storage import JournalConfigStorage, _read_lines_reversed
+
+
+def _set(group, key, value, actor="1"):
+    return (group, key, value, False, actor)
+
+
+def test_journal_replays_changes_on_load(tmp_path):
+    path = str(tmp_path / "group_configs.json")
+    storage = JournalConfigStorage(path)
+    storage.load_all()
+    storage.persist(None, [_set("100", "ENABLE_KICK", True), _set("100", "MAX_MUTE_DURATION", 60)])
+    storage.persist(None, [("100", "MAX_MUTE_DURATION", None, True, "2"), _set("200", "ENABLE_BAN", False)])
+
+    # 快照尚未写入，配置只存在于变更日志中
+    assert json.loads((tmp_path / "group_configs.json").read_text(encoding="utf-8")) == {}
+    reopened = JournalConfigStorage(path)
+    assert reopened.load_all() == {"100": {"ENABLE_KICK": True}, "200": {"ENABLE_BAN": False}}
+
+
+def test_journal_truncates_partial_tail(tmp_path):
+    path = str(tmp_path / "group_configs.json")
+    storage = JournalConfigStorage(path)
+    storage.load_all()
+    storage.persist(None, [_set("100", "ENABLE_KICK", True)])
+    with open(storage.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"ts": 1, "op": "set", "group": "100", "key": "ENAB')
+
+    reopened = JournalConfigStorage(path)
+    assert reopened.load_all() == {"100": {"ENABLE_KICK": True}}
+    assert reopened.journal_path.read_text(encoding="utf-8").endswith("\n")
+
+    # 截断后追加的记录不会与残缺行拼接
+    reopened.persist(None, [_set("100", "ENABLE_BAN", False)])
+    assert JournalConfigStorage(path).load_all() == {"100": {"ENABLE_KICK": True, "ENABLE_BAN": False}}
+
+
+def test_journal_compacts_into_snapshot_and_history(tmp_path):
+    path = tmp_path / "group_configs.json"
+    storage = JournalConfigStorage(str(path), compact_max_entries=3)
+    storage.load_all()
+    storage.persist(None, [_set("100", "ENABLE_KICK", True), _set("200", "ENABLE_KICK", False)])
+    assert storage.journal_path.stat().st_size > 0
+
+    storage.persist(None, [_set("100", "MAX_MUTE_DURATION", 60)])
+    assert storage.journal_path.read_text(encoding="utf-8") == ""
+    assert json.loads(path.read_text(encoding="utf-8")) == {
+        "100": {"ENABLE_KICK": True, "MAX_MUTE_DURATION": 60},
+        "200": {"ENABLE_KICK": False},
+    }
+    assert len(storage.history_path.read_text(encoding="utf-8").splitlines()) == 3
+
+    storage.persist(None, [_set("200", "ENABLE_BAN", True)])
+    storage.close()
+    assert storage.journal_path.read_text(encoding="utf-8") == ""
+    assert JournalConfigStorage(str(path)).load_all()["200"] == {"ENABLE_KICK": False, "ENABLE_BAN": True}
+
+
+def test_journal_read_history_newest_first(tmp_path):
+    storage = JournalConfigStorage(str(tmp_path / "group_configs.json"), compact_max_entries=4)
+    storage.load_all()
+    for i in range(10):
+        storage.persist(None, [_set("100" if i % 2 else "200", "MAX_MUTE_DURATION", i)])
+
+    # 跨越当前日志和历史归档，最新的修改在前
+    assert [entry["value"] for entry in storage.read_history(limit=6)] == [9, 8, 7, 6, 5, 4]
+    assert [entry["value"] for entry in storage.read_history("100", limit=3)] == [9, 7, 5]
+    assert [entry["value"] for entry in storage.read_history("200", limit=100)] == [8, 6, 4, 2, 0]
+    assert storage.read_history("300") == []
+
+
+def test_read_lines_reversed_across_blocks(tmp_path):
+    path = tmp_path / "history"
+    lines = [f"第{i}行-{'x' * i}" for i in range(50)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    # 块大小小于单行长度时，跨块的行也能完整拼接
+    result = [line.decode("utf-8") for line in _read_lines_reversed(path, block_size=7) if line]
+    assert result == lines[::-1]
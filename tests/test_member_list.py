@@ -0,0 +1,95 @@
+import re
+
+from conftest import FakeBot
+
+
+ROLES = {(100, "10000"): "admin"}
+MEMBERS = {
+    100: [
+        {"user_id": 10000, "nickname": "bot", "role": "admin", "join_time": 50},
+        {"user_id": 1, "nickname": "群主", "role": "owner", "join_time": 10},
+    ] + [
+        {"user_id": uid, "nickname": f"成员{uid}", "role": "member", "join_time": 100 + uid % 3}
+        for uid in range(11, 19)
+    ]
+}
+
+
+def _walk(plugin, ctx, run, **kwargs):
+    """按 cursor 翻完所有页，返回 (各页QQ号, 最后一页结果)"""
+    pages, cursor = [], ""
+    while True:
+        result = run(plugin.admin_get_member_list(ctx, page_size=3, cursor=cursor, **kwargs))
+        rows = [line for line in result.splitlines()[2:] if "|" in line]
+        pages.append([int(row.split("|", 1)[0]) for row in rows])
+        match = re.search(r"下一页 cursor: (\S+)", result)
+        if match is None:
+            return pages, result
+        cursor = match.group(1)
+
+
+def test_cursor_pages_cover_every_member_once(plugin, set_bot, ctx, run):
+    set_bot(FakeBot(roles=ROLES, members=MEMBERS))
+    all_ids = sorted(member["user_id"] for member in MEMBERS[100])
+
+    for sort in ("role", "join_time", "last_speak"):
+        pages, _ = _walk(plugin, ctx, run, sort=sort)
+        ids = [uid for page in pages for uid in page]
+        assert sorted(ids) == all_ids, sort
+        assert all(len(page) == 3 for page in pages[:-1])
+
+    pages, _ = _walk(plugin, ctx, run, sort="role")
+    assert pages[0][0] == 1
+
+
+def test_search_pages_by_match_rank(plugin, set_bot, ctx, run):
+    set_bot(FakeBot(roles=ROLES, members=MEMBERS))
+
+    pages, _ = _walk(plugin, ctx, run, search_keyword="成员")
+    assert sorted(uid for page in pages for uid in page) == list(range(11, 19))
+    assert [len(page) for page in pages] == [3, 3, 2]
+
+
+def test_cursor_survives_member_leaving(plugin, set_bot, ctx, run):
+    set_bot(FakeBot(roles=ROLES, members=MEMBERS))
+
+    first = run(plugin.admin_get_member_list(ctx, sort="join_time", page_size=3))
+    cursor = re.search(r"下一页 cursor: (\S+)", first).group(1)
+    plugin.roster_cache.handle_notice("group_decrease", "leave", 100, "11")
+
+    rest, _ = _walk(plugin, ctx, run, sort="join_time")
+    second = run(plugin.admin_get_member_list(ctx, sort="join_time", page_size=3, cursor=cursor))
+    shown = {int(line.split("|", 1)[0]) for line in first.splitlines()[2:] if "|" in line}
+    remaining = {int(line.split("|", 1)[0]) for line in second.splitlines()[2:] if "|" in line}
+    assert not shown & remaining
+    assert 11 not in remaining
+    assert sum(len(page) for page in rest) == 9
+
+
+def test_invalid_cursor_is_rejected(plugin, set_bot, ctx, run):
+    set_bot(FakeBot(roles=ROLES, members=MEMBERS))
+
+    first = run(plugin.admin_get_member_list(ctx, sort="role", page_size=3))
+    cursor = re.search(r"下一页 cursor: (\S+)", first).group(1)
+    assert "无效的 cursor" in run(plugin.admin_get_member_list(ctx, sort="join_time", cursor=cursor))
+    assert "无效的 cursor" in run(plugin.admin_get_member_list(ctx, sort="role", cursor="role:x"))
+    assert "不支持的排序方式" in run(plugin.admin_get_member_list(ctx, sort="match"))
+
+
+def test_search_is_ranked_once_across_pages(plugin, set_bot, ctx, run, monkeypatch):
+    from group_admin.member_search import MemberSearchIndex
+
+    set_bot(FakeBot(roles=ROLES, members=MEMBERS))
+    searches = []
+    search = MemberSearchIndex.search
+    monkeypatch.setattr(MemberSearchIndex, "search", lambda self, keyword: searches.append(keyword) or search(self, keyword))
+
+    pages, _ = _walk(plugin, ctx, run, search_keyword="成员")
+    assert len(pages) == 3
+    assert len(searches) == 1
+
+    # 名单变化后重新搜索，已离开的成员不再出现
+    plugin.roster_cache.handle_notice("group_decrease", "leave", 100, "11")
+    pages, _ = _walk(plugin, ctx, run, search_keyword="成员")
+    assert len(searches) == 2
+    assert sorted(uid for page in pages for uid in page) == list(range(12, 19))
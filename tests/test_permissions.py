@@ -0,0 +1,78 @@
+import pytest
+
+from conftest import FakeBot
+
+
+# 群100：bot 与 3 为管理员，7 为群主，8 为受保护成员，11 不在群内
+MEMBERS = {100: [
+    {"user_id": 10000, "role": "admin"},
+    {"user_id": 3, "role": "admin"},
+    {"user_id": 5, "role": "member"},
+    {"user_id": 6, "role": "admin"},
+    {"user_id": 7, "role": "owner"},
+    {"user_id": 8, "role": "member"},
+    {"user_id": 9, "role": "member"},
+]}
+TARGETS = ["5", "6", "7", "8", "9", "11", " 5 "]
+
+
+def _clear_caches(plugin):
+    plugin.bot_info_cache.clear()
+    plugin.permission_decision_cache.clear()
+
+
+@pytest.mark.parametrize("mode, requester_qq", [
+    ("check_requester", "3"),
+    ("check_requester", "9"),
+    ("check_requester", "5"),
+    ("check_requester", None),
+    ("ai_autonomous", None),
+])
+def test_bulk_decisions_match_single_checks(plugin, set_bot, ctx, run, mode, requester_qq):
+    admin_config = plugin.get_admin_config()
+    admin_config.PERMISSION_MODE = mode
+    admin_config.SUPER_ADMINS = ["9"]
+    run(plugin.group_config_manager.set_group_config(100, "PROTECTED_USERS", ["8"]))
+    set_bot(FakeBot(members=MEMBERS))
+    level = plugin.PermissionLevel.ADMIN
+    
+    bulk = run(plugin.check_permissions_bulk(100, requester_qq, TARGETS, level, "禁言"))
+    assert list(bulk) == ["5", "6", "7", "8", "9", "11"]
+    
+    for qq, decision in bulk.items():
+        _clear_caches(plugin)
+        single = run(plugin.check_permission(ctx, 100, qq, level, "禁言", requester_qq))
+        assert (decision.allowed, decision.message, decision.target_role) == (
+            single.allowed, single.message, single.target_role
+        ), qq
+
+
+def test_bulk_check_uses_roster_when_many_roles_missing(plugin, set_bot, run):
+    bot = set_bot(FakeBot(members=MEMBERS))
+    level = plugin.PermissionLevel.ADMIN
+    threshold = plugin.BULK_MEMBER_LIST_THRESHOLD
+    targets = ["5", "6", "8", "9"]
+    assert len(targets) > threshold
+    
+    decisions = run(plugin.check_permissions_bulk(100, None, targets, level, "禁言"))
+    assert bot.count("get_group_member_list") == 1
+    target_lookups = [
+        call for name, call in bot.calls
+        if name == "get_group_member_info" and str(call["user_id"]) in targets
+    ]
+    assert target_lookups == []
+    assert decisions["6"].target_role == "admin"
+
+
+def test_bulk_check_fetches_few_missing_roles_individually(plugin, set_bot, run):
+    bot = set_bot(FakeBot(members=MEMBERS))
+    level = plugin.PermissionLevel.ADMIN
+    targets = ["5", "6", "8"]
+    assert len(targets) <= plugin.BULK_MEMBER_LIST_THRESHOLD
+    
+    run(plugin.check_permissions_bulk(100, None, targets, level, "禁言"))
+    assert bot.count("get_group_member_list") == 0
+    fetched = {
+        str(call["user_id"]) for name, call in bot.calls if name == "get_group_member_info"
+    }
+    assert set(targets) <= fetched
@@ -0,0 +1,106 @@
+import asyncio
+import types
+
+import pytest
+
+from conftest import FakeBot
+from group_admin import cache as cache_module
+from group_admin import onebot_cache
+from group_admin.cache import LRUCache
+from group_admin.onebot_cache import GroupRosterCache, MemberRoleCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可手动推进的 monotonic 时钟"""
+    now = [1000.0]
+    fake_time = types.SimpleNamespace(monotonic=lambda: now[0], time=lambda: now[0])
+    monkeypatch.setattr(cache_module, "time", fake_time)
+    monkeypatch.setattr(onebot_cache, "time", fake_time)
+    return now
+
+
+def _members(group_id, count=3):
+    return [{"user_id": group_id * 10 + i, "nickname": f"u{i}", "role": "member"} for i in range(count)]
+
+
+def test_lru_peek_keeps_order_and_on_evict(clock):
+    evicted = []
+    lru = LRUCache(2, ttl=10, on_evict=lambda key, value: evicted.append(key))
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.peek("a") == 1
+    lru.set("c", 3)
+    assert evicted == ["a"]
+    assert lru.stats()["hits"] == 0
+    
+    clock[0] += 10
+    assert lru.peek("b") is None
+    assert lru.purge_expired() == 2
+    assert evicted == ["a", "b", "c"]
+
+
+def test_evicted_rosters_are_unindexed(run):
+    bot = FakeBot(members={gid: _members(gid) for gid in range(1, 11)})
+    rosters = GroupRosterCache(MemberRoleCache(), max_groups=2)
+    
+    for gid in range(1, 11):
+        run(rosters.get_roster(bot, gid))
+    
+    stats = rosters.stats()
+    assert stats["size"] == 2 and stats["evictions"] == 8
+    assert stats["indexed_users"] == 6
+    assert rosters.find_user_groups("10") == {}
+    assert list(rosters.find_user_groups("100")) == [10]
+
+
+def test_find_user_groups_does_not_refresh_lru(run):
+    bot = FakeBot(members={gid: _members(gid) for gid in (1, 2, 3)})
+    rosters = GroupRosterCache(MemberRoleCache(), max_groups=2)
+    run(rosters.get_roster(bot, 1))
+    run(rosters.get_roster(bot, 2))
+    
+    assert list(rosters.find_user_groups("10")) == [1]
+    assert rosters.peek_member(1, "10") is not None
+    run(rosters.get_roster(bot, 3))
+    
+    # 查找不算使用，群1仍是最久未使用的名单而被淘汰
+    assert rosters.find_user_groups("10") == {}
+    assert rosters.stats()["indexed_users"] == 6
+
+
+def test_expired_rosters_are_hidden_and_unindexed(clock, run):
+    bot = FakeBot(members={1: _members(1), 2: _members(2)})
+    rosters = GroupRosterCache(MemberRoleCache(), max_age=100)
+    run(rosters.get_roster(bot, 1))
+    clock[0] += 60
+    run(rosters.get_roster(bot, 2))
+    
+    clock[0] += 50
+    assert rosters.find_user_groups("10") == {}
+    assert rosters.peek_member(1, "10") is None
+    assert list(rosters.find_user_groups("20")) == [2]
+    assert rosters.stats()["indexed_users"] == 3
+    
+    # 过期后再次使用时重新获取
+    run(rosters.get_roster(bot, 1))
+    assert bot.count("get_group_member_list") == 3
+    assert list(rosters.find_user_groups("10")) == [1]
+
+
+def test_background_refresh_unindexes_departed_members(clock, run):
+    bot = FakeBot(members={1: _members(1)})
+    rosters = GroupRosterCache(MemberRoleCache(), refresh_after=10)
+
+    async def scenario():
+        await rosters.get_roster(bot, 1)
+        bot.members[1] = _members(1, count=1)
+        clock[0] += 20
+        await rosters.get_roster(bot, 1)
+        for _ in range(5):
+            await asyncio.sleep(0)
+    
+    run(scenario())
+    assert bot.count("get_group_member_list") == 2
+    assert rosters.stats()["indexed_users"] == 1
+    assert rosters.find_user_groups("11") == {}
@@ -0,0 +1,61 @@
+from conftest import FakeBot
+
+
+ROLES = {(100, "10000"): "admin", (100, "3"): "admin", (100, "2"): "member"}
+MEMBERS = {
+    100: [
+        {"user_id": 10000, "nickname": "bot", "card": "", "role": "admin"},
+        {"user_id": 3, "nickname": "管理", "card": "", "role": "admin"},
+        {"user_id": 11, "nickname": "小明同学", "card": "", "role": "member"},
+        {"user_id": 12, "nickname": "阿花", "card": "", "role": "member"},
+        {"user_id": 13, "nickname": "张三", "card": "", "role": "member"},
+        {"user_id": 14, "nickname": "张三丰", "card": "", "role": "member"},
+    ]
+}
+
+
+def _muted(bot):
+    return [kwargs["user_id"] for name, kwargs in bot.calls if name == "set_group_ban"]
+
+
+def test_unique_exact_or_prefix_match_resolves(plugin, set_bot, ctx, run):
+    bot = set_bot(FakeBot(roles=ROLES, members=MEMBERS))
+    
+    assert "执行禁言" in run(plugin.admin_mute_user(ctx, "张三", 60, "测试"))
+    assert "执行禁言" in run(plugin.admin_mute_user(ctx, "小明", 60, "测试"))
+    assert _muted(bot) == [13, 11]
+
+
+def test_substring_only_match_returns_candidates(plugin, set_bot, ctx, run):
+    bot = set_bot(FakeBot(roles=ROLES, members=MEMBERS))
+    
+    result = run(plugin.admin_mute_user(ctx, "同学", 60, "测试"))
+    assert "匹配到 1 个成员" in result and "11 小明同学" in result
+    result = run(plugin.admin_mute_user(ctx, "张", 60, "测试"))
+    assert "匹配到 2 个成员" in result
+    assert _muted(bot) == []
+
+
+def test_digit_target_is_taken_as_qq(plugin, set_bot, ctx, run):
+    bot = set_bot(FakeBot(roles=ROLES, members=MEMBERS))
+    
+    assert "执行禁言" in run(plugin.admin_mute_user(ctx, "@99", 60, "测试"))
+    assert _muted(bot) == [99]
+    assert bot.count("get_group_member_list") == 0
+
+
+def test_roster_failure_is_reported(plugin, set_bot, ctx, run):
+    bot = set_bot(FakeBot(roles=ROLES, fail={"get_group_member_list": RuntimeError("network down")}))
+    
+    result = run(plugin.admin_mute_user(ctx, "张三", 60, "测试"))
+    assert result.startswith("解析目标用户失败") and "network down" in result
+    assert _muted(bot) == []
+
+
+def test_requester_checked_before_roster_fetch(plugin, check_mode, set_bot, ctx, run):
+    bot = set_bot(FakeBot(roles=ROLES, members=MEMBERS))
+    
+    assert "权限不足" in run(plugin.admin_mute_user(ctx, "张三", 60, "测试", requester_qq="2"))
+    assert bot.count("get_group_member_list") == 0
+    assert "执行禁言" in run(plugin.admin_mute_user(ctx, "张三", 60, "测试", requester_qq="3"))
+    assert _muted(bot) == [13]
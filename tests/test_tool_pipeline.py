@@ -0,0 +1,81 @@
+import pytest
+
+from conftest import FakeAgentCtx, FakeBot
+
+
+# 群100：bot 与 3 为管理员，5 为普通成员
+ROLES = {(100, "10000"): "admin", (100, "3"): "admin", (100, "5"): "member"}
+
+
+@pytest.fixture
+def hooks(plugin, monkeypatch):
+    """为每个测试提供独立的钩子列表"""
+    monkeypatch.setattr(plugin, "tool_hooks", list(plugin.tool_hooks))
+    monkeypatch.setattr(plugin, "tool_pre_hooks", [])
+    return plugin
+
+
+def test_messages_match_pre_pipeline_tools(plugin, hooks, set_bot, ctx, admin_reports, run):
+    bot = set_bot(FakeBot(roles=ROLES))
+    
+    private_ctx = FakeAgentCtx("onebot_v11-private_3")
+    assert run(plugin.admin_mute_user(private_ctx, "5", 60, "刷屏")) == "禁言功能仅支持群聊，当前频道类型: private"
+    assert run(plugin.admin_kick_user(ctx, "5", "广告")) == "踢人功能未开启，无法执行此操作"
+    assert run(plugin.admin_mute_user(ctx, "5", -1, "刷屏")) == "禁言时长不能为负数"
+    
+    assert run(plugin.admin_mute_user(ctx, "5", 60, "刷屏")) == "已对用户 5 执行禁言 60 秒"
+    assert bot.calls[-1] == ("set_group_ban", {"group_id": 100, "user_id": 5, "duration": 60})
+    assert admin_reports[-1][1].startswith("[群管操作报告]\n操作: 禁言用户\n目标: 5\n时长: 60秒\n理由: 刷屏")
+    
+    bot.fail["set_group_ban"] = RuntimeError("retcode=100")
+    assert run(plugin.admin_mute_user(ctx, "5", 0, "误禁")) == "禁言用户失败: retcode=100"
+
+
+def test_permission_denial_message(plugin, hooks, check_mode, set_bot, ctx, run):
+    set_bot(FakeBot(roles=ROLES))
+    
+    assert run(plugin.admin_mute_user(ctx, "3", 60, "刷屏", requester_qq="5")) == (
+        "权限不足：禁言用户需要管理员及以上权限，用户 5 当前权限为 普通成员"
+    )
+    assert run(plugin.admin_mute_user(ctx, "3", 60, "刷屏", requester_qq="3")) == (
+        "无法对同级或更高权限的用户执行禁言用户（目标用户权限: 管理员）"
+    )
+
+
+def test_hooks_see_each_invocation(plugin, hooks, set_bot, ctx, run):
+    set_bot(FakeBot(roles=ROLES))
+    seen = []
+    plugin.register_tool_hook(lambda invocation: seen.append(
+        (invocation.spec.name, invocation.outcome, invocation.target_qq, list(invocation.timings))
+    ))
+    
+    run(plugin.admin_mute_user(ctx, "5", 60, "刷屏"))
+    run(plugin.admin_mute_user(FakeAgentCtx("onebot_v11-private_3"), "5", 60, "刷屏"))
+    
+    assert seen == [
+        ("群管_禁言用户", "done", "5", ["config", "resolve", "permission", "action", "report"]),
+        ("群管_禁言用户", "rejected", None, []),
+    ]
+    assert plugin.tool_timing_stats["群管_禁言用户"][0] >= 2
+
+
+def test_pre_hook_can_reject_call(plugin, hooks, set_bot, ctx, admin_reports, run):
+    bot = set_bot(FakeBot(roles=ROLES))
+    outcomes = []
+    plugin.register_tool_hook(lambda invocation: outcomes.append(invocation.outcome))
+    
+    @plugin.register_tool_pre_hook
+    def maintenance(invocation):
+        assert invocation.decision.allowed
+        if invocation.target_qq == "5":
+            return "维护中，暂停对该成员的管理操作"
+        return None
+    
+    assert run(plugin.admin_mute_user(ctx, "5", 60, "刷屏")) == "维护中，暂停对该成员的管理操作"
+    assert bot.count("set_group_ban") == 0
+    assert admin_reports == []
+    
+    # 其他目标不受影响；抛出异常的前置钩子被忽略
+    plugin.register_tool_pre_hook(lambda invocation: 1 / 0)
+    assert run(plugin.admin_mute_user(ctx, "6", 60, "刷屏")) == "已对用户 6 执行禁言 60 秒"
+    assert outcomes == ["rejected", "done"]